@@ -4,17 +4,24 @@ Simple Flask API server for The Wheel
 Provides live GitHub search functionality to the web interface
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
+import json
 import os
 import sys
+import threading
+import time
 
-# Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+# Add the project root to path (one module identity for src.*, so singletons are shared)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from engine.github_adapter import GitHubAdapter
-from engine.analyzer import ProjectAnalyzer
-from data.connection import db
+from src.engine.github_adapter import GitHubAdapter, normalize_search
+from src.engine.analyzer import ProjectAnalyzer
+from src.engine.jobs import JobStore, ResearchJobs
+from src.engine.landscape import LandscapeCache, LandscapeGraph
+from src.engine.similarity import get_similarity_index
+from src.engine.single_flight import Overloaded, SingleFlight
+from src.data.connection import db
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend access
@@ -23,6 +30,38 @@ CORS(app)  # Enable CORS for frontend access
 github_adapter = GitHubAdapter()
 analyzer = ProjectAnalyzer()
 
+# Enable mock mode for development (once, not per request)
+db.connect("mock", "", "")
+
+# Search landscapes stay reusable well beyond the coalescing window, within a memory budget
+search_landscapes = LandscapeCache(
+    max_entries=int(os.environ.get('WHEEL_LANDSCAPE_CACHE_ENTRIES', 128)),
+    max_bytes=int(os.environ.get('WHEEL_LANDSCAPE_CACHE_BYTES', 64 * 1024 * 1024)),
+    ttl=float(os.environ.get('WHEEL_LANDSCAPE_TTL', 900)),
+)
+
+# Identical in-flight searches share one upstream fetch and graph build; results live briefly in memory
+search_flights = SingleFlight(
+    ttl=float(os.environ.get('WHEEL_SEARCH_TTL', 30)),
+    max_concurrency=int(os.environ.get('WHEEL_SEARCH_CONCURRENCY', 8)),
+    acquire_timeout=float(os.environ.get('WHEEL_SEARCH_QUEUE_TIMEOUT', 15)),
+    wait_timeout=float(os.environ.get('WHEEL_SEARCH_WAIT_TIMEOUT', 60)),
+)
+
+# Background research jobs; created on first use so the reloader parent never resumes jobs
+research_jobs = None
+research_jobs_lock = threading.Lock()
+
+def get_research_jobs():
+    global research_jobs
+    with research_jobs_lock:
+        if research_jobs is None:
+            research_jobs = ResearchJobs(
+                JobStore(os.environ.get('WHEEL_JOBS_DB')),
+                max_workers=int(os.environ.get('WHEEL_JOB_WORKERS', 2)),
+            )
+        return research_jobs
+
 @app.route('/api/search', methods=['POST'])
 def search_projects():
     """Search for projects using live GitHub API"""
@@ -34,83 +73,159 @@ def search_projects():
         if not query:
             return jsonify({'error': 'Query is required'}), 400
         
-        # Enable mock mode for development
-        db.connect("mock", "", "")
-        
-        # Search GitHub
-        projects = github_adapter.search(query, filters)
-        
-        # Process projects and extract components
-        nodes = []
-        links = []
-        node_id = 1
-        
-        for project in projects:
-            # Add project node
-            nodes.append({
-                'id': node_id,
-                'name': project['name'],
-                'type': 'Project',
-                'url': project['url'],
-                'description': project['description'],
-                'stars': project['stars'],
-                'language': project['language']
-            })
-            project_id = node_id
-            node_id += 1
-            
-            # Extract and add components
-            components = analyzer.extract_components(project)
-            for component in components:
-                # Check if component already exists
-                existing_component = next((n for n in nodes if n['name'] == component['name'] and n['type'] == 'Component'), None)
-                
-                if existing_component:
-                    # Link to existing component
-                    links.append({
-                        'source': project_id,
-                        'target': existing_component['id']
-                    })
-                else:
-                    # Create new component
-                    nodes.append({
-                        'id': node_id,
-                        'name': component['name'],
-                        'type': 'Component',
-                        'category': component['type']
-                    })
-                    links.append({
-                        'source': project_id,
-                        'target': node_id
-                    })
-                    node_id += 1
-        
-        # Add some inter-project relationships for better visualization
-        for i in range(len(projects) - 1):
-            if i < len(nodes) - 1:
-                links.append({
-                    'source': i + 1,
-                    'target': i + 2
-                })
-        
-        return jsonify({
-            'nodes': nodes,
-            'links': links,
-            'query': query,
-            'total_projects': len(projects)
-        })
+        key = json.dumps(normalize_search(query, filters), sort_keys=True)
+        return jsonify(search_flights.do(key, lambda: build_search_graph(query, filters, key)))
         
+    except Overloaded as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
     except Exception as e:
         print(f"API Error: {e}")
         return jsonify({'error': str(e)}), 500
 
+def build_search_graph(query, filters, key=None):
+    """Search GitHub and assemble the D3 graph for one (normalized) query"""
+    graph = search_landscapes.get(key) if key else None
+    if graph is None:
+        projects = github_adapter.search(query, filters)
+        graph = LandscapeGraph()
+        for project, components in zip(projects, analyzer.extract_components_batch(projects)):
+            graph.add_project(project, components)
+        if key:
+            search_landscapes.put(key, graph)
+
+    return graph.to_d3(query)
+
+@app.route('/api/search/stream', methods=['POST'])
+def search_projects_stream():
+    """Stream the search graph as NDJSON events while repos are fetched and analyzed"""
+    data = request.get_json() or {}
+    query = data.get('query', '')
+    filters = data.get('filters', {})
+    if not query:
+        return jsonify({'error': 'Query is required'}), 400
+
+    # Run the generator up to its first event here, so a full house is still a plain 503
+    events = stream_search_graph(query, filters)
+    try:
+        first = next(events)
+    except Overloaded as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+
+    return Response(
+        stream_with_context(prepend_event(first, events)),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def prepend_event(first, events):
+    try:
+        yield first
+        yield from events
+    finally:
+        events.close()
+
+def stream_search_graph(query, filters):
+    """
+    One JSON line per analyzed project: {"event": "project", "nodes": [...], "links": [...]}
+    with only the nodes and links that project adds, then {"event": "summary", ...}.
+    A cached landscape for the same search is replayed; otherwise the fetch holds a
+    search_flights slot and the finished graph is cached for later searches.
+    """
+    start = time.perf_counter()
+    key = json.dumps(normalize_search(query, filters), sort_keys=True)
+    graph = search_landscapes.get(key)
+    if graph is not None:
+        for added in graph.increments():
+            yield json.dumps({'event': 'project', **added}) + '\n'
+    else:
+        graph = LandscapeGraph()
+        with search_flights.slot():
+            try:
+                limit = int(filters.get('limit', 10)) if filters else 10
+                for project in github_adapter.search_pages(query, filters, max_results=limit):
+                    added = graph.add_project(project, analyzer.extract_components(project))
+                    yield json.dumps({'event': 'project', **added}) + '\n'
+            except Exception as e:
+                print(f"API Error: {e}")
+                yield json.dumps({'event': 'error', 'error': str(e)}) + '\n'
+                return
+        search_landscapes.put(key, graph)
+
+    yield json.dumps({
+        'event': 'summary',
+        'query': query,
+        'total_projects': len(graph.by_type('Project')),
+        'total_nodes': len(graph.nodes),
+        'total_links': len(graph.links),
+        'seconds': round(time.perf_counter() - start, 3)
+    }) + '\n'
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_research_job():
+    """Queue a full research run; returns at once with the job (merged into an identical active one)"""
+    data = request.get_json() or {}
+    query = data.get('query', '')
+    if not query:
+        return jsonify({'error': 'Query is required'}), 400
+
+    job, created = get_research_jobs().submit(query, int(data.get('limit', 5)), data.get('filters') or None)
+    return jsonify(dict(job, merged=not created)), 202, {'Location': f"/api/jobs/{job['id']}"}
+
+@app.route('/api/jobs', methods=['GET'])
+def list_research_jobs():
+    """Most recent research jobs"""
+    return jsonify({'jobs': get_research_jobs().recent(int(request.args.get('limit', 50)))})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def research_job_status(job_id):
+    """Status, per-stage progress and partial results of one job"""
+    job = get_research_jobs().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_research_job(job_id):
+    """Cancel a queued job, or stop a running one after its current stage"""
+    job = get_research_jobs().cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/similar', methods=['GET'])
+def similar_projects():
+    """Top-k researched projects most similar to one (by name or URL) in description, topics and components"""
+    project = request.args.get('project', '')
+    if not project:
+        return jsonify({'error': 'project is required'}), 400
+
+    try:
+        k = int(request.args.get('k', 10))
+    except ValueError:
+        return jsonify({'error': 'k must be an integer'}), 400
+
+    matches = get_similarity_index().similar(project, k)
+    return jsonify({'project': project, 'similar': matches})
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'The Wheel API'})
+    return jsonify({
+        'status': 'healthy',
+        'service': 'The Wheel API',
+        'search': search_flights.stats,
+        'landscapes': search_landscapes.stats(),
+    })
+
+@app.route('/api/rate-limit', methods=['GET'])
+def rate_limit_status():
+    """Current GitHub throughput headroom (aggregate only: per-token budgets stay server side)"""
+    budget = github_adapter.token_pool.budget()
+    return jsonify({'tokens': len(budget['tokens']), 'headroom': budget['headroom']})
 
 if __name__ == '__main__':
     print("🚀 Starting The Wheel API server...")
     print("📡 Live GitHub search enabled")
     print("🌐 Access at: http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Threaded workers wait on shared searches; upstream work is bounded by search_flights
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
@@ -1,35 +1,347 @@
+import functools
+import glob
+import gzip
 import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Dict
+import numpy as np
 from src.data.connection import db
+from src.data.layout import detect_communities, force_layout
+
+# Full exports run each query once and stream it through the driver's result cursor,
+# which pulls `fetch_size` records per round trip: no ORDER BY / SKIP pages to re-sort
+NODES_QUERY = """
+// @op nodes
+MATCH (n)
+RETURN id(n) AS id, n.name AS name, labels(n)[0] AS type, n.url AS url, n.updated_at AS updated_at
+"""
+
+# TOPIC_COMPONENT edges are the writer's blue-ocean refcounts, not landscape links
+LINKS_QUERY = """
+// @op links
+MATCH (n)-[r]->(m)
+WHERE type(r) <> 'TOPIC_COMPONENT'
+RETURN id(n) AS source, id(m) AS target, type(r) AS type, r.updated_at AS updated_at
+"""
+
+# Delta queries run once per label / relationship type so they can use the updated_at indexes
+DELTA_LABELS = ["Project", "Author", "Topic", "Component"]
+DELTA_REL_TYPES = ["CREATED", "TAGGED_WITH", "USES"]
+
+# timestamp() is taken when a write starts, not when it commits: a transaction still open
+# during an export can commit stamps older than the watermark. Delta queries re-read this
+# window behind the watermark; applyGraphDelta merges repeats idempotently.
+DELTA_SAFETY_LAG_MS = 60_000
+
+# Concurrent research runs (jobs, MCP calls) share one export file, watermark and deltas file
+_export_lock = threading.RLock()
+
+def _serialized(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _export_lock:
+            return fn(*args, **kwargs)
+    return wrapper
+
+NODES_DELTA_QUERY = """
+// @op nodes_since {label}
+MATCH (n:{label})
+WHERE n.updated_at >= $since
+RETURN id(n) AS id, n.name AS name, labels(n)[0] AS type, n.url AS url, n.updated_at AS updated_at
+"""
+
+LINKS_DELTA_QUERY = """
+// @op links_since {rel_type}
+MATCH (n)-[r:{rel_type}]->(m)
+WHERE r.updated_at >= $since
+RETURN id(n) AS source, id(m) AS target, type(r) AS type, r.updated_at AS updated_at
+"""
 
 def export_landscape_to_json(output_path: str = "src/ui/data.js"):
     """
     Queries Neo4j and exports the graph to a format compatible with D3.js.
     Uses a .js file to bypass browser CORS for local file opening.
     """
-    query = """
-    MATCH (n)
-    OPTIONAL MATCH (n)-[r]->(m)
-    RETURN collect(distinct {id: id(n), name: n.name, type: labels(n)[0], url: n.url}) as nodes,
-           collect(distinct {source: id(n), target: id(m), type: type(r)}) as links
+    return export_landscape_streaming(output_path)
+
+@_serialized
+def export_landscape_streaming(output_path: str = "src/ui/data.js", fetch_size: int = 5000,
+                               compact: bool = False, compress: bool = False, record_watermark: bool = True) -> Dict:
+    """
+    Stream the graph out of one node and one link query (`fetch_size` records per
+    round trip) and write it to disk incrementally, so neither Neo4j nor this
+    process ever holds the whole landscape.
+
+    compact=True writes positional arrays with interned type strings:
+        {"format": "compact", "nodes": [[id, type_index, name, url]],
+         "links": [[source, target, type_index]], "types": [...]}
+    compress=True (or a .gz path) gzips the output. Paths ending in .js are wrapped
+    in `const graphData = ...;` for the browser, anything else is plain JSON.
+    Returns counts, timing and the export's peak Python memory use.
+
+    With record_watermark, the newest `updated_at` seen becomes the starting point for
+    the next `export_landscape_delta`, and the deltas file beside the export is reset.
     """
-    
     print(f"📊 Exporting Neo4j data to {output_path}...")
-    
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+
+    compress = compress or output_path.endswith(".gz")
+    as_js = output_path.endswith(".js") or output_path.endswith(".js.gz")
+    opener = gzip.open if compress else open
+    types: Dict[str, int] = {}
+    watermark = [0]
+    separators = (",", ":") if compact else (", ", ": ")
+
+    def encode_node(record) -> str:
+        watermark[0] = max(watermark[0], record["updated_at"] or 0)
+        if compact:
+            return json.dumps([record["id"], _intern(types, record["type"]), record["name"], record["url"]], separators=separators)
+        return json.dumps({"id": record["id"], "name": record["name"], "type": record["type"], "url": record["url"]})
+
+    def encode_link(record) -> str:
+        watermark[0] = max(watermark[0], record["updated_at"] or 0)
+        if compact:
+            return json.dumps([record["source"], record["target"], _intern(types, record["type"])], separators=separators)
+        return json.dumps({"source": record["source"], "target": record["target"], "type": record["type"]})
+
+    newline = "" if compact else "\n"
+    indent = "" if compact else "    "
+    with opener(output_path, "wt", encoding="utf-8") as f, db.get_session(fetch_size=fetch_size) as session:
+        f.write("const graphData = " if as_js else "")
+        f.write('{"format":"compact","nodes":[' if compact else '{\n  "nodes": [')
+        node_count = _write_records(f, session.run(NODES_QUERY), encode_node, newline + indent)
+        f.write(newline + ('],"links":[' if compact else '  ],\n  "links": ['))
+        link_count = _write_records(f, session.run(LINKS_QUERY), encode_link, newline + indent)
+        if compact:
+            f.write('],"types":' + json.dumps(list(types), separators=separators) + "}")
+        else:
+            f.write("\n  ]\n}")
+        f.write(";" if as_js else "")
+
+    if record_watermark:
+        _save_watermark(output_path, watermark[0])
+        open(_deltas_path(output_path), "w").close()
+        # A level-of-detail export beside the old base no longer matches it
+        stale_lod = os.path.join(os.path.dirname(output_path) or ".", "lod", "overview.js")
+        if os.path.exists(stale_lod):
+            os.remove(stale_lod)
+
+    _, peak = tracemalloc.get_traced_memory()
+    if started_tracing:
+        tracemalloc.stop()
+
+    stats = {
+        "nodes": node_count,
+        "links": link_count,
+        "seconds": time.perf_counter() - start,
+        "peak_memory_mb": peak / (1024 * 1024),
+    }
+    print(f"✅ Export complete. Found {node_count} nodes and {link_count} links "
+          f"(peak memory {stats['peak_memory_mb']:.1f} MB).")
+    return stats
+
+@_serialized
+def export_landscape_delta(base_path: str = "src/ui/data.js") -> Dict:
+    """
+    Append everything stamped since the last export's watermark (less
+    DELTA_SAFETY_LAG_MS) to `deltas.js` beside the base export, as one
+    `graphDeltas.push({since, until, nodes, links})` line. Cost tracks the size of the
+    change, not of the graph. Falls back to a full export when no watermark has been
+    recorded yet.
+    """
+    watermark = _load_watermark(base_path)
+    if watermark is None:
+        return export_landscape_streaming(base_path)
+
+    start = time.perf_counter()
+    since = max(0, watermark - DELTA_SAFETY_LAG_MS)
+    until = watermark
+    nodes, links = [], []
     with db.get_session() as session:
-        result = session.run(query).single()
-        
-        # Filter out empty targets in links
-        links = [l for l in result['links'] if l['target'] is not None]
-        
-        data = {
-            "nodes": result['nodes'],
-            "links": links
+        for label in DELTA_LABELS:
+            for record in session.run(NODES_DELTA_QUERY.format(label=label), since=since):
+                until = max(until, record["updated_at"])
+                nodes.append({"id": record["id"], "name": record["name"], "type": record["type"], "url": record["url"]})
+        for rel_type in DELTA_REL_TYPES:
+            for record in session.run(LINKS_DELTA_QUERY.format(rel_type=rel_type), since=since):
+                until = max(until, record["updated_at"])
+                links.append({"source": record["source"], "target": record["target"], "type": record["type"]})
+
+    delta = {"since": since, "until": until, "nodes": nodes, "links": links}
+    with open(_deltas_path(base_path), "a", encoding="utf-8") as f:
+        f.write("(window.graphDeltas = window.graphDeltas || []).push(" + json.dumps(delta, separators=(",", ":")) + ");\n")
+    _save_watermark(base_path, until)
+
+    stats = {"nodes": len(nodes), "links": len(links), "since": since, "until": until,
+             "seconds": time.perf_counter() - start}
+    print(f"✅ Delta export complete. {len(nodes)} changed nodes and {len(links)} changed links.")
+    return stats
+
+@_serialized
+def export_landscape_lod(output_dir: str = "src/ui/lod", fetch_size: int = 5000, iterations: int = 60,
+                         tile_nodes: int = 2000) -> Dict:
+    """
+    Level-of-detail export for large landscapes: positions are computed here (force
+    layout + communities, see src/data/layout.py) so the browser never simulates.
+
+    Writes `overview.js`:
+        const graphLOD = {"format": "lod", "types": [...], "bounds": [x0, y0, x1, y1],
+                          "tile_size": s, "tiles": {"i_j": node_count},
+                          "communities": [[id, x, y, radius, size, label]],
+                          "community_links": [[a, b, weight]], "watermark": w, ...};
+    and one `tiles/i_j.js` per occupied square of side `tile_size` (about `tile_nodes`
+    nodes each), calling `wheelTile({"key", "nodes": [[id, type, name, url, x, y, community]],
+    "links": [[source, target, type, x1, y1, x2, y2]]})`. A link is written to the tiles of
+    both endpoints, so it is drawn as soon as either end is in view. Script files keep
+    on-demand loading working from file://, like data.js.
+
+    `watermark` is the newest `updated_at` the layout saw: viewers fall back to data.js
+    once a delta export carries anything newer, and a full export removes the overview.
+    """
+    print(f"🗺️ Exporting level-of-detail landscape to {output_dir}...")
+    start = time.perf_counter()
+    types: Dict[str, int] = {}
+    ids, node_types, names, urls = [], [], [], []
+    link_sources, link_targets, link_types = [], [], []
+    watermark = 0
+    with db.get_session(fetch_size=fetch_size) as session:
+        for record in session.run(NODES_QUERY):
+            ids.append(record["id"])
+            node_types.append(_intern(types, record["type"]))
+            names.append(record["name"])
+            urls.append(record["url"])
+            watermark = max(watermark, record["updated_at"] or 0)
+        for record in session.run(LINKS_QUERY):
+            watermark = max(watermark, record["updated_at"] or 0)
+            link_sources.append(record["source"])
+            link_targets.append(record["target"])
+            link_types.append(_intern(types, record["type"]))
+
+    # Sort nodes by id once, so link endpoints map to rows by binary search
+    order = np.argsort(np.asarray(ids, dtype=np.int64), kind="stable")
+    ids = np.asarray(ids, dtype=np.int64)[order]
+    node_types, names, urls = ([values[i] for i in order] for values in (node_types, names, urls))
+    n = len(ids)
+    sources, targets = _rows(ids, link_sources), _rows(ids, link_targets)
+    known = (sources >= 0) & (targets >= 0)
+    sources, targets = sources[known], targets[known]
+    link_types = np.asarray(link_types, dtype=np.int64)[known]
+    if n == 0:
+        positions = np.zeros((0, 2))
+        communities = np.zeros(0, dtype=np.int64)
+    else:
+        communities = detect_communities(n, sources, targets)
+        positions = np.round(force_layout(n, sources, targets, communities, iterations=iterations), 2)
+
+    # Coarse level: one super-node per community at its centroid, labelled by its best-connected node
+    count = int(communities.max()) + 1 if n else 0
+    sizes = np.maximum(np.bincount(communities, minlength=count), 1)
+    centres = np.column_stack([np.bincount(communities, positions[:, axis], minlength=count) / sizes for axis in range(2)])
+    spread = np.sqrt(np.bincount(communities, ((positions - centres[communities]) ** 2).sum(axis=1), minlength=count) / sizes)
+    degree = np.bincount(np.concatenate([sources, targets]), minlength=n)
+    hubs = np.lexsort((-degree, communities))
+    hubs = hubs[np.r_[True, communities[hubs][1:] != communities[hubs][:-1]]] if n else hubs
+    a, b = communities[sources], communities[targets]
+    pairs = (np.minimum(a, b) * count + np.maximum(a, b))[a != b]
+    community_pairs, weights = np.unique(pairs, return_counts=True)
+
+    # Detail level: square tiles sized for about tile_nodes nodes each
+    low = positions.min(axis=0) if n else np.zeros(2)
+    high = positions.max(axis=0) if n else np.zeros(2)
+    tile_size = float(max((high - low).max(), 1.0) / max(np.ceil(np.sqrt(n / tile_nodes)), 1))
+    cells = np.floor((positions - low) / tile_size).astype(np.int64)
+    tile_keys = [f"{i}_{j}" for i, j in cells.tolist()]
+
+    tiles_dir = os.path.join(output_dir, "tiles")
+    os.makedirs(tiles_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(tiles_dir, "*.js")):
+        os.remove(stale)
+
+    tile_of = {}
+    for row, key in enumerate(tile_keys):
+        tile_of.setdefault(key, []).append(row)
+    links_of = {}
+    for link, (source, target) in enumerate(zip(sources.tolist(), targets.tolist())):
+        links_of.setdefault(tile_keys[source], []).append(link)
+        if tile_keys[target] != tile_keys[source]:
+            links_of.setdefault(tile_keys[target], []).append(link)
+
+    for key, rows in tile_of.items():
+        tile = {
+            "key": key,
+            "nodes": [[int(ids[r]), node_types[r], names[r], urls[r], *positions[r].tolist(), int(communities[r])] for r in rows],
+            "links": [[int(ids[sources[l]]), int(ids[targets[l]]), int(link_types[l]),
+                       *positions[sources[l]].tolist(), *positions[targets[l]].tolist()] for l in links_of.get(key, [])],
         }
-        
-        with open(output_path, 'w') as f:
-            f.write(f"const graphData = {json.dumps(data, indent=2)};")
-            
-    print(f"✅ Export complete. Found {len(data['nodes'])} nodes and {len(data['links'])} links.")
+        with open(os.path.join(tiles_dir, f"{key}.js"), "w", encoding="utf-8") as f:
+            f.write("wheelTile(" + json.dumps(tile, separators=(",", ":")) + ");\n")
+
+    overview = {
+        "format": "lod",
+        "types": list(types),
+        "bounds": [*low.tolist(), *high.tolist()],
+        "tile_size": tile_size,
+        "tiles": {key: len(rows) for key, rows in tile_of.items()},
+        "total_nodes": n,
+        "total_links": int(len(sources)),
+        "watermark": watermark,
+        "communities": [[c, *np.round(centres[c], 2).tolist(), round(float(spread[c]), 2), int(sizes[c]), names[hubs[c]]]
+                        for c in range(count)],
+        "community_links": [[int(p // count), int(p % count), int(w)] for p, w in zip(community_pairs, weights)],
+    }
+    with open(os.path.join(output_dir, "overview.js"), "w", encoding="utf-8") as f:
+        f.write("const graphLOD = " + json.dumps(overview, separators=(",", ":")) + ";\n")
+
+    stats = {"nodes": n, "links": int(len(sources)), "communities": count, "tiles": len(tile_of),
+             "seconds": time.perf_counter() - start}
+    print(f"✅ LOD export complete. {n} nodes in {count} communities across {len(tile_of)} tiles "
+          f"({stats['seconds']:.1f}s).")
+    return stats
+
+def _state_path(base_path: str) -> str:
+    return os.path.join(os.path.dirname(base_path) or ".", "export_state.json")
+
+def _deltas_path(base_path: str) -> str:
+    return os.path.join(os.path.dirname(base_path) or ".", "deltas.js")
+
+def _load_watermark(base_path: str):
+    try:
+        with open(_state_path(base_path)) as f:
+            return json.load(f)["watermark"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def _save_watermark(base_path: str, watermark: int):
+    with open(_state_path(base_path), "w") as f:
+        json.dump({"watermark": watermark}, f)
+
+def _write_records(f, records, encode, prefix: str) -> int:
+    """Write each record of a (lazily fetched) result as it arrives."""
+    count = 0
+    for record in records:
+        f.write(("," if count else "") + prefix + encode(record))
+        count += 1
+    return count
+
+def _rows(ids: np.ndarray, node_ids) -> np.ndarray:
+    """Row of each node id in the sorted `ids` array, -1 where the id is unknown."""
+    node_ids = np.asarray(node_ids, dtype=np.int64)
+    rows = np.minimum(np.searchsorted(ids, node_ids), max(len(ids) - 1, 0))
+    if len(ids) == 0:
+        return np.full(len(node_ids), -1, dtype=np.int64)
+    return np.where(ids[rows] == node_ids, rows, -1)
+
+def _intern(types: Dict[str, int], name: str) -> int:
+    if name not in types:
+        types[name] = len(types)
+    return types[name]
 
 if __name__ == "__main__":
     # Smoke test
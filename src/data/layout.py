@@ -0,0 +1,159 @@
+from typing import Optional
+import numpy as np
+
+def detect_communities(n: int, sources: np.ndarray, targets: np.ndarray, iterations: int = 20,
+                       min_size: Optional[int] = None, seed: int = 0) -> np.ndarray:
+    """
+    Community ids 0..C-1 (numbered by size, 0 = largest) for an undirected edge list.
+    Vectorized label propagation first: every round each node takes the most common
+    label among its neighbours (keeping its own on ties, otherwise breaking them at
+    random). Propagation leaves many small fragments on sparse and bipartite graphs
+    (projects <-> topics/components), so communities below `min_size` (default
+    n / 500) are then merged into the neighbouring community they share most edges
+    with, keeping the overview to a few hundred super-nodes.
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n, dtype=np.int64)
+    if n == 0:
+        return labels
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    frm = np.concatenate([sources, targets])
+    to = np.concatenate([targets, sources])
+
+    for _ in range(iterations):
+        keys, counts = np.unique(frm * n + labels[to], return_counts=True)
+        nodes, candidates = keys // n, keys % n
+        score = counts + 0.5 * (candidates == labels[nodes]) + 0.1 * rng.random(len(counts))
+        order = np.lexsort((-score, nodes))
+        first = order[np.r_[True, nodes[order][1:] != nodes[order][:-1]]]
+        best_nodes, best = nodes[first], candidates[first]
+        if np.array_equal(labels[best_nodes], best):
+            break
+        labels[best_nodes] = best
+
+    labels = _merge_small(n, labels, sources, targets, min_size or max(2, n // 500))
+    _, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    rank = np.empty(len(sizes), dtype=np.int64)
+    rank[np.lexsort((np.arange(len(sizes)), -sizes))] = np.arange(len(sizes))
+    return rank[inverse]
+
+def _merge_small(n: int, labels: np.ndarray, sources: np.ndarray, targets: np.ndarray, min_size: int) -> np.ndarray:
+    """Fold communities smaller than min_size into their most-connected neighbour."""
+    while True:
+        sizes = np.bincount(labels, minlength=n)
+        a, b = labels[sources], labels[targets]
+        cross = a != b
+        frm, to = np.concatenate([a[cross], b[cross]]), np.concatenate([b[cross], a[cross]])
+        small = sizes[frm] < min_size
+        frm, to = frm[small], to[small]
+        if len(frm) == 0:
+            break
+        keys, counts = np.unique(frm * n + to, return_counts=True)
+        community, neighbour = keys // n, keys % n
+        order = np.lexsort((-sizes[neighbour], -counts, community))
+        first = order[np.r_[True, community[order][1:] != community[order][:-1]]]
+        community, neighbour = community[first], neighbour[first]
+        # Only merge "upwards" (into a bigger community, ties by id) so merges never cycle
+        upward = (sizes[neighbour] > sizes[community]) | (
+            (sizes[neighbour] == sizes[community]) & (neighbour < community))
+        if not upward.any():
+            break
+        mapping = np.arange(n)
+        mapping[community[upward]] = neighbour[upward]
+        while True:
+            followed = mapping[mapping]
+            if np.array_equal(followed, mapping):
+                break
+            mapping = followed
+        labels = mapping[labels]
+
+    # Whatever is still small has no neighbours left (isolated nodes): pool it
+    sizes = np.bincount(labels, minlength=n)
+    stray = sizes[labels] < min_size
+    if stray.sum() > 1:
+        labels = labels.copy()
+        labels[stray] = labels[stray].min()
+    return labels
+
+def force_layout(n: int, sources: np.ndarray, targets: np.ndarray, communities: Optional[np.ndarray] = None,
+                 iterations: int = 60, grid: int = 32, weights: Optional[np.ndarray] = None, seed: int = 0) -> np.ndarray:
+    """
+    Fruchterman-Reingold layout with grid-approximated repulsion, as (n, 2) positions.
+    Nodes are binned into a grid x grid mesh each iteration: far-field repulsion is
+    computed between occupied cells (mass = node count), near-field against the node's
+    own cell centroid, so an iteration costs O(n + edges + cells^2) instead of O(n^2).
+    Attraction runs along every edge. With `communities`, the community graph is laid
+    out first and each node starts next to its community's centre, which keeps
+    clusters together and cuts the iterations needed.
+    The ideal edge length is 1, so the layout spans roughly sqrt(n) x sqrt(n).
+    """
+    rng = np.random.default_rng(seed)
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=np.float64)
+    side = np.sqrt(max(n, 1))
+    if n == 0:
+        return np.zeros((0, 2))
+
+    if communities is not None and communities.max() > 0:
+        count = int(communities.max()) + 1
+        sizes = np.bincount(communities, minlength=count).astype(np.float64)
+        pairs = communities[sources] * count + communities[targets]
+        pairs = pairs[communities[sources] != communities[targets]]
+        keys, counts = np.unique(pairs, return_counts=True)
+        centres = force_layout(count, keys // count, keys % count, iterations=iterations,
+                               grid=grid, weights=np.log1p(counts), seed=seed)
+        # Spread the centres so each community has room for its members
+        centres *= side / np.sqrt(count)
+        spread = np.sqrt(sizes)[communities]
+        angle = rng.random(n) * 2 * np.pi
+        radius = np.sqrt(rng.random(n)) * spread * 0.1
+        positions = centres[communities] + np.column_stack([np.cos(angle), np.sin(angle)]) * radius[:, None]
+        temperature = side / 20
+    else:
+        positions = rng.random((n, 2)) * side
+        temperature = side / 5
+
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        displacement = _repulsion(positions, grid)
+
+        delta = positions[sources] - positions[targets]
+        distance = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 1e-6)
+        pull = (delta * (distance * weights)[:, None])  # |f| = d^2 / k with k = 1
+        for axis in range(2):
+            displacement[:, axis] -= np.bincount(sources, pull[:, axis], minlength=n)
+            displacement[:, axis] += np.bincount(targets, pull[:, axis], minlength=n)
+
+        # Light gravity keeps disconnected pieces from drifting off
+        displacement -= (positions - positions.mean(axis=0)) * 0.05
+        length = np.maximum(np.hypot(displacement[:, 0], displacement[:, 1]), 1e-9)
+        positions += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature = max(temperature - cooling, 1e-3)
+
+    return positions - positions.min(axis=0)
+
+def _repulsion(positions: np.ndarray, grid: int) -> np.ndarray:
+    """Per-node repulsive force (k^2 / d with k = 1), approximated on a grid."""
+    low = positions.min(axis=0)
+    extent = np.maximum(positions.max(axis=0) - low, 1e-9)
+    cells = np.minimum((positions - low) / extent * grid, grid - 1).astype(np.int64)
+    cell = cells[:, 0] * grid + cells[:, 1]
+    occupied, members, mass = np.unique(cell, return_inverse=True, return_counts=True)
+    centroids = np.column_stack([
+        np.bincount(members, positions[:, 0]) / mass,
+        np.bincount(members, positions[:, 1]) / mass,
+    ])
+
+    # Far field: every occupied cell against every other one
+    delta = centroids[:, None, :] - centroids[None, :, :]
+    distance2 = np.maximum((delta ** 2).sum(axis=2), 1e-6)
+    np.fill_diagonal(distance2, np.inf)
+    far = (delta * (mass[None, :] / distance2)[:, :, None]).sum(axis=1)
+
+    # Near field: the rest of the node's own cell, lumped at its centroid
+    offset = positions - centroids[members]
+    near2 = np.maximum((offset ** 2).sum(axis=1), 1e-4)
+    near = offset * ((mass[members] - 1) / near2)[:, None]
+    return far[members] + near
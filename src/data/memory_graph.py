@@ -0,0 +1,337 @@
+import re
+import threading
+import time
+from collections import Counter
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Queries that mock mode can answer start with a tag naming the MemoryGraph operation:
+#   // @op upsert_projects
+# Arguments after the op name are passed positionally (e.g. "// @op nodes_since Project").
+OP_TAG = re.compile(r"\s*//\s*@op\s+([^\n]+)")
+
+# MERGE key per label, mirroring the uniqueness constraints in schema.cypher
+NODE_KEYS = {"Project": "url", "Author": "username", "Topic": "name", "Component": "name"}
+
+class MemoryGraph:
+    """
+    In-memory property graph used by mock mode.
+    Nodes are hash-indexed by (label, merge key) so MERGE is an O(1) upsert, and every
+    relationship type keeps outgoing and incoming adjacency sets. Each label and
+    relationship type also keeps its members sorted by `updated_at`, so the changes
+    since a watermark are a bisect away.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[int, Dict] = {}
+        self.rels: Dict[int, Dict] = {}
+        self.out: Dict[str, Dict[int, Set[int]]] = {}
+        self.inc: Dict[str, Dict[int, Set[int]]] = {}
+        self._key_index: Dict[Tuple[str, Any], int] = {}
+        self._rel_index: Dict[Tuple[str, int, int], int] = {}
+        self._by_label: Dict[str, List[int]] = {}
+        self._node_ids: List[int] = []
+        self._rel_ids: List[int] = []
+        # label / relationship type -> sorted (updated_at, id): the updated_at indexes
+        self._node_stamps: Dict[str, List[Tuple[int, int]]] = {}
+        self._rel_stamps: Dict[str, List[Tuple[int, int]]] = {}
+        # (-blue_ocean_score, topic id), ascending: the blue_ocean_score index
+        self._topic_rank: List[Tuple[float, int]] = []
+        # topic id -> Counter(component id -> projects of the topic using it), kept incrementally
+        self._topic_components: Dict[int, Counter] = {}
+        self._next_id = 0
+        self._clock = 0
+        self._lock = threading.RLock()
+
+    # -- primitives -------------------------------------------------------
+
+    def stamp(self) -> int:
+        """Millisecond timestamp that is strictly increasing within this graph."""
+        self._clock = max(int(time.time() * 1000), self._clock + 1)
+        return self._clock
+
+    def find_node(self, label: str, key: Any) -> Optional[int]:
+        return self._key_index.get((label, key))
+
+    def merge_node(self, label: str, key: Any, on_create: Dict = None) -> Tuple[int, bool]:
+        """(node id, created) for the node with this label and merge key."""
+        node_id = self._key_index.get((label, key))
+        if node_id is not None:
+            return node_id, False
+        node_id = self._new_id()
+        props = {NODE_KEYS[label]: key}
+        props.update(on_create or {})
+        self.nodes[node_id] = {"id": node_id, "label": label, "props": props}
+        self._key_index[(label, key)] = node_id
+        self._by_label.setdefault(label, []).append(node_id)
+        self._node_ids.append(node_id)
+        if props.get("updated_at") is not None:
+            insort(self._node_stamps.setdefault(label, []), (props["updated_at"], node_id))
+        return node_id, True
+
+    def touch(self, node_id: int, stamp: int):
+        """Set a node's updated_at, keeping its label's updated_at index in order."""
+        node = self.nodes[node_id]
+        index = self._node_stamps.setdefault(node["label"], [])
+        old = node["props"].get("updated_at")
+        if old is not None:
+            del index[bisect_left(index, (old, node_id))]
+        node["props"]["updated_at"] = stamp
+        insort(index, (stamp, node_id))
+
+    def merge_rel(self, rel_type: str, source: int, target: int, on_create: Dict = None) -> Tuple[int, bool]:
+        """(relationship id, created) for source-[rel_type]->target."""
+        rel_id = self._rel_index.get((rel_type, source, target))
+        if rel_id is not None:
+            return rel_id, False
+        rel_id = self._new_id()
+        self.rels[rel_id] = {"id": rel_id, "type": rel_type, "source": source, "target": target, "props": dict(on_create or {})}
+        self._rel_index[(rel_type, source, target)] = rel_id
+        self.out.setdefault(rel_type, {}).setdefault(source, set()).add(target)
+        self.inc.setdefault(rel_type, {}).setdefault(target, set()).add(source)
+        self._rel_ids.append(rel_id)
+        if (on_create or {}).get("updated_at") is not None:
+            insort(self._rel_stamps.setdefault(rel_type, []), (on_create["updated_at"], rel_id))
+        return rel_id, True
+
+    def neighbors(self, rel_type: str, node_id: int, incoming: bool = False) -> Set[int]:
+        adjacency = self.inc if incoming else self.out
+        return adjacency.get(rel_type, {}).get(node_id, set())
+
+    def label_ids(self, label: str) -> List[int]:
+        return self._by_label.get(label, [])
+
+    def props(self, node_id: int) -> Dict:
+        return self.nodes[node_id]["props"]
+
+    def node_record(self, node_id: int) -> Dict:
+        """Node in the exporter's shape."""
+        node = self.nodes[node_id]
+        props = node["props"]
+        return {"id": node_id, "name": props.get("name"), "type": node["label"],
+                "url": props.get("url"), "updated_at": props.get("updated_at")}
+
+    def rel_record(self, rel_id: int) -> Dict:
+        rel = self.rels[rel_id]
+        return {"rel_id": rel_id, "source": rel["source"], "target": rel["target"],
+                "type": rel["type"], "updated_at": rel["props"].get("updated_at")}
+
+    def stats(self) -> Dict:
+        return {"nodes": len(self.nodes), "links": len(self.rels)}
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    # -- query operations (see OP_TAG) ------------------------------------
+
+    def op_upsert_projects(self, rows: List[Dict]) -> List[Dict]:
+        """GraphWriter's batched UNWIND upsert."""
+        written = set()
+        for row in rows:
+            stamp = self.stamp()
+            project, _ = self.merge_node("Project", row["url"])
+            written.add(project)
+            props = self.props(project)
+            fields = {"stars": row.get("stars"), "description": row.get("description"), "primary_language": row.get("language")}
+            if row.get("partial"):
+                # Stubs only fill in what is still unknown
+                fields = {key: value if props.get(key) is None else props[key] for key, value in fields.items()}
+            props.update(fields, name=row.get("name"))
+            self.touch(project, stamp)
+            for key in ("languages", "latest_release"):
+                if row.get(key) is not None:
+                    self.props(project)[key] = row[key]
+            if row.get("author") is not None:
+                author, _ = self.merge_node("Author", row["author"], {"name": row["author"], "updated_at": stamp})
+                self.merge_rel("CREATED", author, project, {"updated_at": stamp})
+            new_topics = set()
+            for topic_name in row.get("topics") or []:
+                topic, _ = self.merge_node("Topic", topic_name, {"updated_at": stamp})
+                _, created = self.merge_rel("TAGGED_WITH", project, topic, {"updated_at": stamp})
+                if created:
+                    new_topics.add(topic)
+            new_components = self._link_components(project, row.get("components") or [], stamp)
+            self._count_new_edges(project, new_topics, new_components)
+        self._refresh_project_topics(written)
+        return []
+
+    def op_save_project(self, **project) -> List[Dict]:
+        """GitHubAdapter.save_to_graph (one project, no components)."""
+        return self.op_upsert_projects([dict(project, components=[])])
+
+    def op_link_components(self, url: str, components: List[Dict]) -> List[Dict]:
+        project = self.find_node("Project", url)
+        if project is not None:
+            self._count_new_edges(project, set(), self._link_components(project, components, self.stamp()))
+            self._refresh_project_topics({project})
+        return []
+
+    def op_top_blue_oceans(self, k: int, min_projects: int) -> List[Dict]:
+        """Walk the score index from the top, like ORDER BY ... LIMIT on an indexed property."""
+        results = []
+        for _, topic in self._topic_rank:
+            if len(results) >= k:
+                break
+            props = self.props(topic)
+            if props["project_count"] >= min_projects:
+                results.append({
+                    "topic": props["name"],
+                    "project_count": props["project_count"],
+                    "component_count": props["component_count"],
+                    "blue_ocean_score": props["blue_ocean_score"],
+                })
+        return results
+
+    def op_rebuild_topic_stats(self) -> List[Dict]:
+        """Full recompute of every topic's counts and component refcounts."""
+        self._topic_rank = []
+        self._topic_components = {}
+        for topic in self.label_ids("Topic"):
+            projects = self.neighbors("TAGGED_WITH", topic, incoming=True)
+            refcounts = self._topic_components[topic] = Counter()
+            for project in projects:
+                refcounts.update(self.neighbors("USES", project))
+            props = self.props(topic)
+            props.pop("blue_ocean_score", None)
+            props["project_count"] = len(projects)
+            props["component_count"] = len(refcounts)
+            self._refresh_topic(topic)
+        return []
+
+    def op_count_topics(self) -> List[Dict]:
+        return [{"topics": len(self.label_ids("Topic"))}]
+
+    def op_incidence(self) -> List[Dict]:
+        """Every project with its topic and component names."""
+        return [
+            {
+                "name": self.props(project).get("name"),
+                "url": self.props(project)["url"],
+                "topics": [self.props(t)["name"] for t in self.neighbors("TAGGED_WITH", project)],
+                "components": [self.props(c)["name"] for c in self.neighbors("USES", project)],
+            }
+            for project in self.label_ids("Project")
+        ]
+
+    def op_nodes(self) -> List[Dict]:
+        return [self.node_record(i) for i in self._node_ids]
+
+    def op_links(self) -> List[Dict]:
+        records = [self.rel_record(i) for i in self._rel_ids]
+        for record in records:
+            del record["rel_id"]
+        return records
+
+    def op_nodes_since(self, label: str, since: int) -> List[Dict]:
+        """Range scan of the label's updated_at index, oldest change first."""
+        index = self._node_stamps.get(label, [])
+        return [self.node_record(i) for _, i in index[bisect_left(index, (since,)):]]
+
+    def op_links_since(self, rel_type: str, since: int) -> List[Dict]:
+        index = self._rel_stamps.get(rel_type, [])
+        records = []
+        for _, rel_id in index[bisect_left(index, (since,)):]:
+            record = self.rel_record(rel_id)
+            del record["rel_id"]
+            records.append(record)
+        return records
+
+    def _refresh_project_topics(self, projects: Set[int]):
+        topics = set()
+        for project in projects:
+            topics |= self.neighbors("TAGGED_WITH", project)
+        for topic in topics:
+            self._refresh_topic(topic)
+
+    def _count_new_edges(self, project: int, new_topics: Set[int], new_components: Set[int]):
+        """Incremental topic counts for a project's newly created TAGGED_WITH / USES edges."""
+        old_components = self.neighbors("USES", project) - new_components
+        for topic in new_topics:
+            props = self.props(topic)
+            props["project_count"] = props.get("project_count", 0) + 1
+            for component in old_components:
+                self._count_pair(topic, component)
+        for component in new_components:
+            for topic in self.neighbors("TAGGED_WITH", project):
+                self._count_pair(topic, component)
+
+    def _count_pair(self, topic: int, component: int):
+        refcounts = self._topic_components.setdefault(topic, Counter())
+        refcounts[component] += 1
+        if refcounts[component] == 1:
+            props = self.props(topic)
+            props["component_count"] = props.get("component_count", 0) + 1
+
+    def _refresh_topic(self, topic: int):
+        """Re-score one topic from its maintained counts and re-rank it."""
+        props = self.props(topic)
+        if "blue_ocean_score" in props:
+            old = (-props["blue_ocean_score"], topic)
+            del self._topic_rank[bisect_left(self._topic_rank, old)]
+        project_count, component_count = props.get("project_count", 0), props.get("component_count", 0)
+        props["project_count"], props["component_count"] = project_count, component_count
+        props["blue_ocean_score"] = project_count * 1.0 / (component_count + 1)
+        insort(self._topic_rank, (-props["blue_ocean_score"], topic))
+
+    def _link_components(self, project: int, components: List[Dict], stamp: int) -> Set[int]:
+        """Merge USES edges; returns the components that were newly linked."""
+        linked = set()
+        for component in components:
+            node, created = self.merge_node("Component", component["name"], {"updated_at": stamp})
+            props = self.props(node)
+            if not created and props.get("type") != component.get("type"):
+                self.touch(node, stamp)
+            props["type"] = component.get("type")
+            _, created = self.merge_rel("USES", project, node, {"updated_at": stamp})
+            if created:
+                linked.add(node)
+        return linked
+
+class MemorySession:
+    """Session over a MemoryGraph that runs tagged queries (see OP_TAG)."""
+
+    def __init__(self, graph: MemoryGraph):
+        self.graph = graph
+
+    def __enter__(self): return self
+    def __exit__(self, exc_type, exc_val, exc_tb): pass
+
+    @property
+    def storage(self) -> Dict:
+        """Whole graph as {"nodes", "links"} in the exporter's shape."""
+        with self.graph._lock:
+            return {
+                "nodes": [self.graph.node_record(i) for i in self.graph._node_ids],
+                "links": [self.graph.rel_record(i) for i in self.graph._rel_ids],
+            }
+
+    def run(self, query: str, **params) -> "MemoryResult":
+        match = OP_TAG.match(query)
+        if not match:
+            raise ValueError("Mock mode only runs queries tagged with a leading '// @op <name>' comment, "
+                             f"got: {query.strip()[:80]}")
+        op, *args = match.group(1).split()
+        handler = getattr(self.graph, f"op_{op}", None)
+        if handler is None:
+            raise ValueError(f"Unknown mock graph operation '// @op {op}' (MemoryGraph has no op_{op})")
+        with self.graph._lock:
+            return MemoryResult(handler(*args, **params))
+
+class MemoryResult:
+    """Minimal neo4j.Result look-alike over a list of record dicts."""
+
+    def __init__(self, records: List[Dict]):
+        self.records = records
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.records)
+
+    def single(self) -> Optional[Dict]:
+        return self.records[0] if self.records else None
+
+    def data(self) -> List[Dict]:
+        return list(self.records)
+
+    def consume(self):
+        return None
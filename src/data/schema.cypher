@@ -1,16 +1,35 @@
 // The Wheel: Neo4j Schema Constraints & Indexes
+// Applied idempotently by src/data/schema.py (on connect, or `python -m src.data.schema`).
 
-// Project Constraints
-CREATE CONSTRAINT project_name_unique IF NOT EXISTS
-FOR (p:Project) REQUIRE p.name IS UNIQUE;
+// Migrations: constraints on keys that ingestion never MERGEs on
+DROP CONSTRAINT project_name_unique IF EXISTS;
+DROP CONSTRAINT component_id_unique IF EXISTS;
+
+// Project Constraints (MERGE key)
+CREATE CONSTRAINT project_url_unique IF NOT EXISTS
+FOR (p:Project) REQUIRE p.url IS UNIQUE;
 
 // Author Constraints
 CREATE CONSTRAINT author_username_unique IF NOT EXISTS
 FOR (a:Author) REQUIRE a.username IS UNIQUE;
 
+// Topic Constraints
+CREATE CONSTRAINT topic_name_unique IF NOT EXISTS
+FOR (t:Topic) REQUIRE t.name IS UNIQUE;
+
 // Component Constraints
-CREATE CONSTRAINT component_id_unique IF NOT EXISTS
-FOR (c:Component) REQUIRE c.id IS UNIQUE;
+CREATE CONSTRAINT component_name_unique IF NOT EXISTS
+FOR (c:Component) REQUIRE c.name IS UNIQUE;
+
+// Indexes for Lookups and Filters
+CREATE INDEX project_name_index IF NOT EXISTS
+FOR (p:Project) ON (p.name);
+
+CREATE INDEX project_stars_index IF NOT EXISTS
+FOR (p:Project) ON (p.stars);
+
+CREATE INDEX project_language_index IF NOT EXISTS
+FOR (p:Project) ON (p.primary_language);
 
 // Indexes for Similarity Queries
 CREATE INDEX project_description_index IF NOT EXISTS
@@ -19,8 +38,35 @@ FOR (p:Project) ON (p.description);
 CREATE INDEX component_type_index IF NOT EXISTS
 FOR (c:Component) ON (c.type);
 
+// Index for Blue Ocean top-k (per-topic stats maintained during ingestion)
+CREATE INDEX topic_blue_ocean_score_index IF NOT EXISTS
+FOR (t:Topic) ON (t.blue_ocean_score);
+
+// Indexes for Delta Export (changes since the last export watermark)
+CREATE INDEX project_updated_at_index IF NOT EXISTS
+FOR (p:Project) ON (p.updated_at);
+
+CREATE INDEX author_updated_at_index IF NOT EXISTS
+FOR (a:Author) ON (a.updated_at);
+
+CREATE INDEX topic_updated_at_index IF NOT EXISTS
+FOR (t:Topic) ON (t.updated_at);
+
+CREATE INDEX component_updated_at_index IF NOT EXISTS
+FOR (c:Component) ON (c.updated_at);
+
+CREATE INDEX uses_updated_at_index IF NOT EXISTS
+FOR ()-[r:USES]-() ON (r.updated_at);
+
+CREATE INDEX created_updated_at_index IF NOT EXISTS
+FOR ()-[r:CREATED]-() ON (r.updated_at);
+
+CREATE INDEX tagged_with_updated_at_index IF NOT EXISTS
+FOR ()-[r:TAGGED_WITH]-() ON (r.updated_at);
+
 // Relationships Summary
 // (Project)-[:SIMILAR_TO {score: float}]->(Project)
 // (Project)-[:USES]->(Component)
 // (Project)-[:COMPETES_WITH]->(Project)
 // (Author)-[:CREATED]->(Project)
+// (Topic)-[:TOPIC_COMPONENT {projects: int}]->(Component)  blue-ocean refcounts kept by the writer
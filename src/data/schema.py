@@ -0,0 +1,103 @@
+import argparse
+import os
+import re
+from typing import Dict, List
+from src.data.connection import db
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.cypher")
+
+class SchemaError(Exception):
+    """Raised when a constraint or index that ingestion depends on is missing or unusable."""
+
+def load_statements(path: str = SCHEMA_PATH) -> List[str]:
+    """Cypher statements from a schema file, without comments."""
+    with open(path) as f:
+        text = "\n".join(line for line in f.read().splitlines() if not line.strip().startswith("//"))
+    return [statement.strip() for statement in text.split(";") if statement.strip()]
+
+def required_names(statements: List[str]) -> Dict[str, List[str]]:
+    """Names of the constraints and indexes the schema file creates."""
+    names = {"constraints": [], "indexes": []}
+    for statement in statements:
+        match = re.match(r"CREATE\s+(CONSTRAINT|INDEX)\s+(\w+)", statement, re.IGNORECASE)
+        if match:
+            kind = "constraints" if match.group(1).upper() == "CONSTRAINT" else "indexes"
+            names[kind].append(match.group(2))
+    return names
+
+def bootstrap_schema(path: str = SCHEMA_PATH, await_seconds: int = 300) -> Dict:
+    """
+    Apply the schema file (every statement is idempotent), wait for the new indexes
+    to come online and verify them. Safe to run on every connect.
+    """
+    if db.mock_mode:
+        return {"mode": "mock"}
+    statements = load_statements(path)
+    with db.get_session() as session:
+        for statement in statements:
+            session.run(statement).consume()
+        session.run("CALL db.awaitIndexes($seconds)", seconds=await_seconds).consume()
+        status = schema_status(session)
+    verify_schema(status, required_names(statements))
+    print(f"🗂️ Schema ready: {len(status['constraints'])} constraints, {len(status['indexes'])} indexes.")
+    return status
+
+def schema_status(session) -> Dict:
+    """Current constraints and index states, keyed by name."""
+    constraints = {
+        record["name"]: {"type": record["type"], "labels": record["labelsOrTypes"], "properties": record["properties"]}
+        for record in session.run("SHOW CONSTRAINTS YIELD name, type, labelsOrTypes, properties")
+    }
+    indexes = {
+        record["name"]: {
+            "state": record["state"],
+            "population": record["populationPercent"],
+            "labels": record["labelsOrTypes"],
+            "properties": record["properties"],
+            "owning_constraint": record["owningConstraint"],
+        }
+        for record in session.run(
+            "SHOW INDEXES YIELD name, state, populationPercent, labelsOrTypes, properties, owningConstraint"
+        )
+    }
+    return {"constraints": constraints, "indexes": indexes}
+
+def verify_schema(status: Dict, required: Dict[str, List[str]]):
+    """Raise SchemaError unless every required constraint and index exists and is ONLINE."""
+    problems = [f"missing constraint {name}" for name in required["constraints"] if name not in status["constraints"]]
+    problems += [f"missing index {name}" for name in required["indexes"] if name not in status["indexes"]]
+
+    # Constraints are enforced through an owned index, which must be online too
+    required_indexes = set(required["indexes"]) | {
+        name for name, index in status["indexes"].items() if index["owning_constraint"] in required["constraints"]
+    }
+    problems += [
+        f"index {name} is {status['indexes'][name]['state']}"
+        for name in sorted(required_indexes)
+        if name in status["indexes"] and status["indexes"][name]["state"] != "ONLINE"
+    ]
+    if problems:
+        raise SchemaError("Neo4j schema is not ready: " + "; ".join(problems))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="The Wheel - Neo4j schema bootstrap")
+    parser.add_argument("--uri", default=os.environ.get("NEO4J_URI", "bolt://localhost:7687"))
+    parser.add_argument("--user", default=os.environ.get("NEO4J_USER", "neo4j"))
+    parser.add_argument("--password", default=os.environ.get("NEO4J_PASSWORD", "password"))
+    parser.add_argument("--check", action="store_true", help="Only report index state, do not apply the schema")
+    args = parser.parse_args()
+
+    db.connect(args.uri, args.user, args.password, ensure_schema=False)
+    try:
+        if args.check:
+            with db.get_session() as session:
+                status = schema_status(session)
+            for name, index in sorted(status["indexes"].items()):
+                print(f"- {name}: {index['state']} ({index['population']:.0f}%)")
+            verify_schema(status, required_names(load_statements()))
+            print("✅ All required constraints and indexes are online.")
+        else:
+            bootstrap_schema()
+    except SchemaError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
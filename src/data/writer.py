@@ -0,0 +1,157 @@
+import time
+from typing import Dict, List
+from src.data.connection import db
+
+# Full recompute of one topic `t`'s materialized blue-ocean statistics, including its
+# (Topic)-[:TOPIC_COMPONENT {projects}]->(Component) refcounts: how many of the topic's
+# projects use each component. Only used by explicit rebuilds (StrategyAdvisor.refresh_topic_stats).
+TOPIC_STATS_REBUILD = """
+CALL {
+    WITH t
+    OPTIONAL MATCH (t)-[old:TOPIC_COMPONENT]->()
+    DELETE old
+}
+CALL {
+    WITH t
+    OPTIONAL MATCH (t)<-[:TAGGED_WITH]-(tp:Project)
+    RETURN count(DISTINCT tp) AS project_count
+}
+CALL {
+    WITH t
+    OPTIONAL MATCH (t)<-[:TAGGED_WITH]-(:Project)-[:USES]->(c:Component)
+    WITH t, c, count(*) AS projects
+    FOREACH (_ IN CASE WHEN c IS NULL THEN [] ELSE [1] END |
+        MERGE (t)-[k:TOPIC_COMPONENT]->(c)
+        SET k.projects = projects)
+    RETURN count(c) AS component_count
+}
+SET t.project_count = project_count,
+    t.component_count = component_count,
+    t.blue_ocean_score = project_count * 1.0 / (component_count + 1)
+"""
+
+# Appended to project writes (bound as `p`) that mark the TAGGED_WITH and USES edges they
+# create with `pending: true`. Stats are maintained incrementally from those new edges
+# only: a new tag adds the project to its topic along with the components it already
+# used, and a new component is counted for every topic of the project. Each write costs
+# O(degree of the written projects), never O(topic size).
+REFRESH_PROJECT_TOPICS = """
+WITH collect(DISTINCT p) AS written
+UNWIND written AS p
+CALL {
+    WITH p
+    MATCH (p)-[:TAGGED_WITH {pending: true}]->(t:Topic)
+    SET t.project_count = coalesce(t.project_count, 0) + 1
+    WITH p, t
+    MATCH (p)-[uses:USES]->(c:Component)
+    WHERE uses.pending IS NULL
+    MERGE (t)-[k:TOPIC_COMPONENT]->(c)
+    ON CREATE SET k.projects = 0, t.component_count = coalesce(t.component_count, 0) + 1
+    SET k.projects = k.projects + 1
+}
+CALL {
+    WITH p
+    MATCH (p)-[:USES {pending: true}]->(c:Component)
+    MATCH (p)-[:TAGGED_WITH]->(t:Topic)
+    MERGE (t)-[k:TOPIC_COMPONENT]->(c)
+    ON CREATE SET k.projects = 0, t.component_count = coalesce(t.component_count, 0) + 1
+    SET k.projects = k.projects + 1
+}
+CALL {
+    WITH p
+    MATCH (p)-[r:TAGGED_WITH|USES {pending: true}]->()
+    REMOVE r.pending
+}
+MATCH (p)-[:TAGGED_WITH]->(t:Topic)
+WITH DISTINCT t
+SET t.blue_ocean_score = coalesce(t.project_count, 0) * 1.0 / (coalesce(t.component_count, 0) + 1)
+"""
+
+# Every node and relationship written here is stamped with `updated_at` (server time, ms)
+# when it is created or changes, which is what the delta exporter keys on.
+UPSERT_PROJECTS_QUERY = """
+// @op upsert_projects
+UNWIND $rows AS row
+MERGE (p:Project {url: row.url})
+// Partial rows (name-only stubs, e.g. from GH Archive events) only fill in unknown fields
+SET p.name = row.name,
+    p.stars = CASE WHEN row.partial THEN coalesce(p.stars, row.stars) ELSE row.stars END,
+    p.description = CASE WHEN row.partial THEN coalesce(p.description, row.description) ELSE row.description END,
+    p.primary_language = CASE WHEN row.partial THEN coalesce(p.primary_language, row.language) ELSE row.language END,
+    p.languages = coalesce(row.languages, p.languages),
+    p.latest_release = coalesce(row.latest_release, p.latest_release),
+    p.updated_at = timestamp()
+
+FOREACH (author IN CASE WHEN row.author IS NULL THEN [] ELSE [row.author] END |
+    MERGE (a:Author {username: author})
+    ON CREATE SET a.name = author, a.updated_at = timestamp()
+    MERGE (a)-[r:CREATED]->(p)
+    ON CREATE SET r.updated_at = timestamp())
+
+FOREACH (topic IN row.topics |
+    MERGE (t:Topic {name: topic})
+    ON CREATE SET t.updated_at = timestamp()
+    MERGE (p)-[r:TAGGED_WITH]->(t)
+    ON CREATE SET r.updated_at = timestamp(), r.pending = true)
+
+FOREACH (component IN row.components |
+    MERGE (c:Component {name: component.name})
+    SET c.updated_at = CASE WHEN c.type IS NULL OR c.type <> component.type THEN timestamp() ELSE c.updated_at END
+    SET c.type = component.type
+    MERGE (p)-[r:USES]->(c)
+    ON CREATE SET r.updated_at = timestamp(), r.pending = true)
+""" + REFRESH_PROJECT_TOPICS
+
+class GraphWriter:
+    """Bulk writer that persists whole project lists in batched UNWIND transactions."""
+
+    def __init__(self, batch_size: int = 500):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.batch_size = batch_size
+
+    def write_projects(self, projects: List[Dict]) -> Dict:
+        """
+        Persist projects with their authors, topics and components.
+        Each batch is one round trip, instead of two sessions per project.
+        Returns throughput statistics for the run.
+        """
+        rows = [self._to_row(project) for project in projects if project.get("url")]
+        batches = 0
+        start = time.perf_counter()
+
+        with db.get_session() as session:
+            for offset in range(0, len(rows), self.batch_size):
+                session.run(UPSERT_PROJECTS_QUERY, rows=rows[offset:offset + self.batch_size])
+                batches += 1
+
+        elapsed = time.perf_counter() - start
+        stats = {
+            "rows": len(rows),
+            "batches": batches,
+            "seconds": elapsed,
+            "rows_per_second": len(rows) / elapsed if elapsed > 0 else float(len(rows)),
+        }
+        print(f"💾 Wrote {stats['rows']} projects in {batches} batches ({stats['rows_per_second']:.0f} rows/s)")
+        return stats
+
+    @staticmethod
+    def _to_row(project: Dict) -> Dict:
+        """Project dict -> UNWIND row with every key the query reads."""
+        return {
+            "url": project["url"],
+            "name": project.get("name"),
+            "stars": project.get("stars", 0),
+            "description": project.get("description"),
+            "language": project.get("language"),
+            "author": project.get("author"),
+            "partial": bool(project.get("partial")),
+            "topics": list(project.get("topics") or []),
+            # GraphQL enrichment, when it ran (null keeps what the node already has)
+            "languages": [language["name"] for language in project["languages"]] if project.get("languages") else None,
+            "latest_release": (project.get("latest_release") or {}).get("tag"),
+            "components": [
+                {"name": c["name"], "type": c.get("type")}
+                for c in project.get("components") or []
+            ],
+        }
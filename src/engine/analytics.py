@@ -0,0 +1,204 @@
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+from scipy import sparse
+from src.data.connection import db
+
+# One row per project with its topic and component names (pattern comprehensions,
+# so projects without topics or components are still returned)
+INCIDENCE_QUERY = """
+// @op incidence
+MATCH (p:Project)
+RETURN p.name AS name, p.url AS url,
+       [(p)-[:TAGGED_WITH]->(t:Topic) | t.name] AS topics,
+       [(p)-[:USES]->(c:Component) | c.name] AS components
+"""
+
+class LandscapeAnalytics:
+    """
+    The landscape as sparse incidence matrices: projects x topics and projects x components
+    (CSR, 0/1). Co-occurrence, overlap, saturation and gap metrics are sparse products and
+    column reductions, so they stay in the seconds range at millions of projects.
+    """
+
+    def __init__(self, projects: Sequence[str], topics: Sequence[str], components: Sequence[str],
+                 project_topics: sparse.spmatrix, project_components: sparse.spmatrix, urls: Sequence[str] = None):
+        self.projects = list(projects)
+        self.topics = list(topics)
+        self.components = list(components)
+        self.urls = list(urls) if urls is not None else [None] * len(self.projects)
+        self.project_topics = _binary(project_topics, (len(self.projects), len(self.topics)))
+        self.project_components = _binary(project_components, (len(self.projects), len(self.components)))
+        self._project_index = {name: i for i, name in enumerate(self.projects)}
+        self._project_index.update({url: i for i, url in enumerate(self.urls) if url})
+        self._topic_index = {name: i for i, name in enumerate(self.topics)}
+        self._metrics = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "LandscapeAnalytics":
+        """Build from {name, url, topics, components} rows (INCIDENCE_QUERY's shape)."""
+        projects, urls = [], []
+        topic_ids: Dict[str, int] = {}
+        component_ids: Dict[str, int] = {}
+        topic_rows, topic_cols, component_rows, component_cols = [], [], [], []
+        for row, record in enumerate(records):
+            projects.append(record["name"])
+            urls.append(record.get("url"))
+            for topic in record.get("topics") or []:
+                topic_rows.append(row)
+                topic_cols.append(topic_ids.setdefault(topic, len(topic_ids)))
+            for component in record.get("components") or []:
+                component_rows.append(row)
+                component_cols.append(component_ids.setdefault(component, len(component_ids)))
+
+        def incidence(rows, cols, width):
+            data = np.ones(len(rows), dtype=np.float32)
+            return sparse.csr_matrix((data, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+                                     shape=(len(projects), width))
+
+        return cls(projects, list(topic_ids), list(component_ids),
+                   incidence(topic_rows, topic_cols, len(topic_ids)),
+                   incidence(component_rows, component_cols, len(component_ids)), urls)
+
+    @classmethod
+    def load(cls) -> "LandscapeAnalytics":
+        """Load the incidence matrices from the current graph (Neo4j or the mock store)."""
+        start = time.perf_counter()
+        with db.get_session() as session:
+            analytics = cls.from_records(session.run(INCIDENCE_QUERY))
+        print(f"🧮 Loaded {len(analytics.projects)} projects x {len(analytics.topics)} topics x "
+              f"{len(analytics.components)} components in {time.perf_counter() - start:.2f}s")
+        return analytics
+
+    # -- topic metrics ----------------------------------------------------
+
+    def topic_cooccurrence(self) -> sparse.csr_matrix:
+        """Topics x topics: number of projects tagged with both (diagonal = topic size)."""
+        return (self.project_topics.T @ self.project_topics).tocsr()
+
+    def topic_components(self) -> sparse.csr_matrix:
+        """Topics x components: number of the topic's projects that use the component."""
+        return (self.project_topics.T @ self.project_components).tocsr()
+
+    def topic_metrics(self) -> Dict[str, np.ndarray]:
+        """
+        Per-topic arrays:
+          projects     - projects tagged with the topic
+          components   - distinct components those projects use
+          adoption     - mean share of the topic's projects using each of its components
+                         (1.0 = everyone builds on the same stack)
+          saturation   - crowding (size relative to the largest topic) x adoption
+          gap          - crowding x (1 - adoption): demand without a shared stack yet
+          blue_ocean_score - projects / (components + 1), as in StrategyAdvisor
+        """
+        if self._metrics is None:
+            projects = np.asarray(self.project_topics.sum(axis=0)).ravel()
+            usage = self.topic_components()
+            components = np.diff(usage.indptr)
+            uses = np.asarray(usage.sum(axis=1)).ravel()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                adoption = np.where(components > 0, uses / (projects * np.maximum(components, 1)), 0.0)
+            crowding = projects / projects.max() if len(projects) and projects.max() > 0 else projects * 0.0
+            self._metrics = {
+                "projects": projects.astype(np.int64),
+                "components": components.astype(np.int64),
+                "adoption": adoption,
+                "saturation": crowding * adoption,
+                "gap": crowding * (1.0 - adoption),
+                "blue_ocean_score": projects / (components + 1.0),
+            }
+        return self._metrics
+
+    def market_gaps(self, k: int = 5, min_projects: int = 2) -> List[Dict]:
+        """Topics with the highest gap score."""
+        metrics = self.topic_metrics()
+        candidates = np.flatnonzero(metrics["projects"] >= min_projects)
+        return [self._topic_record(i) for i in _top(metrics["gap"], candidates, k)]
+
+    def saturated_topics(self, k: int = 5, min_projects: int = 2) -> List[Dict]:
+        metrics = self.topic_metrics()
+        candidates = np.flatnonzero(metrics["projects"] >= min_projects)
+        return [self._topic_record(i) for i in _top(metrics["saturation"], candidates, k)]
+
+    def related_topics(self, topic: str, k: int = 5) -> List[Dict]:
+        """Topics most often tagged together with `topic`."""
+        index = self._topic_index.get(topic)
+        if index is None:
+            return []
+        column = self.project_topics[:, index]
+        counts = np.asarray((self.project_topics.T @ column).todense()).ravel()
+        counts[index] = 0
+        return [dict(self._topic_record(i), together=int(counts[i])) for i in _top(counts, np.flatnonzero(counts), k)]
+
+    # -- project metrics --------------------------------------------------
+
+    def project_index(self, name_or_url: str) -> Optional[int]:
+        return self._project_index.get(name_or_url)
+
+    def similar_projects(self, project: str, k: int = 5) -> List[Dict]:
+        """Projects with the highest component Jaccard similarity to `project`."""
+        index = self.project_index(project)
+        if index is None:
+            return []
+        jaccard, shared = self._component_jaccard(index)
+        return [
+            {"name": self.projects[i], "url": self.urls[i], "similarity": float(jaccard[i]), "shared": int(shared[i])}
+            for i in _top(jaccard, np.flatnonzero(jaccard), k)
+        ]
+
+    def missing_components(self, project: str, k: int = 5, neighbours: int = 25) -> List[Dict]:
+        """Components the most similar projects use and `project` does not, weighted by similarity."""
+        index = self.project_index(project)
+        if index is None:
+            return []
+        jaccard, _ = self._component_jaccard(index)
+        rows = np.array(_top(jaccard, np.flatnonzero(jaccard), neighbours), dtype=np.int64)
+        if len(rows) == 0:
+            return []
+        scores = np.asarray(self.project_components[rows].T @ jaccard[rows]).ravel()
+        scores[self.project_components[index].indices] = 0.0
+        return [{"name": self.components[i], "score": float(scores[i])} for i in _top(scores, np.flatnonzero(scores), k)]
+
+    def project_topics_of(self, project: str) -> List[str]:
+        index = self.project_index(project)
+        if index is None:
+            return []
+        return [self.topics[i] for i in self.project_topics[index].indices]
+
+    def _component_jaccard(self, index: int):
+        """(Jaccard similarity, shared component count) of every project against one."""
+        row = self.project_components[index]
+        shared = np.asarray((self.project_components @ row.T).todense()).ravel()
+        sizes = np.diff(self.project_components.indptr)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            jaccard = np.where(shared > 0, shared / (sizes + sizes[index] - shared), 0.0)
+        jaccard[index] = 0.0
+        return jaccard, shared
+
+    def _topic_record(self, index: int) -> Dict:
+        metrics = self.topic_metrics()
+        return {
+            "topic": self.topics[index],
+            "project_count": int(metrics["projects"][index]),
+            "component_count": int(metrics["components"][index]),
+            "adoption": float(metrics["adoption"][index]),
+            "saturation": float(metrics["saturation"][index]),
+            "gap": float(metrics["gap"][index]),
+        }
+
+def _binary(matrix: sparse.spmatrix, shape) -> sparse.csr_matrix:
+    """CSR 0/1 copy (duplicate entries collapse to 1)."""
+    matrix = sparse.csr_matrix(matrix, shape=shape, dtype=np.float32)
+    matrix.sum_duplicates()
+    matrix.eliminate_zeros()
+    matrix.data[:] = 1.0
+    return matrix
+
+def _top(scores: np.ndarray, candidates: np.ndarray, k: int) -> List[int]:
+    """Indices of the k highest scores among candidates, best first (ties by index)."""
+    if k <= 0 or len(candidates) == 0:
+        return []
+    if len(candidates) > k:
+        kth = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+        candidates = candidates[scores[candidates] >= kth]
+    return sorted(candidates.tolist(), key=lambda i: (-scores[i], i))[:k]
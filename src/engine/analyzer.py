@@ -1,38 +1,40 @@
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict
 import json
+import os
+from src.engine.matcher import DEFAULT_KEYWORDS_PATH, load_matcher
+
+# Below this many projects a process pool costs more than it saves
+PARALLEL_THRESHOLD = 5000
 
 class ProjectAnalyzer:
     """Analyzer for project metadata to identify components and building blocks."""
 
-    def __init__(self):
-        pass
+    def __init__(self, keywords_path: str = DEFAULT_KEYWORDS_PATH):
+        self.keywords_path = keywords_path
+        self.matcher = load_matcher(keywords_path)
 
     def extract_components(self, project_data: Dict) -> List[Dict]:
         """
-        Extract reusable components from project description.
+        Extract reusable components from project description, topics and name.
         In a production environment, this would call an LLM.
         For the hackathon, we simulate this with keyword extraction 
         but provide a prompt template for the AI specialist.
         """
-        description = project_data.get("description", "").lower()
-        components = []
-
-        # Simple heuristic mapping for the prototype
-        keywords = {
-            "api": {"name": "REST API", "type": "Interface"},
-            "database": {"name": "Database Layer", "type": "Storage"},
-            "auth": {"name": "Authentication System", "type": "Security"},
-            "ui": {"name": "User Interface", "type": "Frontend"},
-            "cli": {"name": "Command Line Tool", "type": "Interface"},
-            "docker": {"name": "Containerization", "type": "DevOps"},
-            "neo4j": {"name": "Graph Database", "type": "Storage"}
-        }
-
-        for key, info in keywords.items():
-            if key in description:
-                components.append(info)
-
-        return components
+        return self.matcher.match(project_data)
+
+    def extract_components_batch(self, projects: List[Dict], workers: int = None, chunksize: int = 1000) -> List[List[Dict]]:
+        """
+        Components for every project, in input order.
+        Large corpora fan out over a process pool; each worker compiles the matcher once.
+        """
+        if workers == 1 or len(projects) < PARALLEL_THRESHOLD:
+            return [self.matcher.match(project) for project in projects]
+
+        chunks = [projects[i:i + chunksize] for i in range(0, len(projects), chunksize)]
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            results = executor.map(_match_chunk, [self.keywords_path] * len(chunks), chunks)
+            return [components for chunk in results for components in chunk]
 
     def get_ai_extraction_prompt(self, project_data: Dict) -> str:
         """Generate a prompt for the Kiro AI to perform deeper analysis."""
@@ -48,6 +50,28 @@ class ProjectAnalyzer:
         [{{"name": "Component Name", "type": "Category", "description": "Why it is reusable"}}]
         """
 
+    def get_ai_batch_extraction_prompt(self, projects: List[Dict]) -> str:
+        """Prompt that asks for the components of several projects at once, keyed by index."""
+        listing = "\n".join(
+            f"[{i}] Project: {p.get('name')}\n    Description: {p.get('description') or ''}\n"
+            f"    Topics: {', '.join(p.get('topics') or [])}"
+            for i, p in enumerate(projects)
+        )
+        return f"""
+        Analyze each of the following projects and identify its core reusable components,
+        architectural building blocks, and unique features.
+
+        {listing}
+
+        Return only a JSON object mapping each project index to a list of objects:
+        {{"0": [{{"name": "Component Name", "type": "Category", "description": "Why it is reusable"}}]}}
+        """
+
+def _match_chunk(keywords_path: str, projects: List[Dict]) -> List[List[Dict]]:
+    """Process-pool worker: match one chunk with the per-process cached matcher."""
+    matcher = load_matcher(keywords_path)
+    return [matcher.match(project) for project in projects]
+
 if __name__ == "__main__":
     analyzer = ProjectAnalyzer()
     test_project = {
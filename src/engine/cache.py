@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+DEFAULT_CACHE_DIR = os.environ.get("WHEEL_CACHE_DIR", ".wheel_cache")
+
+class ResponseCache:
+    """
+    Persistent SQLite cache for API responses.
+    Entries expire after `ttl` seconds but are kept (with their ETag) so they can be
+    revalidated or served as a last known good response. Least recently used entries
+    are evicted once `max_entries` or `max_bytes` is exceeded; pass float("inf") for
+    both to keep every entry.
+    """
+
+    def __init__(self, path: str = None, ttl: float = 3600, max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "responses.sqlite")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                etag TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Stable hash of JSON-serializable key parts."""
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return {"value", "etag", "fetched_at"} for a key, fresh or stale, and mark it recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, etag, fetched_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return {"value": json.loads(row[0]), "etag": row[1], "fetched_at": row[2]}
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def put(self, key: str, value: Any, etag: str = None):
+        payload = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, etag, fetched_at, accessed_at, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, etag, now, now, len(payload)),
+            )
+            self._evict(keep=key)
+            self._conn.commit()
+
+    def touch(self, key: str):
+        """Mark an entry as freshly validated (e.g. after a 304 Not Modified)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self._conn.commit()
+
+    def values(self) -> Iterator[Any]:
+        """Every cached value, fresh or stale (without touching recency)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT value FROM entries").fetchall()
+        for (value,) in rows:
+            yield json.loads(value)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count, size = self._conn.execute("SELECT count(*), coalesce(sum(size), 0) FROM entries").fetchone()
+        return {"entries": count, "bytes": size}
+
+    def _evict(self, keep: str):
+        if self.max_entries == float("inf") and self.max_bytes == float("inf"):
+            return
+        count, size = self._conn.execute("SELECT count(*), coalesce(sum(size), 0) FROM entries").fetchone()
+        while count > self.max_entries or size > self.max_bytes:
+            # Oldest first; never evict the entry that was just written
+            victims = self._conn.execute(
+                "SELECT key, size FROM entries WHERE key != ? ORDER BY accessed_at ASC LIMIT 64", (keep,)
+            ).fetchall()
+            if not victims:
+                break
+            for key, entry_size in victims:
+                if count <= self.max_entries and size <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                count -= 1
+                size -= entry_size
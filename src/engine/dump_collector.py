@@ -0,0 +1,228 @@
+import gzip
+import itertools
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.engine.collector import BaseCollector
+from src.engine.github_adapter import extract_repo_metadata
+from src.engine.matcher import DEFAULT_KEYWORDS_PATH, load_matcher
+from src.engine.search_index import parse_query, tokenize
+
+def repo_from_record(record: Dict) -> Optional[Dict]:
+    """
+    Raw repository object from one dump record. Accepts GitHub API repository
+    objects, already-normalized project dicts, and GH Archive events, which carry a
+    full repository object only in some payloads (pull requests) and otherwise just
+    the repo name (plus a description on CreateEvent). Those name-only stubs are
+    marked `partial`: their stars, description and language are unknown, not empty.
+    """
+    if "type" in record and isinstance(record.get("repo"), dict) and "payload" in record:
+        payload = record.get("payload") or {}
+        base = ((payload.get("pull_request") or {}).get("base") or {}).get("repo")
+        if base:
+            return base
+        name = record["repo"].get("name")
+        if not name:
+            return None
+        return {"full_name": name, "html_url": f"https://github.com/{name}",
+                "description": payload.get("description"), "owner": {"login": name.split("/")[0]}, "partial": True}
+    return record
+
+def normalize_lines(lines: List[bytes]) -> Tuple[List[Dict], int]:
+    """(normalized projects, malformed line count) for a chunk of dump lines."""
+    projects, skipped = [], 0
+    for line in lines:
+        try:
+            raw = repo_from_record(json.loads(line))
+        except (ValueError, AttributeError):
+            skipped += 1
+            continue
+        project = extract_repo_metadata(raw) if isinstance(raw, dict) else None
+        if not project or not project.get("url") or not project.get("name"):
+            skipped += 1
+            continue
+        if raw.get("partial"):
+            project["partial"] = True
+        projects.append(project)
+    return projects, skipped
+
+def _process_chunk(keywords_path: str, lines: List[bytes]) -> Tuple[List[Dict], int]:
+    """Process-pool worker: parse, normalize and match components for one chunk."""
+    matcher = load_matcher(keywords_path)
+    projects, skipped = normalize_lines(lines)
+    for project in projects:
+        project["components"] = matcher.match(project)
+    return projects, skipped
+
+class DumpCollector(BaseCollector):
+    """
+    Bulk collector for newline-delimited JSON repository dumps (plain or .gz):
+    GitHub API exports, GH Archive event files or our own JSONL project files.
+
+    `ingest` streams the file in chunks of lines; a process pool parses, normalizes
+    (extract_repo_metadata, as the live adapter does) and matches components, and the
+    batched GraphWriter persists the results in file order. At most `workers * 2`
+    chunks are in flight, so memory stays constant however large the dump is. After
+    each written chunk the byte offset of its end is checkpointed, and a re-run
+    resumes from there. Offsets into .gz files count uncompressed bytes.
+    """
+
+    def __init__(self, path: str, checkpoint_path: str = None, keywords_path: str = DEFAULT_KEYWORDS_PATH,
+                 dedupe_window: int = 100_000):
+        super().__init__("Dump")
+        self.path = path
+        self.checkpoint_path = checkpoint_path or path + ".checkpoint.json"
+        self.keywords_path = keywords_path
+        # GH Archive mentions the same repo in many events; skip recently written ones
+        self.dedupe_window = dedupe_window
+
+    def extract_metadata(self, raw_data: Dict) -> Dict:
+        return extract_repo_metadata(repo_from_record(raw_data) or {})
+
+    def search(self, query: str, filters: Dict = None) -> List[Dict]:
+        """
+        Linear scan of the dump for repos containing every query term (and the
+        `language` qualifier, if given). Ingest and use LocalSearchIndex for fast search.
+        """
+        terms, qualifiers = parse_query(query, filters)
+        limit = int(filters.get("limit", 10)) if filters else 10
+        language = (qualifiers.get("language") or "").lower()
+        results = []
+        for _, lines in self.chunks(chunk_size=1000):
+            for project in normalize_lines(lines)[0]:
+                tokens = set(tokenize(f"{project['name'].replace('/', ' ')} {project.get('description') or ''}"))
+                for topic in project.get("topics") or []:
+                    tokens.update(tokenize(topic))
+                if all(term in tokens for term in terms) and (not language or project["language"] == language):
+                    results.append(project)
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def chunks(self, start: int = 0, chunk_size: int = 2000) -> Iterator[Tuple[int, List[bytes]]]:
+        """(byte offset after the chunk, raw lines) from `start` onwards."""
+        opener = gzip.open if self.path.endswith(".gz") else open
+        with opener(self.path, "rb") as f:
+            f.seek(start)
+            lines = []
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    lines.append(line)
+                if len(lines) >= chunk_size:
+                    yield f.tell(), lines
+                    lines = []
+            if lines:
+                yield f.tell(), lines
+
+    def ingest(self, writer, workers: int = None, chunk_size: int = 2000, resume: bool = True,
+               search_index=None, max_chunks: int = None) -> Dict:
+        """
+        Stream the dump into the graph through `writer` (a GraphWriter). Returns totals
+        for this run plus the final offset. `workers=1` processes in this process;
+        `search_index` (a LocalSearchIndex) also indexes every project for offline search;
+        `max_chunks` stops early (the checkpoint still records how far it got).
+        """
+        checkpoint = self.load_checkpoint() if resume else None
+        offset = checkpoint["offset"] if checkpoint else 0
+        if offset:
+            print(f"⏩ Resuming {self.path} at byte {offset}")
+
+        start = time.perf_counter()
+        totals = {"records": 0, "projects": 0, "skipped": 0, "duplicates": 0, "chunks": 0}
+        recent: OrderedDict = OrderedDict()
+
+        def persist(end: int, projects: List[Dict], skipped: int, lines: int):
+            fresh = []
+            for project in projects:
+                partial = bool(project.get("partial"))
+                # A full repo object still replaces an earlier name-only stub
+                if project["url"] in recent and (partial or not recent[project["url"]]):
+                    recent.move_to_end(project["url"])
+                    totals["duplicates"] += 1
+                    continue
+                recent[project["url"]] = partial
+                recent.move_to_end(project["url"])
+                if len(recent) > self.dedupe_window:
+                    recent.popitem(last=False)
+                fresh.append(project)
+            if fresh:
+                writer.write_projects(fresh)
+                if search_index is not None:
+                    search_index.add_projects(fresh)
+            totals["records"] += lines
+            totals["projects"] += len(fresh)
+            totals["skipped"] += skipped
+            totals["chunks"] += 1
+            self.save_checkpoint(end, totals)
+            if totals["chunks"] % 25:
+                return
+            elapsed = time.perf_counter() - start
+            print(f"📦 {totals['records']} records, {totals['projects']} projects "
+                  f"({totals['records'] / elapsed if elapsed > 0 else 0:.0f} records/s) - byte {end}")
+
+        chunks = itertools.islice(self.chunks(offset, chunk_size), max_chunks)
+        end = offset
+        if workers == 1:
+            for end, lines in chunks:
+                persist(end, *_process_chunk(self.keywords_path, lines), len(lines))
+        else:
+            workers = workers or os.cpu_count()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Bounded and consumed in file order, so checkpoints only ever move forward
+                in_flight = deque()
+                for chunk_end, lines in chunks:
+                    in_flight.append((chunk_end, len(lines), executor.submit(_process_chunk, self.keywords_path, lines)))
+                    while len(in_flight) >= workers * 2 or (in_flight and in_flight[0][2].done()):
+                        end, count, future = in_flight.popleft()
+                        persist(end, *future.result(), count)
+                while in_flight:
+                    end, count, future = in_flight.popleft()
+                    persist(end, *future.result(), count)
+
+        seconds = time.perf_counter() - start
+        stats = dict(totals, offset=end, seconds=seconds,
+                     records_per_second=totals["records"] / seconds if seconds > 0 else float(totals["records"]))
+        print(f"✅ Ingested {totals['projects']} projects from {totals['records']} records in {seconds:.1f}s "
+              f"({totals['skipped']} skipped, {totals['duplicates']} duplicates)")
+        return stats
+
+    def load_checkpoint(self) -> Optional[Dict]:
+        try:
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return checkpoint if checkpoint.get("path") == os.path.abspath(self.path) else None
+
+    def save_checkpoint(self, offset: int, totals: Dict):
+        """Atomically record how far the dump has been written."""
+        temporary = self.checkpoint_path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump({"path": os.path.abspath(self.path), "offset": offset, "totals": totals}, f)
+        os.replace(temporary, self.checkpoint_path)
+
+if __name__ == "__main__":
+    import argparse
+    from src.data.connection import db
+    from src.data.writer import GraphWriter
+    from src.engine.search_index import get_search_index
+
+    parser = argparse.ArgumentParser(description="Bulk-ingest a JSONL (or .jsonl.gz) repository dump")
+    parser.add_argument("path", help="Dump file: GitHub API repo objects, GH Archive events or project dicts, one per line")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Lines per extraction chunk")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Projects written per graph transaction")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the beginning")
+    parser.add_argument("--mock", action="store_true", help="Run in mock mode without Neo4j")
+    args = parser.parse_args()
+
+    if args.mock:
+        db.connect("mock", "", "")
+    DumpCollector(args.path).ingest(GraphWriter(args.batch_size), workers=args.workers, chunk_size=args.chunk_size,
+                                    resume=not args.restart, search_index=get_search_index())
@@ -0,0 +1,257 @@
+import json
+import os
+import threading
+import requests
+from typing import Dict, List, Optional, Tuple
+from src.engine.cache import DEFAULT_CACHE_DIR, ResponseCache
+from src.engine.rate_limit import RateLimitExceeded, TokenPool, tokens_from_env
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Dependency manifests fetched (as blobs, from the default branch) for every enriched repo
+MANIFEST_FILES = ["package.json", "requirements.txt", "pyproject.toml", "go.mod", "Cargo.toml"]
+
+# GraphQL errors that mean the query as a whole was too big or too slow: retry in halves
+SPLIT_ERRORS = {"MAX_NODE_LIMIT_EXCEEDED", "RESOURCE_LIMITS_EXCEEDED", "TIMEOUT"}
+_SPLIT = object()
+
+REPOSITORY_FRAGMENT = """
+fragment Enrichment on Repository {
+  nameWithOwner
+  url
+  pushedAt
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+  languages(first: 10, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+  latestRelease { tagName publishedAt }
+""" + "".join(
+    f"  manifest{i}: object(expression: {json.dumps('HEAD:' + path)}) {{ ... on Blob {{ oid byteSize isTruncated text }} }}\n"
+    for i, path in enumerate(MANIFEST_FILES)
+) + "}"
+
+def owner_and_name(project: Dict) -> Optional[Tuple[str, str]]:
+    """("owner", "repo") from a project's full name or GitHub URL."""
+    for candidate in (project.get("name") or "", (project.get("url") or "").split("github.com/")[-1]):
+        parts = candidate.strip("/").split("/")
+        if len(parts) == 2 and all(parts):
+            return parts[0], parts[1]
+    return None
+
+def build_query(repos: List[Tuple[str, str]]) -> str:
+    """One aliased query (r0, r1, ...) for every (owner, name), plus its rateLimit cost."""
+    fields = "".join(
+        f"  r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ ...Enrichment }}\n"
+        for i, (owner, name) in enumerate(repos)
+    )
+    return "query {\n  rateLimit { cost remaining resetAt }\n" + fields + "}\n" + REPOSITORY_FRAGMENT
+
+def parse_repository(node: Dict) -> Dict:
+    """Enrichment fields from one `...Enrichment` result."""
+    release = node.get("latestRelease")
+    manifests = []
+    for i, path in enumerate(MANIFEST_FILES):
+        blob = node.get(f"manifest{i}")
+        if blob and blob.get("oid"):
+            manifests.append({"path": path, "oid": blob["oid"], "size": blob.get("byteSize"),
+                              "text": None if blob.get("isTruncated") else blob.get("text")})
+    return {
+        "name": node.get("nameWithOwner"),
+        "pushed_at": node.get("pushedAt"),
+        "topics": [n["topic"]["name"] for n in (node.get("repositoryTopics") or {}).get("nodes") or []],
+        "languages": [{"name": e["node"]["name"], "bytes": e["size"]}
+                      for e in (node.get("languages") or {}).get("edges") or []],
+        "latest_release": {"tag": release["tagName"], "published_at": release.get("publishedAt")} if release else None,
+        "manifests": manifests,
+    }
+
+def apply_enrichment(project: Dict, enrichment: Dict) -> Dict:
+    """Merge enrichment into a project dict in place (topics are unioned)."""
+    topics = list(project.get("topics") or [])
+    topics += [topic for topic in enrichment["topics"] if topic not in topics]
+    project.update({
+        "topics": topics,
+        "languages": enrichment["languages"],
+        "latest_release": enrichment["latest_release"],
+        "manifests": enrichment["manifests"],
+    })
+    if not project.get("pushed_at"):
+        project["pushed_at"] = enrichment["pushed_at"]
+    return project
+
+class GraphQLEnricher:
+    """
+    Batch enrichment of repositories (topic list, language breakdown, latest release and
+    dependency manifests) through the GitHub GraphQL API: one aliased query fetches a
+    whole batch, where REST would need several calls per repo.
+
+    Batch size follows the query cost GitHub reports in `rateLimit`: after every
+    response it is rescaled so a request costs about `target_cost` points (between
+    `min_batch` and `max_batch` repos), and never more than the points left. Queries
+    that hit node or time limits are retried in halves.
+    Results are cached per repo and `pushedAt`, so repos that have not been pushed
+    since they were last enriched are never fetched again. Manifest text is not cached:
+    the manifest extractor's blob cache already holds the parsed packages by blob SHA.
+
+    One enricher may serve several threads: each `enrich()` call sizes its own batches,
+    starting from the size the last call settled on.
+    """
+
+    def __init__(self, api_token: str = None, url: str = GRAPHQL_URL, cache: ResponseCache = None,
+                 use_cache: bool = True, token_pool: TokenPool = None, batch_size: int = 50,
+                 min_batch: int = 5, max_batch: int = 100, target_cost: float = 5, max_attempts: int = 3):
+        self.url = url
+        self.session = requests.Session()
+        self.headers = {"User-Agent": "TheWheel-Research-Engine/1.0"}
+        self.token_pool = token_pool or TokenPool([api_token] if api_token else tokens_from_env())
+        self.cache = (cache or ResponseCache(os.path.join(DEFAULT_CACHE_DIR, "enrichment.sqlite"),
+                                             max_entries=1_000_000, max_bytes=float("inf"))) if use_cache else None
+        self.batch_size = batch_size
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.target_cost = target_cost
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "cost": 0, "cached": 0, "fetched": 0, "missing": 0}
+
+    def enrich(self, projects: List[Dict]) -> List[Dict]:
+        """Merge enrichment into every project that can be enriched (in place); returns the projects."""
+        counts = dict.fromkeys(self.stats, 0)  # This call's share of self.stats
+        pending = []
+        for project in projects:
+            repo = owner_and_name(project)
+            if repo is None:
+                continue
+            cached = self._cached(repo, project.get("pushed_at"))
+            if cached is not None:
+                apply_enrichment(project, cached)
+                self._count(counts, "cached")
+            else:
+                pending.append((repo, project))
+
+        batch_size = self.batch_size
+        while pending:
+            batch = pending[:batch_size]
+            result = self._fetch_batch([repo for repo, _ in batch], counts)
+            if result is None:
+                print(f"⚠️ GraphQL enrichment unavailable, {len(pending)} repos left unenriched")
+                break
+            if result is _SPLIT:
+                if len(batch) == 1:
+                    print(f"⚠️ Could not enrich {'/'.join(batch[0][0])}")
+                    pending = pending[1:]
+                else:
+                    batch_size = max(1, len(batch) // 2)
+                continue
+
+            nodes, rate_limit = result
+            for i, (repo, project) in enumerate(batch):
+                node = nodes.get(f"r{i}")
+                if not node:
+                    self._count(counts, "missing")
+                    continue
+                enrichment = parse_repository(node)
+                apply_enrichment(project, enrichment)
+                self._store(repo, enrichment)
+                self._count(counts, "fetched")
+            pending = pending[len(batch):]
+            batch_size = self._resize(batch_size, len(batch), rate_limit)
+            self.batch_size = batch_size
+
+        print(f"🧬 Enriched {counts['fetched']} repos ({counts['cached']} cached) in "
+              f"{counts['requests']} GraphQL requests costing {counts['cost']} points")
+        return projects
+
+    def _count(self, counts: Dict, key: str, amount: int = 1):
+        """Add to one call's counts and to the enricher's running totals."""
+        counts[key] += amount
+        with self._lock:
+            self.stats[key] += amount
+
+    def _resize(self, batch_size: int, batch_len: int, rate_limit: Dict) -> int:
+        """Size the next batch so it costs about target_cost, within the remaining budget."""
+        cost = (rate_limit or {}).get("cost")
+        if not cost:
+            return batch_size
+        per_repo = cost / batch_len
+        size = max(self.min_batch, min(int(self.target_cost / per_repo), self.max_batch))
+        remaining = rate_limit.get("remaining")
+        if remaining is not None:
+            size = min(size, max(1, int(remaining / per_repo)))
+        return size
+
+    def _fetch_batch(self, repos: List[Tuple[str, str]], counts: Dict):
+        """
+        ({alias: repository or None}, rateLimit) for one batch, _SPLIT when the query
+        was too expensive to answer as a whole, or None when the API is unusable.
+        """
+        try:
+            response = self._request({"query": build_query(repos)})
+        except RateLimitExceeded as e:
+            print(f"⚠️ {e}")
+            return None
+        except requests.exceptions.Timeout:
+            return _SPLIT
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ Network error accessing GitHub GraphQL: {e}")
+            return None
+
+        self._count(counts, "requests")
+        if response.status_code in (502, 504):
+            return _SPLIT
+        if response.status_code != 200:
+            print(f"⚠️ GitHub GraphQL error {response.status_code}: {response.text}")
+            return None
+
+        body = response.json()
+        errors = body.get("errors") or []
+        if any(error.get("type") in SPLIT_ERRORS for error in errors):
+            return _SPLIT
+        data = body.get("data")
+        if data is None:
+            print(f"⚠️ GitHub GraphQL query failed: {errors}")
+            return None
+        rate_limit = data.pop("rateLimit", None) or {}
+        self._count(counts, "cost", rate_limit.get("cost") or 0)
+        return data, rate_limit
+
+    def _request(self, payload: Dict) -> requests.Response:
+        """POST with the best pooled token, retrying rate-limited responses like GitHubAdapter."""
+        for _ in range(self.max_attempts):
+            token = self.token_pool.acquire("graphql")
+            headers = dict(self.headers)
+            if token:
+                headers["Authorization"] = f"bearer {token}"
+            response = self.session.post(self.url, json=payload, headers=headers, timeout=30)
+            if not self.token_pool.record(token, "graphql", response.status_code, response.headers):
+                return response
+        return response
+
+    def _cached(self, repo: Tuple[str, str], pushed_at: Optional[str]) -> Optional[Dict]:
+        if self.cache is None or not pushed_at:
+            return None
+        entry = self.cache.get(self._cache_key(repo, pushed_at))
+        return entry["value"] if entry else None
+
+    def _store(self, repo: Tuple[str, str], enrichment: Dict):
+        if self.cache is not None and enrichment["pushed_at"]:
+            # Manifest text is the bulk of an entry; the blob cache keeps its parsed packages
+            manifests = [dict(manifest, text=None) for manifest in enrichment["manifests"]]
+            self.cache.put(self._cache_key(repo, enrichment["pushed_at"]), dict(enrichment, manifests=manifests))
+
+    @staticmethod
+    def _cache_key(repo: Tuple[str, str], pushed_at: str) -> str:
+        # Entries never go stale: a new push means a new key
+        return ResponseCache.make_key("graphql-enrichment", repo[0].lower(), repo[1].lower(), pushed_at)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Enrich repositories through the GitHub GraphQL API")
+    parser.add_argument("repos", nargs="+", help="owner/name of each repository")
+    args = parser.parse_args()
+
+    enriched = GraphQLEnricher().enrich([{"name": repo} for repo in args.repos])
+    for project in enriched:
+        languages = ", ".join(language["name"] for language in project.get("languages") or [])
+        release = (project.get("latest_release") or {}).get("tag")
+        manifests = ", ".join(manifest["path"] for manifest in project.get("manifests") or [])
+        print(f"- {project['name']}: {languages or 'no languages'}; release {release}; manifests: {manifests or 'none'}")
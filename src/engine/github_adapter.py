@@ -1,24 +1,148 @@
+import math
+import os
 import requests
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Iterator, Optional, Tuple
+from src.engine.cache import ResponseCache
 from src.engine.collector import BaseCollector
+from src.engine.rate_limit import RateLimitExceeded, TokenPool, tokens_from_env
+from src.engine.search_index import LocalSearchIndex, get_search_index
 from src.data.connection import db
+from src.data.writer import REFRESH_PROJECT_TOPICS
+
+SEARCH_RESULT_CEILING = 1000  # GitHub search never returns more than this per query
+MAX_PER_PAGE = 100
+
+def _sibling_path(path: str, name: str) -> str:
+    """`name` in the same directory as the SQLite file at `path` (in memory if that one is)."""
+    if path == ":memory:":
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(path)), name)
 
 class GitHubAdapter(BaseCollector):
     """Collector for GitHub repositories with live API integration."""
 
-    def __init__(self, api_token: str = None):
+    def __init__(self, api_token: str = None, cache: ResponseCache = None, use_cache: bool = True,
+                 base_url: str = "https://api.github.com/search/repositories", max_workers: int = 4,
+                 api_tokens: List[str] = None, token_pool: TokenPool = None, max_attempts: int = 3,
+                 search_index: LocalSearchIndex = None):
         super().__init__("GitHub")
-        self.base_url = "https://api.github.com/search/repositories"
+        self.base_url = base_url
+        self.max_workers = max_workers
+        # One pooled session shared by every (possibly concurrent) page fetch
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "TheWheel-Research-Engine/1.0"
         }
-        if api_token:
-            self.headers["Authorization"] = f"token {api_token}"
+        # Requests rotate across every configured token (GITHUB_TOKENS / GITHUB_TOKEN by default)
+        self.token_pool = token_pool or TokenPool(api_tokens or ([api_token] if api_token else tokens_from_env()))
+        self.max_attempts = max_attempts
+        self.cache = (cache or ResponseCache()) if use_cache else None
+        # Every repo seen live (or already in the response cache) stays searchable offline;
+        # an injected cache gets its own index beside it instead of the process-wide one
+        if search_index is None and self.cache is not None:
+            search_index = get_search_index() if cache is None else LocalSearchIndex(_sibling_path(cache.path, "search_index.sqlite"))
+        self.search_index = search_index
+        if self.search_index is not None and self.cache is not None:
+            self.search_index.backfill(self.cache.path, self.cache.values(), self.extract_metadata)
 
     def search(self, query: str, filters: Dict = None) -> List[Dict]:
         """Search GitHub for repositories matching the query."""
-        # Build search query
+        limit = int(filters.get('limit', 10)) if filters else 10
+        if limit > MAX_PER_PAGE:
+            return list(self.search_pages(query, filters, max_results=limit))
+
+        data = self._fetch_page(query, filters, page=1, per_page=limit)
+        if data is None:
+            return self._search_offline(query, filters)
+
+        items = data.get("items", [])
+        print(f"✅ Found {len(items)} repositories from GitHub API")
+        return [self.extract_metadata(item) for item in items]
+
+    def search_pages(self, query: str, filters: Dict = None, max_results: int = SEARCH_RESULT_CEILING) -> Iterator[Dict]:
+        """
+        Stream normalized projects for up to `max_results` matches (at most 1000, the search ceiling).
+        Page 1 reveals the total count; the remaining pages are fetched concurrently on
+        `max_workers` threads and yielded in page order (so in stars order) as soon as
+        every earlier page has arrived, so callers can start ingesting before the last
+        page lands.
+        """
+        max_results = min(max_results, SEARCH_RESULT_CEILING)
+        if max_results <= 0:
+            return
+        per_page = min(MAX_PER_PAGE, max_results)
+        first = self._fetch_page(query, filters, page=1, per_page=per_page)
+        if first is None:
+            yield from self._search_offline(query, dict(filters or {}, limit=max_results))
+            return
+
+        total = min(first.get("total_count", 0), max_results)
+        pages = math.ceil(total / per_page)
+        print(f"📚 {first.get('total_count', 0)} matches, fetching {pages} pages")
+
+        emitted = 0
+        for item in first.get("items", [])[:max_results]:
+            yield self.extract_metadata(item)
+            emitted += 1
+
+        if pages <= 1:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [
+                executor.submit(self._fetch_page, query, filters, page, per_page)
+                for page in range(2, pages + 1)
+            ]
+            # Later pages that finish first wait in their futures until their turn
+            for page, future in enumerate(futures, start=2):
+                data = future.result()
+                if data is None:
+                    print(f"⚠️ Search page {page} of {pages} could not be fetched, skipping {per_page} results")
+                    continue
+                for item in data.get("items", []):
+                    if emitted >= max_results:
+                        break
+                    yield self.extract_metadata(item)
+                    emitted += 1
+        finally:
+            # Consumers may stop early; don't keep fetching pages nobody will read
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def search_slices(self, query: str, filters: Dict = None, field: str = "stars",
+                      slices: List[str] = None, max_results_per_slice: int = SEARCH_RESULT_CEILING) -> Iterator[Dict]:
+        """
+        Run one paginated search per range slice of `field` ('stars', 'pushed' or 'created')
+        so a landscape can grow past the 1000-result ceiling of a single query.
+        Use `star_slices` / `date_slices` to build non-overlapping ranges.
+        """
+        seen = set()
+        for slice_range in slices or []:
+            slice_filters = dict(filters or {}, **{field: slice_range})
+            for project in self.search_pages(query, slice_filters, max_results=max_results_per_slice):
+                if project["url"] in seen:
+                    continue
+                seen.add(project["url"])
+                yield project
+
+    def _fetch_page(self, query: str, filters: Dict, page: int, per_page: int) -> Optional[Dict]:
+        params = {
+            "q": self._build_query(query, filters),
+            "sort": "stars",
+            "order": "desc",
+            "per_page": per_page,
+            "page": page
+        }
+        return self._fetch(params, self._cache_key(query, filters, params))
+
+    def _build_query(self, query: str, filters: Dict = None) -> str:
+        """Append GitHub search qualifiers for the supported filters."""
         search_query = query
         
         if filters:
@@ -28,110 +152,166 @@ class GitHubAdapter(BaseCollector):
                 search_query += f" stars:{filters['stars']}"
             if filters.get('pushed'):
                 search_query += f" pushed:{filters['pushed']}"
+            if filters.get('created'):
+                search_query += f" created:{filters['created']}"
             if filters.get('topic'):
                 search_query += f" topic:{filters['topic']}"
-        
-        params = {
-            "q": search_query,
-            "sort": "stars",
-            "order": "desc",
-            "per_page": min(int(filters.get('limit', 10)) if filters else 10, 100)
-        }
+        return search_query
+
+    def _cache_key(self, query: str, filters: Dict, params: Dict) -> str:
+        """Cache key on the normalized query, filters and page."""
+        normalized_query, normalized_filters = normalize_search(query, filters)
+        normalized_filters.pop("limit", None)
+        return ResponseCache.make_key(self.base_url, normalized_query, normalized_filters, params["per_page"], params["page"])
+
+    def _fetch(self, params: Dict, cache_key: str) -> Optional[Dict]:
+        """
+        Fetch one page of search results through the response cache.
+        Fresh entries skip the network, stale ones are revalidated with their ETag,
+        and the last good response is served if the live API fails.
+        Returns None only when neither the API nor the cache can answer.
+        """
+        entry = self.cache.get(cache_key) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            print(f"💾 Cache hit: {params['q']} (page {params['page']})")
+            return entry["value"]
+
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
 
         try:
-            print(f"🔍 Searching GitHub API: {search_query}")
-            response = requests.get(self.base_url, params=params, headers=self.headers, timeout=10)
-            
-            if response.status_code == 403:
-                print("⚠️ GitHub API rate limit exceeded. Using cached/mock data.")
-                return self._get_mock_data(query, filters)
-            elif response.status_code != 200:
+            print(f"🔍 Searching GitHub API: {params['q']}")
+            response = self.request("GET", self.base_url, "search", params=params, headers=headers)
+
+            if response.status_code == 304 and entry:
+                self.cache.touch(cache_key)
+                return entry["value"]
+            if response.status_code == 200:
+                data = response.json()
+                if self.cache:
+                    self.cache.put(cache_key, data, response.headers.get("ETag"))
+                if self.search_index is not None:
+                    self.search_index.add_responses([data], self.extract_metadata)
+                return data
+
+            if response.status_code in (403, 429):
+                print("⚠️ GitHub API rate limit exceeded.")
+            else:
                 print(f"⚠️ GitHub API error {response.status_code}: {response.text}")
-                return self._get_mock_data(query, filters)
-
-            data = response.json()
-            items = data.get("items", [])
-            
-            print(f"✅ Found {len(items)} repositories from GitHub API")
-            return [self.extract_metadata(item) for item in items]
-            
+        except RateLimitExceeded as e:
+            print(f"⚠️ {e}")
         except requests.exceptions.RequestException as e:
             print(f"⚠️ Network error accessing GitHub API: {e}")
-            return self._get_mock_data(query, filters)
         except Exception as e:
             print(f"⚠️ Unexpected error: {e}")
-            return self._get_mock_data(query, filters)
 
-    def _get_mock_data(self, query: str, filters: Dict = None) -> List[Dict]:
-        """Fallback mock data when API is unavailable."""
-        print("🛠️ Using mock data as fallback")
-        
-        mock_projects = [
-            {"name": "facebook/react", "url": "https://github.com/facebook/react", "description": "A declarative, efficient, and flexible JavaScript library for building user interfaces.", "stars": 220000, "author": "facebook", "language": "javascript", "topics": ["javascript", "react", "frontend"]},
-            {"name": "vuejs/vue", "url": "https://github.com/vuejs/vue", "description": "Vue.js is a progressive, incrementally-adoptable JavaScript framework for building UI on the web.", "stars": 207000, "author": "vuejs", "language": "javascript", "topics": ["javascript", "vue", "frontend"]},
-            {"name": "tensorflow/tensorflow", "url": "https://github.com/tensorflow/tensorflow", "description": "An Open Source Machine Learning Framework for Everyone", "stars": 185000, "author": "tensorflow", "language": "python", "topics": ["machine-learning", "tensorflow", "python"]},
-            {"name": "pytorch/pytorch", "url": "https://github.com/pytorch/pytorch", "description": "Tensors and Dynamic neural networks in Python with strong GPU acceleration", "stars": 78000, "author": "pytorch", "language": "python", "topics": ["machine-learning", "pytorch", "python"]},
-            {"name": "django/django", "url": "https://github.com/django/django", "description": "The Web framework for perfectionists with deadlines.", "stars": 76000, "author": "django", "language": "python", "topics": ["web", "django", "python"]},
-            {"name": "expressjs/express", "url": "https://github.com/expressjs/express", "description": "Fast, unopinionated, minimalist web framework for node.", "stars": 64000, "author": "expressjs", "language": "javascript", "topics": ["web", "express", "nodejs"]},
-            {"name": "gin-gonic/gin", "url": "https://github.com/gin-gonic/gin", "description": "Gin is a HTTP web framework written in Go (Golang).", "stars": 75000, "author": "gin-gonic", "language": "go", "topics": ["web", "gin", "golang"]},
-            {"name": "scikit-learn/scikit-learn", "url": "https://github.com/scikit-learn/scikit-learn", "description": "scikit-learn: machine learning in Python", "stars": 58000, "author": "scikit-learn", "language": "python", "topics": ["machine-learning", "python", "scikit-learn"]}
-        ]
-
-        # Filter mock data based on query and filters
-        filtered = []
-        for project in mock_projects:
-            # Check if query matches
-            if (query.lower() in project['name'].lower() or 
-                query.lower() in project['description'].lower() or
-                any(query.lower() in topic for topic in project['topics'])):
-                
-                # Apply filters
-                if filters:
-                    if filters.get('language') and project['language'] != filters['language']:
-                        continue
-                    if filters.get('stars'):
-                        min_stars = int(filters['stars'].replace('>=', '').replace('+', ''))
-                        if project['stars'] < min_stars:
-                            continue
-                
-                filtered.append(self.extract_metadata(project))
-        
+        if entry:
+            print("💾 Serving last good cached response")
+            return entry["value"]
+        return None
+
+    def request(self, method: str, url: str, resource: str = "core", headers: Dict = None, **kwargs) -> requests.Response:
+        """
+        Send a request with the best available pooled token, over the shared session.
+        Rate-limited responses are retried on the next token (or after the pool's
+        scheduled wait) up to `max_attempts` times. Other GitHub clients (e.g. the
+        manifest tree source) go through here to share the token pool.
+        """
+        for _ in range(self.max_attempts):
+            token = self.token_pool.acquire(resource)
+            request_headers = dict(self.headers, **(headers or {}))
+            if token:
+                request_headers["Authorization"] = f"token {token}"
+            response = self.session.request(method, url, headers=request_headers, timeout=10, **kwargs)
+            if not self.token_pool.record(token, resource, response.status_code, response.headers):
+                return response
+        return response
+
+    def _search_offline(self, query: str, filters: Dict = None) -> List[Dict]:
+        """Degraded-mode search: answer from the local index of every repo seen so far."""
+        index = self.search_index or get_search_index()
         limit = int(filters.get('limit', 5)) if filters else 5
-        return filtered[:limit]
+        results = index.search(query, filters, limit=limit)
+        print(f"🗂️ GitHub unavailable, {len(results)} results from the local index ({index.count()} repos)")
+        return results
 
     def extract_metadata(self, raw_data: Dict) -> Dict:
         """Map raw GitHub repository data to project metadata."""
-        return {
-            "name": raw_data.get("full_name") or raw_data.get("name"),
-            "url": raw_data.get("html_url") or raw_data.get("url"),
-            "description": raw_data.get("description", "No description available"),
-            "stars": raw_data.get("stargazers_count") or raw_data.get("stars", 0),
-            "author": raw_data.get("owner", {}).get("login") if raw_data.get("owner") else raw_data.get("author"),
-            "language": (raw_data.get("language") or raw_data.get("language", "")).lower(),
-            "topics": raw_data.get("topics", [])
-        }
+        return extract_repo_metadata(raw_data)
 
     def save_to_graph(self, project_data: Dict):
         """Persist project metadata to Neo4j."""
         query = """
+        // @op save_project
         MERGE (p:Project {url: $url})
         SET p.name = $name, 
             p.stars = $stars, 
             p.description = $description,
-            p.primary_language = $language
+            p.primary_language = $language,
+            p.updated_at = timestamp()
         
         MERGE (a:Author {username: $author})
-        MERGE (a)-[:CREATED]->(p)
+        ON CREATE SET a.name = $author, a.updated_at = timestamp()
+        MERGE (a)-[r:CREATED]->(p)
+        ON CREATE SET r.updated_at = timestamp()
         
         WITH p
         UNWIND $topics as topic
         MERGE (t:Topic {name: topic})
-        MERGE (p)-[:TAGGED_WITH]->(t)
-        """
+        ON CREATE SET t.updated_at = timestamp()
+        MERGE (p)-[tagged:TAGGED_WITH]->(t)
+        ON CREATE SET tagged.updated_at = timestamp(), tagged.pending = true
+        """ + REFRESH_PROJECT_TOPICS
         
         with db.get_session() as session:
             session.run(query, **project_data)
 
+def extract_repo_metadata(raw_data: Dict) -> Dict:
+    """
+    Raw GitHub repository data (API objects, or already-normalized project dicts) to
+    project metadata. Module-level so process-pool workers can use it too.
+    """
+    return {
+        "name": raw_data.get("full_name") or raw_data.get("name"),
+        "url": raw_data.get("html_url") or raw_data.get("url"),
+        "description": raw_data.get("description", "No description available"),
+        "stars": raw_data.get("stargazers_count") or raw_data.get("stars", 0),
+        "author": raw_data.get("owner", {}).get("login") if raw_data.get("owner") else raw_data.get("author"),
+        "language": (raw_data.get("language") or "").lower(),
+        "topics": raw_data.get("topics", []),
+        "pushed_at": raw_data.get("pushed_at"),
+        "created_at": raw_data.get("created_at")
+    }
+
+def normalize_search(query: str, filters: Dict = None) -> Tuple[str, Dict]:
+    """Case- and whitespace-insensitive form of a search, with empty filters dropped."""
+    normalized_query = " ".join(query.lower().split())
+    normalized_filters = {
+        k: str(v).strip().lower() for k, v in sorted((filters or {}).items())
+        if v not in (None, "")
+    }
+    return normalized_query, normalized_filters
+
+def star_slices(boundaries: List[int]) -> List[str]:
+    """
+    Non-overlapping `stars:` ranges from ascending boundaries.
+    star_slices([0, 100, 1000]) -> ["0..99", "100..999", ">=1000"]
+    """
+    slices = [f"{low}..{high - 1}" for low, high in zip(boundaries, boundaries[1:])]
+    slices.append(f">={boundaries[-1]}")
+    return slices
+
+def date_slices(start: date, end: date, days: int) -> List[str]:
+    """Non-overlapping `pushed:`/`created:` ranges of `days` days covering start..end."""
+    slices = []
+    current = start
+    while current <= end:
+        stop = min(current + timedelta(days=days - 1), end)
+        slices.append(f"{current.isoformat()}..{stop.isoformat()}")
+        current = stop + timedelta(days=1)
+    return slices
+
 if __name__ == "__main__":
     # Quick test
     adapter = GitHubAdapter()
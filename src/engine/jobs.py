@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from src.data.connection import db
+from src.engine.cache import DEFAULT_CACHE_DIR, ResponseCache
+from src.engine.github_adapter import normalize_search
+
+# queued -> running -> done | failed | cancelled
+ACTIVE_STATES = ("queued", "running")
+
+class JobCancelled(Exception):
+    """Raised from the progress callback to stop a job between pipeline stages."""
+
+class JobStore:
+    """SQLite-backed research job records, so queued and finished jobs survive a restart."""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                stages TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_key_status ON jobs (key, status)")
+        self._conn.commit()
+
+    def create(self, job_id: str, key: str, params: Dict) -> Dict:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, key, params, status, stages, created_at, updated_at) VALUES (?, ?, ?, 'queued', '{}', ?, ?)",
+                (job_id, key, json.dumps(params), now, now),
+            )
+            self._conn.commit()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def find_active(self, key: str) -> Optional[Dict]:
+        """The queued or running job for this key, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE key = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1", (key, *ACTIVE_STATES)
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def active(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at", ACTIVE_STATES
+            ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def update(self, job_id: str, **fields):
+        """Set columns on a job; dict values (stages, result) are stored as JSON."""
+        fields = {k: json.dumps(v) if isinstance(v, (dict, list)) else v for k, v in fields.items()}
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    @staticmethod
+    def _to_job(row) -> Dict:
+        job_id, key, params, status, stages, result, error, cancel_requested, created_at, updated_at = row
+        job = {"id": job_id, "key": key, "status": status, "stages": json.loads(stages),
+               "result": json.loads(result) if result else None, "error": error,
+               "cancel_requested": bool(cancel_requested), "created_at": created_at, "updated_at": updated_at}
+        job.update(json.loads(params))
+        return job
+
+class ResearchJobs:
+    """
+    Background research runs on a bounded worker pool.
+    submit() returns at once; a submission matching a queued or running job (same
+    normalized query, filters and limit) joins that job instead of starting another.
+    Each stage's progress and partial results are written to the JobStore as they
+    happen, and jobs still queued or running at shutdown are re-run on start-up.
+    In mock mode every job writes to its own scoped graph (db.scope()), dropped once
+    its result is stored, and skips the UI export like MCP runs do.
+    """
+
+    def __init__(self, store: JobStore = None, max_workers: int = 2, runner: Callable = None):
+        if runner is None:
+            from src.main import run_research
+            runner = run_research
+        self.store = store or JobStore()
+        self.runner = runner
+        self._submit_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="research-job")
+        self._resume()
+
+    def submit(self, query: str, limit: int = 5, filters: Dict = None) -> Tuple[Dict, bool]:
+        """(job, created). created is False when the request was merged into an active job."""
+        key = ResponseCache.make_key(normalize_search(query, filters), limit)
+        with self._submit_lock:
+            existing = self.store.find_active(key)
+            if existing:
+                return existing, False
+            job = self.store.create(uuid.uuid4().hex[:12], key, {"query": query, "limit": limit, "filters": filters or {}})
+        self._pool.submit(self._run, job["id"])
+        print(f"🧵 Queued research job {job['id']} for '{query}'")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        return self.store.recent(limit)
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued job immediately, or ask a running one to stop after its current stage."""
+        with self._submit_lock:
+            job = self.store.get(job_id)
+            if job is None or job["status"] not in ACTIVE_STATES:
+                return job
+            if job["status"] == "queued":
+                self.store.update(job_id, status="cancelled", cancel_requested=1)
+            else:
+                self.store.update(job_id, cancel_requested=1)
+        return self.store.get(job_id)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+    def _resume(self):
+        for job in self.store.active():
+            self.store.update(job["id"], status="queued", stages={})
+            self._pool.submit(self._run, job["id"])
+            print(f"🔁 Resuming research job {job['id']} for '{job['query']}'")
+
+    def _run(self, job_id: str):
+        with self._submit_lock:
+            job = self.store.get(job_id)
+            if job is None or job["status"] != "queued":
+                return
+            self.store.update(job_id, status="running")
+        stages = {}
+
+        def progress(stage: str, info: Dict):
+            if self.store.cancel_requested(job_id):
+                raise JobCancelled(job_id)
+            stages[stage] = info
+            self.store.update(job_id, stages=stages)
+
+        try:
+            with db.scope():
+                options = {"export": False} if db.mock_mode else {}
+                landscape = self.runner(job["query"], job["limit"], job["filters"] or None, progress=progress, **options)
+            self.store.update(job_id, status="done", result=landscape.summary())
+        except JobCancelled:
+            self.store.update(job_id, status="cancelled")
+            print(f"🛑 Research job {job_id} cancelled")
+        except Exception as e:
+            self.store.update(job_id, status="failed", error=str(e))
+            print(f"❌ Research job {job_id} failed: {e}")
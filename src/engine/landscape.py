@@ -0,0 +1,192 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+class LandscapeGraph:
+    """
+    Project/component graph shared by the API, the research pipeline and the MCP server.
+    Nodes are indexed by (type, key) - projects by url, everything else by name - and get
+    stable integer ids in insertion order. Typed links are stored once, so assembling a
+    search result is O(projects + components).
+    """
+
+    def __init__(self):
+        self.nodes: List[Dict] = []
+        self.links: List[Dict] = []
+        self._index: Dict[Tuple[str, str], int] = {}
+        self._positions: Dict[int, int] = {}
+        self._edges = set()
+
+    def add_node(self, node_type: str, key: str, **props) -> Tuple[int, bool]:
+        """(node id, created). Properties of an existing node are left untouched."""
+        node_id = self._index.get((node_type, key))
+        if node_id is not None:
+            return node_id, False
+        node_id = len(self.nodes) + 1
+        node = {"id": node_id, "name": props.pop("name", key), "type": node_type}
+        node.update(props)
+        self._index[(node_type, key)] = node_id
+        self._positions[node_id] = len(self.nodes)
+        self.nodes.append(node)
+        return node_id, True
+
+    def add_link(self, source: int, target: int, link_type: str) -> bool:
+        """Add source-[link_type]->target unless it already exists."""
+        edge = (source, target, link_type)
+        if edge in self._edges:
+            return False
+        self._edges.add(edge)
+        self.links.append({"source": source, "target": target, "type": link_type})
+        return True
+
+    def add_project(self, project: Dict, components: Optional[List[Dict]] = None) -> Dict:
+        """
+        Add a project and the components it uses (defaults to project["components"]).
+        Returns only the nodes and links this call created, for incremental consumers.
+        """
+        first_node, first_link = len(self.nodes), len(self.links)
+        project_id, _ = self.add_node(
+            "Project", project.get("url") or project["name"],
+            name=project["name"],
+            url=project.get("url"),
+            description=project.get("description"),
+            stars=project.get("stars"),
+            language=project.get("language"),
+        )
+        for component in components if components is not None else project.get("components") or []:
+            component_id, _ = self.add_node("Component", component["name"], category=component.get("type"))
+            self.add_link(project_id, component_id, "USES")
+        return {"nodes": self.nodes[first_node:], "links": self.links[first_link:]}
+
+    def increments(self) -> Iterator[Dict]:
+        """
+        Replay the graph as add_project would have returned it: each project with the
+        nodes it first reached and its links, then anything no project links to.
+        """
+        outgoing: Dict[int, List[Dict]] = {}
+        for link in self.links:
+            outgoing.setdefault(link["source"], []).append(link)
+        seen = set()
+        replayed_links = 0
+        for project in self.by_type("Project"):
+            nodes = [project] if project["id"] not in seen else []
+            seen.add(project["id"])
+            links = outgoing.get(project["id"], [])
+            for link in links:
+                if link["target"] not in seen:
+                    seen.add(link["target"])
+                    nodes.append(self.nodes[self._positions[link["target"]]])
+            replayed_links += len(links)
+            yield {"nodes": nodes, "links": links}
+        rest_nodes = [n for n in self.nodes if n["id"] not in seen]
+        if rest_nodes or replayed_links < len(self.links):
+            projects = {n["id"] for n in self.by_type("Project")}
+            yield {"nodes": rest_nodes, "links": [l for l in self.links if l["source"] not in projects]}
+
+    def node(self, node_type: str, key: str) -> Optional[Dict]:
+        node_id = self._index.get((node_type, key))
+        return None if node_id is None else self.nodes[self._positions[node_id]]
+
+    def by_type(self, node_type: str) -> List[Dict]:
+        return [n for n in self.nodes if n["type"] == node_type]
+
+    @classmethod
+    def from_records(cls, nodes: Iterable[Dict], links: Iterable[Dict]) -> "LandscapeGraph":
+        """
+        Rebuild from exporter-shaped records ({id, name, type, url} / {source, target, type}),
+        e.g. MemorySession.storage. Ids are renumbered; dangling links are dropped.
+        """
+        graph = cls()
+        ids = {}
+        for record in nodes:
+            key = (record.get("url") if record["type"] == "Project" else None) or record["name"]
+            props = {k: v for k, v in record.items() if k not in ("id", "type", "updated_at")}
+            ids[record["id"]], _ = graph.add_node(record["type"], key, **props)
+        for record in links:
+            if record["source"] in ids and record["target"] in ids:
+                graph.add_link(ids[record["source"]], ids[record["target"]], record["type"])
+        return graph
+
+    def to_d3(self, query: Optional[str] = None) -> Dict:
+        """Payload for the D3 front end (/api/search)."""
+        return {
+            "nodes": self.nodes,
+            "links": self.links,
+            "query": query,
+            "total_projects": len(self.by_type("Project")),
+        }
+
+    def approx_bytes(self) -> int:
+        """Size of the graph as compact JSON, the unit LandscapeCache budgets in."""
+        return len(json.dumps([self.nodes, self.links], separators=(",", ":"), default=str))
+
+    def summary(self, top: int = 5) -> Dict:
+        """Counts plus the most starred projects and the most used components."""
+        projects = self.by_type("Project")
+        usage: Dict[int, int] = {}
+        for link in self.links:
+            if link["type"] == "USES":
+                usage[link["target"]] = usage.get(link["target"], 0) + 1
+        components = sorted(self.by_type("Component"), key=lambda n: usage.get(n["id"], 0), reverse=True)
+        return {
+            "projects": len(projects),
+            "nodes": len(self.nodes),
+            "links": len(self.links),
+            "top_projects": sorted(projects, key=lambda n: n.get("stars") or 0, reverse=True)[:top],
+            "top_components": [
+                {"name": n["name"], "category": n.get("category"), "projects": usage.get(n["id"], 0)}
+                for n in components[:top]
+            ],
+        }
+
+class LandscapeCache:
+    """
+    Bounded store of finished landscapes keyed by (normalized) query, so a repeated
+    query is answered without re-running the pipeline. Entries expire after `ttl`
+    seconds, and least recently used ones are evicted beyond `max_entries` or
+    `max_bytes`, which keeps long-lived servers at flat memory.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, int, LandscapeGraph]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[LandscapeGraph]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry[2]
+            if entry:
+                self._drop(key)
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, key: str, graph: LandscapeGraph):
+        size = graph.approx_bytes()
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return  # Larger than the whole budget: serve it once, never keep it
+            self._entries[key] = (time.monotonic(), size, graph)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.counters["evictions"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, entries=len(self._entries), bytes=self.bytes)
+
+    def _drop(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
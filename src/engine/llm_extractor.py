@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from src.engine.analyzer import ProjectAnalyzer
+from src.engine.cache import DEFAULT_CACHE_DIR, ResponseCache
+
+# Bump whenever the prompt or the parsing changes so old cache entries stop matching
+PROMPT_VERSION = "batch-v1"
+
+class LLMClient:
+    """Minimal interface for a text completion backend."""
+
+    def complete(self, prompt: str) -> str:
+        raise NotImplementedError("Subclasses must implement complete()")
+
+class AnthropicClient(LLMClient):
+    """Claude backend; reads ANTHROPIC_API_KEY from the environment."""
+
+    def __init__(self, model: str = None, max_tokens: int = 4096):
+        import anthropic
+        self.client = anthropic.Anthropic()
+        self.model = model or os.environ.get("WHEEL_LLM_MODEL", "claude-3-5-sonnet-latest")
+        self.max_tokens = max_tokens
+
+    def complete(self, prompt: str) -> str:
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return "".join(block.text for block in message.content if getattr(block, "type", None) == "text")
+
+class LLMExtractor:
+    """
+    LLM component extraction that batches several projects per prompt and runs
+    up to `max_concurrency` prompts at once. Results are cached on disk by a hash
+    of name, description, topics and prompt version, so an unchanged repo is
+    never sent to the model twice.
+    """
+
+    def __init__(self, client: LLMClient, cache: ResponseCache = None, batch_size: int = 10,
+                 max_concurrency: int = 4, analyzer: ProjectAnalyzer = None):
+        self.client = client
+        # Every entry saves a paid model call: never expire or evict them
+        self.cache = cache or ResponseCache(os.path.join(DEFAULT_CACHE_DIR, "llm_components.sqlite"), ttl=float("inf"),
+                                            max_entries=float("inf"), max_bytes=float("inf"))
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.analyzer = analyzer or ProjectAnalyzer()
+
+    def extract(self, projects: List[Dict]) -> List[List[Dict]]:
+        """Components for every project, in input order. Projects the model fails on get []."""
+        keys = [self.cache_key(project) for project in projects]
+        results: List[Optional[List[Dict]]] = []
+        misses = []
+        for i, key in enumerate(keys):
+            entry = self.cache.get(key)
+            results.append(entry["value"] if entry else None)
+            if entry is None:
+                misses.append(i)
+
+        batches = [misses[i:i + self.batch_size] for i in range(0, len(misses), self.batch_size)]
+        if batches:
+            print(f"🤖 LLM extraction: {len(misses)} uncached projects in {len(batches)} prompts")
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                for batch, parsed in zip(batches, executor.map(self._run_batch, [[projects[i] for i in b] for b in batches])):
+                    for position, index in enumerate(batch):
+                        components = parsed.get(position) if parsed is not None else None
+                        if components is not None:
+                            self.cache.put(keys[index], components)
+                        results[index] = components or []
+        return results
+
+    @staticmethod
+    def cache_key(project: Dict) -> str:
+        raw = json.dumps([
+            project.get("name"), project.get("description"),
+            sorted(project.get("topics") or []), PROMPT_VERSION,
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _run_batch(self, projects: List[Dict]) -> Optional[Dict[int, List[Dict]]]:
+        """{position: components} for one prompt, or None if the call or parsing failed."""
+        try:
+            reply = self.client.complete(self.analyzer.get_ai_batch_extraction_prompt(projects))
+        except Exception as e:
+            print(f"⚠️ LLM request failed: {e}")
+            return None
+
+        data = parse_json_response(reply)
+        if isinstance(data, list) and len(projects) == 1:
+            data = {"0": data}
+        if not isinstance(data, dict):
+            print("⚠️ Could not parse LLM response as JSON")
+            return None
+
+        parsed = {}
+        for key, components in data.items():
+            try:
+                position = int(str(key).strip("[] "))
+            except ValueError:
+                continue
+            if 0 <= position < len(projects) and isinstance(components, list):
+                parsed[position] = [_clean_component(c) for c in components if isinstance(c, dict) and c.get("name")]
+        return parsed
+
+def parse_json_response(text: str):
+    """
+    First JSON object or array of objects in a model reply. Tolerates markdown code
+    fences, surrounding prose (including bracketed labels like "[0]") and trailing
+    commas. Returns None if nothing parses.
+    """
+    text = re.sub(r"```(?:json)?", "", text or "")
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"[\[{]", text):
+        candidate = text[match.start():]
+        for attempt in (candidate, re.sub(r",\s*([\]}])", r"\1", candidate)):
+            try:
+                value, _ = decoder.raw_decode(attempt)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(value, list) and not all(isinstance(v, (dict, list)) for v in value):
+                break
+            return value
+    return None
+
+def _clean_component(component: Dict) -> Dict:
+    cleaned = {"name": str(component["name"]).strip(), "type": str(component.get("type") or "Unknown").strip()}
+    if component.get("description"):
+        cleaned["description"] = str(component["description"]).strip()
+    return cleaned
@@ -0,0 +1,287 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import tomllib
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from src.engine.cache import DEFAULT_CACHE_DIR
+from src.engine.enrichment import MANIFEST_FILES, owner_and_name
+from src.engine.github_adapter import GitHubAdapter
+from src.engine.rate_limit import RateLimitExceeded
+from src.engine.single_flight import SingleFlight
+
+# Leading distribution name of a PEP 508 requirement ("requests[socks]>=2; python_version>'3'")
+REQUIREMENT_NAME = re.compile(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+def package_id(ecosystem: str, name: str) -> str:
+    """Package URL style identity (pkg:pypi/requests), normalized per ecosystem's naming rules."""
+    if ecosystem == "pypi":
+        name = re.sub(r"[-_.]+", "-", name).lower()
+    elif ecosystem == "cargo":
+        name = name.replace("_", "-").lower()
+    elif ecosystem == "npm":
+        name = name.lower()
+    return f"pkg:{ecosystem}/{name}"
+
+def _requirement_names(lines: List[str]) -> List[str]:
+    names = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        # Options (-r, -e, --index-url) and bare URLs or paths name no package
+        if not line or line.startswith(("-", ".", "/")) or "://" in line.split("@", 1)[0]:
+            continue
+        match = REQUIREMENT_NAME.match(line)
+        if match:
+            names.append(match.group(1))
+    return names
+
+def parse_package_json(text: str) -> List[str]:
+    manifest = json.loads(text)
+    names = []
+    for section in ("dependencies", "peerDependencies", "optionalDependencies"):
+        names += [package_id("npm", name) for name in manifest.get(section) or {}]
+    return names
+
+def parse_requirements(text: str) -> List[str]:
+    return [package_id("pypi", name) for name in _requirement_names(text.splitlines())]
+
+def parse_pyproject(text: str) -> List[str]:
+    manifest = tomllib.loads(text)
+    requirements = list((manifest.get("project") or {}).get("dependencies") or [])
+    poetry = ((manifest.get("tool") or {}).get("poetry") or {}).get("dependencies") or {}
+    return ([package_id("pypi", name) for name in _requirement_names(requirements)] +
+            [package_id("pypi", name) for name in poetry if name.lower() != "python"])
+
+def parse_go_mod(text: str) -> List[str]:
+    names, in_block = [], False
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("require ("):
+            in_block = True
+            continue
+        if in_block and line.startswith(")"):
+            in_block = False
+            continue
+        if line.startswith("require "):
+            line = line[len("require "):]
+        elif not in_block:
+            continue
+        # Indirect requirements are dependencies of dependencies
+        if not line or line.startswith("//") or "// indirect" in line:
+            continue
+        names.append(package_id("go", line.split()[0]))
+    return names
+
+def parse_cargo_toml(text: str) -> List[str]:
+    manifest = tomllib.loads(text)
+    tables = [manifest.get("dependencies") or {}, (manifest.get("workspace") or {}).get("dependencies") or {}]
+    names = []
+    for table in tables:
+        for name, spec in table.items():
+            # `alias = { package = "real-name", ... }` renames a dependency
+            real = spec.get("package", name) if isinstance(spec, dict) else name
+            names.append(package_id("cargo", real))
+    return names
+
+PARSERS = {
+    "package.json": parse_package_json,
+    "requirements.txt": parse_requirements,
+    "pyproject.toml": parse_pyproject,
+    "go.mod": parse_go_mod,
+    "Cargo.toml": parse_cargo_toml,
+}
+
+def parse_manifest(path: str, text: str) -> List[str]:
+    """Unique package ids declared by one manifest (empty if it does not parse)."""
+    try:
+        names = PARSERS[os.path.basename(path)](text)
+    except (ValueError, AttributeError, TypeError):
+        return []
+    return list(dict.fromkeys(names))
+
+def git_blob_sha(content: bytes) -> str:
+    """The object id git (and GitHub) gives a file's content."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+class BlobCache:
+    """
+    Parsed manifests keyed by git blob SHA (and manifest kind). A blob's content never
+    changes, so entries never expire, and every fork or version carrying the same file
+    shares one entry.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "manifests.sqlite")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                oid TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                packages TEXT NOT NULL,
+                PRIMARY KEY (oid, kind)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, oid: str, kind: str) -> Optional[List[str]]:
+        with self._lock:
+            row = self._conn.execute("SELECT packages FROM blobs WHERE oid = ? AND kind = ?", (oid, kind)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, oid: str, kind: str, packages: List[str]):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO blobs (oid, kind, packages) VALUES (?, ?, ?)",
+                               (oid, kind, json.dumps(packages)))
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM blobs").fetchone()[0]
+
+class GitHubTreeSource:
+    """
+    Root manifests of a repo's default branch through the REST git data API: one tree
+    listing names every manifest with its blob SHA, and only blobs the cache has not
+    seen are downloaded.
+    """
+
+    def __init__(self, github: GitHubAdapter = None, api_url: str = "https://api.github.com"):
+        self.github = github or GitHubAdapter(use_cache=False)
+        self.api_url = api_url.rstrip("/")
+
+    def list_manifests(self, project: Dict) -> List[Dict]:
+        repo = owner_and_name(project)
+        if repo is None:
+            return []
+        data = self._get(f"/repos/{repo[0]}/{repo[1]}/git/trees/HEAD")
+        entries = (data or {}).get("tree") or []
+        return [{"path": e["path"], "oid": e["sha"]} for e in entries
+                if e.get("type") == "blob" and e.get("path") in PARSERS]
+
+    def read_blob(self, project: Dict, path: str, oid: str) -> Optional[bytes]:
+        repo = owner_and_name(project)
+        data = self._get(f"/repos/{repo[0]}/{repo[1]}/git/blobs/{oid}") if repo else None
+        if not data or data.get("encoding") != "base64":
+            return None
+        return base64.b64decode(data["content"])
+
+    def _get(self, path: str) -> Optional[Dict]:
+        try:
+            response = self.github.request("GET", self.api_url + path, "core")
+        except (requests.RequestException, RateLimitExceeded) as e:
+            print(f"⚠️ Could not fetch {path}: {e}")
+            return None
+        if response.status_code != 200:
+            if response.status_code != 404:
+                print(f"⚠️ GitHub API error {response.status_code} for {path}")
+            return None
+        return response.json()
+
+class LocalTreeSource:
+    """Manifests from checked-out repos under `root` (root/<owner>/<name>/...)."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def list_manifests(self, project: Dict) -> List[Dict]:
+        repo = owner_and_name(project)
+        manifests = []
+        for path in MANIFEST_FILES if repo else []:
+            file_path = os.path.join(self.root, repo[0], repo[1], path)
+            if os.path.isfile(file_path):
+                with open(file_path, "rb") as f:
+                    manifests.append({"path": path, "oid": git_blob_sha(f.read())})
+        return manifests
+
+    def read_blob(self, project: Dict, path: str, oid: str) -> Optional[bytes]:
+        repo = owner_and_name(project)
+        with open(os.path.join(self.root, repo[0], repo[1], path), "rb") as f:
+            return f.read()
+
+class ManifestExtractor:
+    """
+    Components from dependency manifests (package.json, requirements.txt, pyproject.toml,
+    go.mod, Cargo.toml): one `Package` component per declared dependency, named by its
+    package id, so the writer's Component/USES merge dedupes packages across repos.
+
+    Repos are processed on one bounded thread pool per extractor, shared by every
+    `extract()` call (the pipeline calls it from several workers), so at most `workers`
+    requests are in flight; size it to the source's HTTP connection pool. Manifests
+    already fetched by GraphQL enrichment (`project["manifests"]`, with text) are used as
+    they are; otherwise the source lists them. Either way the parsed result is cached by blob SHA, so a file
+    shared by many forks or versions is fetched and parsed once, and concurrent requests
+    for the same blob share one fetch.
+    """
+
+    def __init__(self, source=None, cache: BlobCache = None, workers: int = 4):
+        self.source = source or GitHubTreeSource()
+        self.cache = cache or BlobCache()
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="manifests")
+        # Only pool threads fetch, so a slot is always free and Overloaded cannot be raised
+        self._flight = SingleFlight(ttl=0, max_entries=1, max_concurrency=workers, acquire_timeout=300)
+        self._lock = threading.Lock()
+        self.stats = {"repos": 0, "manifests": 0, "cached": 0, "parsed": 0}
+
+    def extract(self, projects: List[Dict]) -> List[List[Dict]]:
+        """Package components for every project, in input order."""
+        results = list(self._executor.map(self.extract_project, projects))
+        print(f"📦 {self.stats['manifests']} manifests in {self.stats['repos']} repos: "
+              f"{self.stats['parsed']} parsed, {self.stats['cached']} from the blob cache")
+        return results
+
+    def extract_project(self, project: Dict) -> List[Dict]:
+        manifests = project["manifests"] if "manifests" in project else self.source.list_manifests(project)
+        packages = []
+        for manifest in manifests:
+            packages += self._packages(project, manifest)
+        with self._lock:
+            self.stats["repos"] += 1
+            self.stats["manifests"] += len(manifests)
+        return [{"name": package, "type": "Package"} for package in dict.fromkeys(packages)]
+
+    def _packages(self, project: Dict, manifest: Dict) -> List[str]:
+        kind = os.path.basename(manifest["path"])
+        cached = self.cache.get(manifest["oid"], kind)
+        if cached is not None:
+            with self._lock:
+                self.stats["cached"] += 1
+            return cached
+        return self._flight.do((manifest["oid"], kind), lambda: self._parse(project, manifest, kind))
+
+    def _parse(self, project: Dict, manifest: Dict, kind: str) -> List[str]:
+        # Another thread may have finished this blob since the first lookup
+        cached = self.cache.get(manifest["oid"], kind)
+        if cached is not None:
+            return cached
+        text = manifest.get("text")
+        if text is None:
+            content = self.source.read_blob(project, manifest["path"], manifest["oid"])
+            if content is None:
+                return []
+            text = content.decode("utf-8", errors="replace")
+        packages = parse_manifest(kind, text)
+        self.cache.put(manifest["oid"], kind, packages)
+        with self._lock:
+            self.stats["parsed"] += 1
+        return packages
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List the packages repositories depend on, from their manifests")
+    parser.add_argument("repos", nargs="+", help="owner/name of each repository")
+    parser.add_argument("--local", help="Read checkouts under this directory (<dir>/<owner>/<name>) instead of GitHub")
+    args = parser.parse_args()
+
+    extractor = ManifestExtractor(LocalTreeSource(args.local) if args.local else None)
+    for repo, components in zip(args.repos, extractor.extract([{"name": repo} for repo in args.repos])):
+        print(f"- {repo}: {', '.join(c['name'] for c in components) or 'no manifests'}")
@@ -0,0 +1,74 @@
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+DEFAULT_KEYWORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components.json")
+
+class ComponentMatcher:
+    """
+    Keyword -> component matcher compiled once into a single regex.
+    Keywords are folded into a trie-shaped alternation, so one scan over the text
+    finds every keyword regardless of taxonomy size. Matches must sit on word
+    boundaries ("ui" does not match "build", "api" does not match "rapid").
+    """
+
+    def __init__(self, keywords: Dict[str, Dict]):
+        self.keywords = {key.lower(): info for key, info in keywords.items()}
+        # Table order decides output order, so results are deterministic
+        self._rank = {key: i for i, key in enumerate(self.keywords)}
+        pattern = _trie_pattern(sorted(self.keywords))
+        self._regex = re.compile(rf"(?<![a-z0-9])(?:{pattern})(?![a-z0-9])") if self.keywords else None
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_KEYWORDS_PATH) -> "ComponentMatcher":
+        """Load a JSON object mapping keyword -> {"name", "type"}."""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def match(self, project_data: Dict) -> List[Dict]:
+        """Components mentioned in a project's description, topics or name."""
+        if self._regex is None:
+            return []
+        text = " \n ".join([
+            project_data.get("description") or "",
+            " ".join(project_data.get("topics") or []),
+            project_data.get("name") or "",
+        ]).lower()
+
+        found = {m.group(0) for m in self._regex.finditer(text)}
+        components, seen = [], set()
+        for key in sorted(found, key=self._rank.__getitem__):
+            info = self.keywords[key]
+            if info["name"] not in seen:
+                seen.add(info["name"])
+                components.append(dict(info))
+        return components
+
+@lru_cache(maxsize=None)
+def load_matcher(path: str = DEFAULT_KEYWORDS_PATH) -> ComponentMatcher:
+    """Compiled matcher for a keyword file, built once per process."""
+    return ComponentMatcher.from_file(path)
+
+def _trie_pattern(words: List[str]) -> str:
+    """Regex alternation for `words` that shares common prefixes (a -> (?:pi|uth(?:entication)?))."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Longer alternatives are tried first, falling back to the shorter keyword
+            return ("(?:" + body + ")?") if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return build(trie)
@@ -0,0 +1,215 @@
+import contextvars
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+_DONE = object()
+
+class StageStats:
+    """
+    Time accounting for one pipeline stage (summed over its workers):
+    busy doing work, idle waiting for input, blocked on a full downstream queue.
+    """
+
+    def __init__(self, name: str, workers: int = 1):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.idle = 0.0
+        self.blocked = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, items: int = 0, busy: float = 0.0, idle: float = 0.0, blocked: float = 0.0):
+        with self._lock:
+            self.items += items
+            self.busy += busy
+            self.idle += idle
+            self.blocked += blocked
+
+    def to_dict(self) -> Dict:
+        return {"workers": self.workers, "items": self.items, "busy_seconds": round(self.busy, 4),
+                "idle_seconds": round(self.idle, 4), "blocked_seconds": round(self.blocked, 4)}
+
+class ResearchPipeline:
+    """
+    fetch -> extract -> write, connected by bounded queues.
+    GitHub pages stream in from `search_pages`, `extract_workers` threads match
+    components chunk by chunk (after GraphQL enrichment and plus the LLM and manifest
+    extractors, if given; with an enricher each chunk is one enrichment batch), and one writer
+    persists rows in batches of up to `writer.batch_size` - flushing early whenever
+    it would otherwise sit idle. Full queues block the stage upstream, so memory
+    stays bounded and wall time tracks the slowest stage rather than their sum.
+    """
+
+    def __init__(self, github, analyzer, writer, extract_workers: int = 2, chunk_size: int = 25,
+                 queue_size: int = 4, llm_extractor=None, enricher=None,
+                 manifest_extractor=None):
+        self.github = github
+        self.analyzer = analyzer
+        self.writer = writer
+        self.extract_workers = extract_workers
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.llm_extractor = llm_extractor
+        self.enricher = enricher
+        self.manifest_extractor = manifest_extractor
+
+    def run(self, query: str, filters: Dict = None, limit: int = 5,
+            progress: Callable[[str, Dict], None] = None) -> Tuple[List[Dict], Dict]:
+        """
+        (projects with components in search order, stats). Progress is reported per stage
+        ("search", "analyze", "persist") as in run_research; an exception in any stage,
+        including one raised by `progress`, stops the whole pipeline and is re-raised here.
+        """
+        start = time.perf_counter()
+        to_extract = queue.Queue(maxsize=self.queue_size)
+        to_write = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors = []
+        progress_lock = threading.Lock()
+        stats = {
+            "fetch": StageStats("fetch"),
+            "extract": StageStats("extract", self.extract_workers),
+            "write": StageStats("write"),
+        }
+        written: List[Tuple[int, Dict]] = []
+
+        def report(stage: str, info: Dict):
+            if progress:
+                with progress_lock:
+                    progress(stage, info)
+
+        def put(q: queue.Queue, item, stage: StageStats) -> bool:
+            waited = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.05)
+                    stage.add(blocked=time.perf_counter() - waited)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def get(q: queue.Queue, stage: StageStats):
+            waited = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    item = q.get(timeout=0.05)
+                    stage.add(idle=time.perf_counter() - waited)
+                    return item
+                except queue.Empty:
+                    pass
+            return _DONE
+
+        def guarded(fn):
+            def target():
+                try:
+                    fn()
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+            return target
+
+        def fetch():
+            report("search", {"status": "running"})
+            found = 0
+            chunk = []
+            busy = time.perf_counter()
+            for project in self.github.search_pages(query, filters, max_results=limit):
+                if stop.is_set():
+                    return
+                chunk.append((found, project))
+                found += 1
+                if len(chunk) >= self.chunk_size:
+                    stats["fetch"].add(items=len(chunk), busy=time.perf_counter() - busy)
+                    if not put(to_extract, chunk, stats["fetch"]):
+                        return
+                    chunk = []
+                    busy = time.perf_counter()
+            stats["fetch"].add(items=len(chunk), busy=time.perf_counter() - busy)
+            if chunk and not put(to_extract, chunk, stats["fetch"]):
+                return
+            report("search", {"status": "done", "found": found})
+            for _ in range(self.extract_workers):
+                put(to_extract, _DONE, stats["fetch"])
+
+        def extract():
+            while True:
+                chunk = get(to_extract, stats["extract"])
+                if chunk is _DONE:
+                    put(to_write, _DONE, stats["extract"])
+                    return
+                busy = time.perf_counter()
+                projects = [project for _, project in chunk]
+                if self.enricher:
+                    self.enricher.enrich(projects)
+                for project, components in zip(projects, self.analyzer.extract_components_batch(projects, workers=1)):
+                    project["components"] = components
+                for extractor in (self.llm_extractor, self.manifest_extractor):
+                    if not extractor:
+                        continue
+                    for project, extra in zip(projects, extractor.extract(projects)):
+                        known = {c["name"] for c in project["components"]}
+                        project["components"] += [c for c in extra if c["name"] not in known]
+                stats["extract"].add(items=len(chunk), busy=time.perf_counter() - busy)
+                if not put(to_write, chunk, stats["extract"]):
+                    return
+
+        def flush(pending: List[Tuple[int, Dict]]):
+            busy = time.perf_counter()
+            self.writer.write_projects([project for _, project in pending])
+            stats["write"].add(items=len(pending), busy=time.perf_counter() - busy)
+            written.extend(pending)
+            report("persist", {"status": "running", "rows": len(written)})
+
+        def write():
+            report("analyze", {"status": "running"})
+            pending = []
+            remaining = self.extract_workers
+            while remaining:
+                chunk = get(to_write, stats["write"])
+                if stop.is_set():
+                    return
+                if chunk is _DONE:
+                    remaining -= 1
+                else:
+                    pending.extend(chunk)
+                # Full batch, or nothing else ready: write now instead of waiting
+                while len(pending) >= self.writer.batch_size:
+                    flush(pending[:self.writer.batch_size])
+                    pending = pending[self.writer.batch_size:]
+                if pending and (to_write.empty() or not remaining):
+                    flush(pending)
+                    pending = []
+            ordered = [project for _, project in sorted(written, key=lambda item: item[0])]
+            report("analyze", {
+                "status": "done",
+                "projects": [{"name": p["name"], "components": [c["name"] for c in p["components"]]} for p in ordered],
+            })
+
+        # Stage threads see the caller's context (e.g. a scoped mock graph)
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(guarded(fetch),),
+                                    name="pipeline-fetch", daemon=True)]
+        threads += [
+            threading.Thread(target=contextvars.copy_context().run, args=(guarded(extract),),
+                             name=f"pipeline-extract-{i}", daemon=True)
+            for i in range(self.extract_workers)
+        ]
+        for thread in threads:
+            thread.start()
+        guarded(write)()
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+        seconds = time.perf_counter() - start
+        result = {"seconds": seconds, "stages": {name: stage.to_dict() for name, stage in stats.items()}}
+        report("persist", {"status": "done", "rows": len(written), "pipeline": result})
+        print(f"⏱️ Pipeline finished in {seconds:.2f}s: " + ", ".join(
+            f"{name} {stage.busy:.2f}s busy" for name, stage in stats.items()
+        ))
+        return [project for _, project in sorted(written, key=lambda item: item[0])], result
@@ -0,0 +1,132 @@
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+class RateLimitExceeded(Exception):
+    """Raised when every token is exhausted for longer than the pool is allowed to wait."""
+
+def tokens_from_env() -> List[str]:
+    """Tokens from GITHUB_TOKENS (comma separated) or GITHUB_TOKEN."""
+    raw = os.environ.get("GITHUB_TOKENS") or os.environ.get("GITHUB_TOKEN") or ""
+    return [token.strip() for token in raw.split(",") if token.strip()]
+
+class TokenPool:
+    """
+    Rotates GitHub requests across several API tokens.
+    Each token tracks a separate budget per rate-limit resource ("search", "core", "graphql")
+    from the X-RateLimit-* headers. When every token is spent the caller sleeps until the
+    earliest reset instead of failing; secondary rate limits back off with jitter.
+    An empty token list means a single anonymous identity.
+    """
+
+    def __init__(self, tokens: List[Optional[str]] = None, max_wait: float = 300,
+                 base_backoff: float = 1.0, max_backoff: float = 120.0,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep):
+        self.tokens = list(tokens) if tokens else [None]
+        self.max_wait = max_wait
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._budgets: Dict[Optional[str], Dict[str, Dict]] = {token: {} for token in self.tokens}
+        self._backoff_until: Dict[Optional[str], float] = {token: 0.0 for token in self.tokens}
+        self._strikes: Dict[Optional[str], int] = {token: 0 for token in self.tokens}
+
+    def acquire(self, resource: str = "core") -> Optional[str]:
+        """Pick the token with the most remaining `resource` budget, sleeping if none has any."""
+        while True:
+            with self._lock:
+                now = self.clock()
+                token, ready_at = self._best_token(resource, now)
+                if ready_at <= now:
+                    budget = self._budgets[token].get(resource)
+                    if budget is not None and budget["remaining"] is not None and budget["reset"] > now:
+                        # Reserve one request so concurrent callers spread across tokens
+                        budget["remaining"] -= 1
+                    return token
+            wait = ready_at - now
+            if wait > self.max_wait:
+                raise RateLimitExceeded(f"All tokens exhausted for '{resource}' for another {wait:.0f}s")
+            print(f"⏳ Rate limit reached for '{resource}', sleeping {wait:.1f}s")
+            self.sleep(wait)
+
+    def record(self, token: Optional[str], resource: str, status_code: int, headers: Dict) -> bool:
+        """
+        Update budgets from a response. Returns True when the request was rate limited
+        and should be retried (the pool has already scheduled the token's wait).
+        """
+        resource = headers.get("X-RateLimit-Resource", resource)
+        now = self.clock()
+        with self._lock:
+            budget = self._budgets[token].setdefault(resource, {"remaining": None, "limit": None, "reset": 0.0})
+            if "X-RateLimit-Remaining" in headers:
+                budget["remaining"] = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Limit" in headers:
+                budget["limit"] = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Reset" in headers:
+                budget["reset"] = float(headers["X-RateLimit-Reset"])
+
+            if status_code not in (403, 429):
+                self._strikes[token] = 0
+                return False
+
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                self._backoff_until[token] = now + float(retry_after)
+            elif budget["remaining"] == 0 and budget["reset"] > now:
+                # Primary limit: the token simply waits for its reset
+                pass
+            elif status_code == 403 and budget["remaining"] not in (None, 0):
+                # A 403 with budget left and no rate-limit signal is a real error
+                return False
+            else:
+                # Secondary limit without guidance: exponential backoff with jitter
+                self._strikes[token] += 1
+                delay = min(self.max_backoff, self.base_backoff * 2 ** (self._strikes[token] - 1))
+                self._backoff_until[token] = now + delay * random.uniform(0.5, 1.5)
+            return True
+
+    def budget(self) -> Dict:
+        """
+        Snapshot of per-token budgets (tokens named by their position in the pool, never
+        by their text) and total headroom per resource.
+        """
+        now = self.clock()
+        with self._lock:
+            tokens = []
+            headroom: Dict[str, int] = {}
+            for index, token in enumerate(self.tokens):
+                resources = {}
+                for resource, budget in self._budgets[token].items():
+                    resources[resource] = dict(budget, reset_in=max(0.0, budget["reset"] - now))
+                    if budget["remaining"] is not None and budget["reset"] > now:
+                        headroom[resource] = headroom.get(resource, 0) + max(budget["remaining"], 0)
+                tokens.append({
+                    "token": index,
+                    "resources": resources,
+                    "backoff_in": max(0.0, self._backoff_until[token] - now),
+                })
+        return {"tokens": tokens, "headroom": headroom}
+
+    def _best_token(self, resource: str, now: float):
+        """(token, time it becomes usable) for the best candidate."""
+        best, best_key = None, None
+        for token in self.tokens:
+            budget = self._budgets[token].get(resource)
+            ready_at = self._backoff_until[token]
+            if budget is None or budget["reset"] <= now:
+                # Unknown or already reset budget: assume the full limit is available
+                remaining = float("inf")
+            else:
+                remaining = budget["remaining"]
+                if remaining is not None and remaining <= 0:
+                    ready_at = max(ready_at, budget["reset"])
+                remaining = float("inf") if remaining is None else remaining
+            key = (max(ready_at, now), -remaining)
+            if best_key is None or key < best_key:
+                best, best_key = token, key
+        return best, best_key[0]
+
@@ -0,0 +1,252 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.engine.cache import DEFAULT_CACHE_DIR
+
+QUALIFIERS = ("language", "stars", "pushed", "created", "topic")
+_QUALIFIER = re.compile(r"\b(" + "|".join(QUALIFIERS) + r"):(\S+)")
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+STOPWORDS = frozenset("a an and are for in of on or the to with".split())
+RELATIVE_DATES = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+# Seeded into an empty index so a fresh offline install still has something to search
+DEMO_PROJECTS = [
+    {"name": "facebook/react", "url": "https://github.com/facebook/react", "description": "A declarative, efficient, and flexible JavaScript library for building user interfaces.", "stars": 220000, "author": "facebook", "language": "javascript", "topics": ["javascript", "react", "frontend"]},
+    {"name": "vuejs/vue", "url": "https://github.com/vuejs/vue", "description": "Vue.js is a progressive, incrementally-adoptable JavaScript framework for building UI on the web.", "stars": 207000, "author": "vuejs", "language": "javascript", "topics": ["javascript", "vue", "frontend"]},
+    {"name": "tensorflow/tensorflow", "url": "https://github.com/tensorflow/tensorflow", "description": "An Open Source Machine Learning Framework for Everyone", "stars": 185000, "author": "tensorflow", "language": "python", "topics": ["machine-learning", "tensorflow", "python"]},
+    {"name": "pytorch/pytorch", "url": "https://github.com/pytorch/pytorch", "description": "Tensors and Dynamic neural networks in Python with strong GPU acceleration", "stars": 78000, "author": "pytorch", "language": "python", "topics": ["machine-learning", "pytorch", "python"]},
+    {"name": "django/django", "url": "https://github.com/django/django", "description": "The Web framework for perfectionists with deadlines.", "stars": 76000, "author": "django", "language": "python", "topics": ["web", "django", "python"]},
+    {"name": "expressjs/express", "url": "https://github.com/expressjs/express", "description": "Fast, unopinionated, minimalist web framework for node.", "stars": 64000, "author": "expressjs", "language": "javascript", "topics": ["web", "express", "nodejs"]},
+    {"name": "gin-gonic/gin", "url": "https://github.com/gin-gonic/gin", "description": "Gin is a HTTP web framework written in Go (Golang).", "stars": 75000, "author": "gin-gonic", "language": "go", "topics": ["web", "gin", "golang"]},
+    {"name": "scikit-learn/scikit-learn", "url": "https://github.com/scikit-learn/scikit-learn", "description": "scikit-learn: machine learning in Python", "stars": 58000, "author": "scikit-learn", "language": "python", "topics": ["machine-learning", "python", "scikit-learn"]},
+]
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with a light plural fold ("frameworks" -> "framework")."""
+    tokens = []
+    for token in _TOKEN.findall((text or "").lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def parse_query(query: str, filters: Dict = None) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Split a search into free-text tokens and qualifiers. Inline qualifiers
+    ("orm language:go stars:>100") and the adapter's filters dict are both accepted;
+    filters win when both set the same qualifier.
+    """
+    qualifiers = {key: value for key, value in _QUALIFIER.findall(query or "")}
+    qualifiers.update({key: str(value) for key, value in (filters or {}).items() if key in QUALIFIERS and value not in (None, "")})
+    return tokenize(_QUALIFIER.sub(" ", query or "")), qualifiers
+
+def parse_range(expr: str) -> List[Tuple[str, str]]:
+    """
+    GitHub range syntax as (operator, value) conditions:
+    ">=10" -> [(">=", "10")], "10..100" -> [(">=", "10"), ("<=", "100")],
+    "10..*" -> [(">=", "10")], "100+" -> [(">=", "100")], "42" -> [("=", "42")].
+    """
+    expr = expr.strip()
+    if ".." in expr:
+        low, high = expr.split("..", 1)
+        return ([(">=", low)] if low not in ("", "*") else []) + ([("<=", high)] if high not in ("", "*") else [])
+    for operator in (">=", "<=", ">", "<"):
+        if expr.startswith(operator):
+            return [(operator, expr[len(operator):])]
+    if expr.endswith("+"):
+        return [(">=", expr[:-1])]
+    return [("=", expr)]
+
+def date_conditions(expr: str, today: date = None) -> List[Tuple[str, str]]:
+    """
+    `pushed:`/`created:` ranges as half-open conditions on ISO timestamps, so a
+    day bound covers the whole day ("<=2024-01-31" -> ("<", "2024-02-01")).
+    Relative values (">=week", ">=month", ...) count back from today.
+    """
+    today = today or date.today()
+    conditions = []
+    for operator, value in parse_range(expr):
+        day = today - timedelta(days=RELATIVE_DATES[value]) if value in RELATIVE_DATES else date.fromisoformat(value[:10])
+        after = (day + timedelta(days=1)).isoformat()
+        if operator == ">=":
+            conditions.append((">=", day.isoformat()))
+        elif operator == ">":
+            conditions.append((">=", after))
+        elif operator == "<=":
+            conditions.append(("<", after))
+        elif operator == "<":
+            conditions.append(("<", day.isoformat()))
+        else:
+            conditions += [(">=", day.isoformat()), ("<", after)]
+    return conditions
+
+class LocalSearchIndex:
+    """
+    Offline repository search over every repo the system has ingested or cached.
+    An inverted index (token -> repos) over name, description and topic tokens, plus
+    B-tree indexed stars / pushed / created columns, all in SQLite. Free-text terms
+    must all match (like GitHub search); qualifiers become range predicates on the
+    indexed columns, and results come back ordered by stars.
+    """
+
+    def __init__(self, path: str = None, seed_demo: bool = True):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "search_index.sqlite")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS repos (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                name TEXT NOT NULL,
+                description TEXT,
+                author TEXT,
+                language TEXT,
+                topics TEXT NOT NULL,
+                stars INTEGER NOT NULL,
+                pushed_at TEXT,
+                created_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                token TEXT NOT NULL,
+                repo INTEGER NOT NULL,
+                PRIMARY KEY (token, repo)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_repo ON postings (repo);
+            CREATE INDEX IF NOT EXISTS repos_stars ON repos (stars);
+            CREATE INDEX IF NOT EXISTS repos_pushed_at ON repos (pushed_at);
+            CREATE INDEX IF NOT EXISTS repos_created_at ON repos (created_at);
+            CREATE INDEX IF NOT EXISTS repos_language ON repos (language, stars);
+            CREATE TABLE IF NOT EXISTS backfills (source TEXT PRIMARY KEY);
+        """)
+        self._conn.commit()
+        if seed_demo and self.count() == 0:
+            self.add_projects(DEMO_PROJECTS)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM repos").fetchone()[0]
+
+    def add_projects(self, projects: Iterable[Dict]) -> int:
+        """Insert or refresh projects (normalized metadata, keyed by url). Partial stubs never replace a known repo."""
+        count = 0
+        with self._lock:
+            for project in projects:
+                if not project.get("url") or not project.get("name"):
+                    continue
+                topics = [t.lower() for t in project.get("topics") or []]
+                values = (project["name"], project.get("description"), project.get("author"),
+                          (project.get("language") or "").lower() or None, json.dumps(topics),
+                          int(project.get("stars") or 0), project.get("pushed_at"), project.get("created_at"))
+                row = self._conn.execute("SELECT id FROM repos WHERE url = ?", (project["url"],)).fetchone()
+                if row and project.get("partial"):
+                    continue  # A name-only stub knows less than the indexed repo
+                if row:
+                    repo = row[0]
+                    self._conn.execute(
+                        "UPDATE repos SET name = ?, description = ?, author = ?, language = ?, topics = ?, stars = ?, "
+                        "pushed_at = coalesce(?, pushed_at), created_at = coalesce(?, created_at) WHERE id = ?",
+                        (*values, repo))
+                    self._conn.execute("DELETE FROM postings WHERE repo = ?", (repo,))
+                else:
+                    repo = self._conn.execute(
+                        "INSERT INTO repos (name, description, author, language, topics, stars, pushed_at, created_at, url) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (*values, project["url"])).lastrowid
+                tokens = set(tokenize(project["name"].replace("/", " ")) + tokenize(project.get("description")))
+                for topic in topics:
+                    tokens.update(tokenize(topic))
+                    tokens.add(f"topic:{topic}")
+                self._conn.executemany("INSERT OR IGNORE INTO postings (token, repo) VALUES (?, ?)",
+                                       [(token, repo) for token in tokens])
+                count += 1
+            self._conn.commit()
+        return count
+
+    def add_responses(self, responses: Iterable[Dict], extract) -> int:
+        """Index the items of raw search responses, normalized with `extract`."""
+        return self.add_projects(extract(item) for response in responses for item in (response or {}).get("items", []))
+
+    def backfill(self, source: str, responses: Iterable[Dict], extract) -> int:
+        """add_responses once per source (e.g. a response cache file that predates the index)."""
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM backfills WHERE source = ?", (source,)).fetchone():
+                return 0
+        count = self.add_responses(responses, extract)
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO backfills (source) VALUES (?)", (source,))
+            self._conn.commit()
+        return count
+
+    def search(self, query: str, filters: Dict = None, limit: int = None) -> List[Dict]:
+        """Repos matching every free-text term and qualifier, most stars first."""
+        tokens, qualifiers = parse_query(query, filters)
+        if limit is None:
+            limit = int(filters.get("limit", 10)) if filters else 10
+        where, params = [], []
+
+        terms = sorted(set(tokens))
+        if terms:
+            where.append(f"r.id IN (SELECT repo FROM postings WHERE token IN ({','.join('?' * len(terms))}) "
+                         f"GROUP BY repo HAVING count(*) = ?)")
+            params += [*terms, len(terms)]
+        if qualifiers.get("topic"):
+            where.append("r.id IN (SELECT repo FROM postings WHERE token = ?)")
+            params.append(f"topic:{qualifiers['topic'].lower()}")
+        if qualifiers.get("language"):
+            where.append("r.language = ?")
+            params.append(qualifiers["language"].lower())
+        for field, column in (("stars", "stars"), ("pushed", "pushed_at"), ("created", "created_at")):
+            if qualifiers.get(field):
+                for operator, value in self._range_conditions(field, qualifiers[field]):
+                    where.append(f"r.{column} {operator} ?")
+                    params.append(value)
+
+        sql = ("SELECT name, url, description, stars, author, language, topics, pushed_at, created_at FROM repos r"
+               + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY r.stars DESC, r.id LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit)).fetchall()
+        return [
+            {"name": name, "url": url, "description": description, "stars": stars, "author": author,
+             "language": language or "", "topics": json.loads(topics), "pushed_at": pushed_at, "created_at": created_at}
+            for name, url, description, stars, author, language, topics, pushed_at, created_at in rows
+        ]
+
+    @staticmethod
+    def _range_conditions(field: str, expr: str) -> List[Tuple[str, object]]:
+        """SQL conditions for a range qualifier; a malformed one is ignored so the terms still answer."""
+        try:
+            if field == "stars":
+                return [(operator, int(value)) for operator, value in parse_range(expr)]
+            return date_conditions(expr)
+        except ValueError:
+            print(f"⚠️ Ignoring malformed qualifier {field}:{expr}")
+            return []
+
+_default_index = None
+_default_lock = threading.Lock()
+
+def get_search_index() -> LocalSearchIndex:
+    """Process-wide index at WHEEL_SEARCH_INDEX_DB (default .wheel_cache/search_index.sqlite)."""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = LocalSearchIndex(os.getenv("WHEEL_SEARCH_INDEX_DB"))
+        return _default_index
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Search the local repository index (GitHub qualifiers supported)")
+    parser.add_argument("query", help='e.g. "web framework language:python stars:>1000 pushed:>=2024-01-01"')
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    index = get_search_index()
+    print(f"🗂️ {index.count()} repositories indexed")
+    for repo in index.search(args.query, limit=args.limit):
+        print(f"  ⭐ {repo['stars']:>7}  {repo['name']}  {repo['url']}")
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+import numpy as np
+from src.engine.cache import DEFAULT_CACHE_DIR
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to with your you "
+    "built simple fast based using use via easy library framework tool tools".split()
+)
+
+def project_tokens(project: Dict) -> Set[str]:
+    """Description words plus namespaced topic, component and language tokens."""
+    text = f"{project.get('name') or ''} {project.get('description') or ''}".lower().replace("/", " ")
+    tokens = {word for word in _WORD.findall(text) if len(word) > 2 and word not in STOPWORDS}
+    tokens |= {f"topic:{topic.lower()}" for topic in project.get("topics") or []}
+    tokens |= {f"component:{c['name'].lower()}" for c in project.get("components") or []}
+    if project.get("language"):
+        tokens.add(f"language:{project['language'].lower()}")
+    return tokens
+
+class SimilarityIndex:
+    """
+    MinHash LSH over project token sets, persisted in SQLite.
+    Each project gets a `bands * rows` MinHash signature; every band is hashed to a
+    bucket stored in an indexed table. A query only reads the items sharing at least one
+    bucket with it - a handful of index lookups instead of a scan - then ranks those
+    candidates by estimated Jaccard similarity. Adding or re-adding a project touches
+    only its own rows, so the index grows incrementally with each research run.
+    """
+
+    def __init__(self, path: str = None, bands: int = 32, rows: int = 4, seed: int = 1, max_candidates: int = 5000):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "similarity.sqlite")
+        self.bands = bands
+        self.rows = rows
+        self.max_candidates = max_candidates
+        rng = np.random.default_rng(seed)
+        permutations = bands * rows
+        # a < 2^31 keeps a*h + b below 2^64 for 32-bit token hashes
+        self._a = rng.integers(1, 1 << 31, permutations, dtype=np.uint64)
+        self._b = rng.integers(0, (1 << 61) - 1, permutations, dtype=np.uint64)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                name TEXT,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                item INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket);
+            CREATE INDEX IF NOT EXISTS buckets_item ON buckets (item);
+            CREATE INDEX IF NOT EXISTS items_name ON items (name);
+        """)
+        self._conn.commit()
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        """MinHash signature: per permutation, the minimum of (a*h + b) mod 2^61-1 over token hashes."""
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=4).digest(), "little") for t in tokens],
+            dtype=np.uint64,
+        )
+        if len(hashes) == 0:
+            return np.full(self.bands * self.rows, np.iinfo(np.uint64).max, dtype=np.uint64)
+        return ((hashes[:, None] * self._a + self._b) % _MERSENNE).min(axis=0)
+
+    def add_projects(self, projects: Iterable[Dict]) -> int:
+        """Insert or refresh projects (keyed by url). Returns how many were indexed."""
+        count = 0
+        with self._lock:
+            for project in projects:
+                if not project.get("url"):
+                    continue
+                signature = self.signature(project_tokens(project))
+                row = self._conn.execute("SELECT id FROM items WHERE url = ?", (project["url"],)).fetchone()
+                if row:
+                    item = row[0]
+                    self._conn.execute("UPDATE items SET name = ?, signature = ? WHERE id = ?",
+                                       (project.get("name"), signature.tobytes(), item))
+                    self._conn.execute("DELETE FROM buckets WHERE item = ?", (item,))
+                else:
+                    item = self._conn.execute("INSERT INTO items (url, name, signature) VALUES (?, ?, ?)",
+                                              (project["url"], project.get("name"), signature.tobytes())).lastrowid
+                self._conn.executemany("INSERT INTO buckets (band, bucket, item) VALUES (?, ?, ?)",
+                                       [(band, bucket, item) for band, bucket in enumerate(self._band_keys(signature))])
+                count += 1
+            self._conn.commit()
+        return count
+
+    def similar(self, project: str, k: int = 10) -> List[Dict]:
+        """Top-k indexed projects most similar to an indexed project (by url or name)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, signature FROM items WHERE url = ? OR name = ? LIMIT 1", (project, project)
+            ).fetchone()
+        if row is None:
+            return []
+        return self._query(np.frombuffer(row[1], dtype=np.uint64), k, exclude=row[0])
+
+    def similar_to(self, project: Dict, k: int = 10) -> List[Dict]:
+        """Top-k indexed projects most similar to an arbitrary project dict (need not be indexed)."""
+        return self._query(self.signature(project_tokens(project)), k)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            (items,) = self._conn.execute("SELECT count(*) FROM items").fetchone()
+        return {"projects": items, "bands": self.bands, "rows": self.rows}
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        """One signed 64-bit bucket key per band (SQLite integers are signed)."""
+        return [
+            int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little", signed=True)
+            for band in signature.reshape(self.bands, self.rows)
+        ]
+
+    def _query(self, signature: np.ndarray, k: int, exclude: Optional[int] = None) -> List[Dict]:
+        keys = self._band_keys(signature)
+        clause = " OR ".join("(band = ? AND bucket = ?)" for _ in keys)
+        params = [value for band, bucket in enumerate(keys) for value in (band, bucket)]
+        with self._lock:
+            # Items sharing the most bands are the likeliest near neighbours: keep those
+            # when common buckets hold more than max_candidates
+            candidates = self._conn.execute(
+                f"SELECT item FROM buckets WHERE ({clause}) AND item IS NOT ? "
+                f"GROUP BY item ORDER BY count(*) DESC, item LIMIT ?", (*params, exclude, self.max_candidates)
+            ).fetchall()
+            ids = [item for (item,) in candidates]
+            if not ids:
+                return []
+            rows = self._conn.execute(
+                f"SELECT id, url, name, signature FROM items WHERE id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+        signatures = np.frombuffer(b"".join(r[3] for r in rows), dtype=np.uint64).reshape(len(rows), -1)
+        scores = (signatures == signature).mean(axis=1)
+        order = sorted(range(len(rows)), key=lambda i: (-scores[i], rows[i][0]))[:k]
+        return [{"name": rows[i][2], "url": rows[i][1], "similarity": float(scores[i])} for i in order]
+
+_default_index = None
+_default_lock = threading.Lock()
+
+def get_similarity_index() -> SimilarityIndex:
+    """Process-wide index at WHEEL_SIMILARITY_DB (default .wheel_cache/similarity.sqlite)."""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = SimilarityIndex(os.getenv("WHEEL_SIMILARITY_DB"))
+        return _default_index
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Find projects similar to an indexed one")
+    parser.add_argument("project", help="Project name (owner/repo) or URL")
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+    index = get_similarity_index()
+    print(f"🧬 {index.stats()['projects']} projects indexed")
+    for match in index.similar(args.project, args.k):
+        print(f"  {match['similarity']:.2f}  {match['name']}  {match['url']}")
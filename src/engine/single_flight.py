@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Hashable, Iterator
+
+class Overloaded(Exception):
+    """Raised when no execution slot frees up within the acquire timeout."""
+
+class SingleFlight:
+    """
+    Request coalescing with a short-lived result cache.
+    Concurrent calls with the same key share one execution of `fn`; its result is
+    kept for `ttl` seconds (LRU-bounded). At most `max_concurrency` distinct keys
+    execute at once, so slow upstreams cannot tie up every server worker, and callers
+    waiting on another's execution give up after `wait_timeout` seconds.
+    Errors are shared by the waiting callers but never cached.
+    """
+
+    def __init__(self, ttl: float = 30, max_entries: int = 256, max_concurrency: int = 8, acquire_timeout: float = 15,
+                 wait_timeout: float = 60):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.acquire_timeout = acquire_timeout
+        self.wait_timeout = wait_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._results: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.stats = {"hits": 0, "shared": 0, "executions": 0, "rejected": 0}
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold one execution slot for work that cannot be coalesced (e.g. a streamed
+        response); raises Overloaded when none frees up within the acquire timeout.
+        """
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self.stats["rejected"] += 1
+            raise Overloaded("Too many concurrent searches, try again shortly")
+        try:
+            with self._lock:
+                self.stats["executions"] += 1
+            yield
+        finally:
+            self._slots.release()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            cached = self._results.get(key)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                self._results.move_to_end(key)
+                self.stats["hits"] += 1
+                return cached[1]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["shared"] += 1
+
+        if not leader:
+            try:
+                return future.result(timeout=self.wait_timeout)
+            except FutureTimeout:
+                with self._lock:
+                    self.stats["rejected"] += 1
+                raise Overloaded("Search is taking too long, try again shortly")
+
+        try:
+            with self.slot():
+                result = fn()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            self._results[key] = (time.monotonic(), result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        future.set_result(result)
+        return result
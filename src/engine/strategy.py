@@ -1,46 +1,131 @@
+import argparse
 from src.data.connection import db
+from src.data.writer import TOPIC_STATS_REBUILD
+from src.engine.analytics import LandscapeAnalytics
 from typing import List, Dict
 
+TOP_BLUE_OCEANS_QUERY = """
+// @op top_blue_oceans
+MATCH (t:Topic)
+WHERE t.blue_ocean_score IS NOT NULL AND t.project_count >= $min_projects
+RETURN t.name AS topic,
+       t.project_count AS project_count,
+       t.component_count AS component_count,
+       t.blue_ocean_score AS blue_ocean_score
+ORDER BY t.blue_ocean_score DESC
+LIMIT $k
+"""
+
+# Full recompute, batched so it also runs on very large graphs
+REBUILD_TOPIC_STATS_QUERY = """
+// @op rebuild_topic_stats
+MATCH (t:Topic)
+CALL {
+    WITH t
+""" + TOPIC_STATS_REBUILD + """
+} IN TRANSACTIONS OF 1000 ROWS
+"""
+
+TOPIC_COUNT_QUERY = """
+// @op count_topics
+MATCH (t:Topic)
+RETURN count(t) AS topics
+"""
+
 class StrategyAdvisor:
-    """Strategy Advisor to identify 'Blue Oceans' and re-use opportunities."""
+    """
+    Strategy Advisor to identify 'Blue Oceans' and re-use opportunities.
+    The landscape analytics behind pivot proposals are loaded once per advisor (one
+    strategy run); call invalidate() after writing to the graph to pick up changes.
+    """
+
+    def __init__(self):
+        self._analytics = None
+
+    def analytics(self) -> LandscapeAnalytics:
+        """The project x topic / component incidence, loaded from the graph on first use."""
+        if self._analytics is None:
+            self._analytics = LandscapeAnalytics.load()
+        return self._analytics
 
-    def identify_blue_oceans(self) -> List[Dict]:
+    def invalidate(self):
+        """Forget the loaded analytics, so the next use reloads them from the graph."""
+        self._analytics = None
+
+    def identify_blue_oceans(self, k: int = 5, min_projects: int = 2) -> List[Dict]:
         """
         Identify areas with many projects but few shared components/standardization.
         (A simple heuristic for 'The Wheel' prototype).
+        Reads the per-topic stats that ingestion keeps on Topic nodes, so the top k
+        come straight off the blue_ocean_score index whatever the graph size.
         """
-        query = """
-        MATCH (p:Project)-[:TAGGED_WITH]->(t:Topic)
-        WITH t, count(p) as project_count
-        WHERE project_count > 1
-        OPTIONAL MATCH (p:Project)-[:TAGGED_WITH]->(t)
-        OPTIONAL MATCH (p)-[:USES]->(c:Component)
-        WITH t, project_count, count(distinct c) as component_count
-        RETURN t.name as topic, 
-               project_count, 
-               component_count, 
-               (project_count * 1.0 / (component_count + 1)) as blue_ocean_score
-        ORDER BY blue_ocean_score DESC
-        LIMIT 5
-        """
-        
         print("🔍 Searching for Blue Oceans in the Knowledge Graph...")
         
         with db.get_session() as session:
-            results = session.run(query)
+            results = session.run(TOP_BLUE_OCEANS_QUERY, k=k, min_projects=min_projects)
             return [dict(r) for r in results]
 
-    def propose_pivots(self, project_name: str) -> str:
-        """Propose a pivot strategy based on project similarity."""
-        # This would ideally use an LLM with graph context.
-        # For the prototype, we return a template.
-        return f"Pivot Strategy for {project_name}: Identify components used by competitors and integrate them to achieve feature parity, then focus on a Blue Ocean topic identified by the advisor."
+    def refresh_topic_stats(self) -> int:
+        """
+        Rebuild every topic's stats and component refcounts from scratch. Ingestion keeps
+        them current incrementally; run this after manual edits or deletes, and once on
+        graphs written before the refcounts existed.
+        """
+        with db.get_session() as session:
+            session.run(REBUILD_TOPIC_STATS_QUERY).consume()
+            record = session.run(TOPIC_COUNT_QUERY).single()
+        count = record["topics"] if record else 0
+        print(f"📐 Rebuilt blue ocean stats for {count} topics.")
+        return count
+
+    def propose_pivots(self, project_name: str, analytics: LandscapeAnalytics = None) -> str:
+        """
+        Propose a pivot strategy based on project similarity: components the closest
+        competitors (by shared components) use and this project lacks, plus the
+        neighbouring topics with the largest market gap.
+        """
+        analytics = analytics or self.analytics()
+        if analytics.project_index(project_name) is None:
+            return f"Pivot Strategy for {project_name}: not in the landscape yet - research its space first."
+
+        own_topics = set(analytics.project_topics_of(project_name))
+        adjacent = {}
+        for topic in own_topics:
+            for related in analytics.related_topics(topic, k=20):
+                if related["topic"] not in own_topics and related["project_count"] >= 2:
+                    adjacent[related["topic"]] = related
+        gaps = sorted(adjacent.values(), key=lambda t: -t["gap"])[:3] or [
+            t for t in analytics.market_gaps(k=len(own_topics) + 3) if t["topic"] not in own_topics
+        ][:3]
+
+        lines = [f"Pivot Strategy for {project_name}:"]
+        similar = analytics.similar_projects(project_name, k=3)
+        if similar:
+            lines.append("- Closest competitors: " + ", ".join(
+                f"{s['name']} ({s['similarity']:.0%} component overlap)" for s in similar))
+        missing = analytics.missing_components(project_name, k=3)
+        if missing:
+            lines.append("- Reach feature parity with: " + ", ".join(m["name"] for m in missing))
+        if gaps:
+            lines.append("- Blue Ocean directions: " + ", ".join(
+                f"{g['topic']} ({g['project_count']} projects, {g['adoption']:.0%} shared-stack adoption)" for g in gaps))
+        if len(lines) == 1:
+            lines.append("- No overlapping projects or adjacent topics yet; widen the research first.")
+        return "\n".join(lines)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="The Wheel - Blue Ocean analysis")
+    parser.add_argument("-k", type=int, default=5, help="Number of topics to return")
+    parser.add_argument("--min-projects", type=int, default=2, help="Ignore topics with fewer projects")
+    parser.add_argument("--refresh", action="store_true", help="Rebuild the per-topic stats first")
+    args = parser.parse_args()
+
     advisor = StrategyAdvisor()
     # Mock run
     try:
-        oceans = advisor.identify_blue_oceans()
+        if args.refresh:
+            advisor.refresh_topic_stats()
+        oceans = advisor.identify_blue_oceans(args.k, args.min_projects)
         print(f"Top Blue Ocean Opportunities: {oceans}")
     except Exception as e:
         print(f"❌ Strategy analysis failed: {e}")
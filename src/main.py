@@ -1,7 +1,7 @@
 import argparse
 import sys
 import os
-from typing import Dict
+from typing import Callable, Dict
 
 # Add the project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -9,11 +9,33 @@ sys.path.insert(0, project_root)
 
 from src.engine.github_adapter import GitHubAdapter
 from src.engine.analyzer import ProjectAnalyzer
+from src.engine.enrichment import GraphQLEnricher
+from src.engine.landscape import LandscapeGraph
+from src.engine.llm_extractor import AnthropicClient, LLMExtractor
+from src.engine.manifests import GitHubTreeSource, ManifestExtractor
+from src.engine.pipeline import ResearchPipeline
+from src.engine.similarity import get_similarity_index
 from src.engine.strategy import StrategyAdvisor
-from src.data.exporter import export_landscape_to_json
+from src.data.exporter import export_landscape_delta, export_landscape_lod
+from src.data.writer import REFRESH_PROJECT_TOPICS, GraphWriter
 from src.data.connection import db
 
-def run_research(query: str, limit: int = 5, filters: Dict = None):
+# Pipeline stages, in order, as reported to a run_research progress callback
+STAGES = ["search", "analyze", "persist", "strategy", "export"]
+
+def run_research(query: str, limit: int = 5, filters: Dict = None, batch_size: int = 500, use_ai: bool = False,
+                 progress: Callable[[str, Dict], None] = None, export: bool = True, enrich: bool = False,
+                 manifests: bool = False):
+    """
+    Search, analyze, persist, run strategy and export for one query.
+    `progress(stage, info)` is called as each stage starts, advances and finishes (one
+    call at a time, possibly from pipeline threads); raising from it aborts the run,
+    which is how research jobs are cancelled. export=False skips writing the UI files,
+    e.g. for runs inside a scoped mock graph (db.scope()) that the UI never loads.
+    enrich=True adds languages, latest release and manifests through batched GraphQL;
+    manifests=True adds the packages those manifests declare as components.
+    """
+    report = progress or (lambda stage, info: None)
     print(f"🚀 Starting research for: '{query}'")
     if filters:
         print(f"🔧 Applying filters: {filters}")
@@ -22,46 +44,61 @@ def run_research(query: str, limit: int = 5, filters: Dict = None):
     github = GitHubAdapter()
     analyzer = ProjectAnalyzer()
     advisor = StrategyAdvisor()
+    # Optionally deepen extraction with the (cached, batched) LLM backend
+    llm_extractor = LLMExtractor(AnthropicClient()) if use_ai else None
+    # Shares the search token pool; GraphQL budgets are tracked separately per token
+    enricher = GraphQLEnricher(token_pool=github.token_pool) if enrich else None
+    # Reuses manifests the enricher already fetched, otherwise lists them per repo
+    manifest_extractor = ManifestExtractor(GitHubTreeSource(github), workers=github.max_workers) if manifests else None
     
-    # 2. Search GitHub with filters
-    print(f"🔍 Searching GitHub...")
-    projects = github.search(query, filters)
-    
-    # 3. Process and Persist
-    count = 0
-    for project in projects[:limit]:
-        print(f"📦 Analyzing {project['name']}...")
-        
-        # Extract components
-        components = analyzer.extract_components(project)
-        project['components'] = components
-        
-        # Save to Graph
-        github.save_to_graph(project)
-        link_components_to_project(project)
-        
-        count += 1
+    # 2-3. Search, analyze and persist as overlapping stages (pages stream into
+    # extractor workers, whose output feeds the batching graph writer)
+    print(f"🔍 Searching GitHub and analyzing up to {limit} projects...")
+    pipeline = ResearchPipeline(github, analyzer, GraphWriter(batch_size), llm_extractor=llm_extractor,
+                                enricher=enricher, manifest_extractor=manifest_extractor,
+                                chunk_size=enricher.batch_size if enricher else 25)
+    analyzed, _ = pipeline.run(query, filters, limit, progress=report)
+    count = len(analyzed)
+    # Keep the similarity index current (only these projects' rows are touched)
+    get_similarity_index().add_projects(analyzed)
     
     # 4. Strategy & Export
     print("\n--- Strategy Analysis ---")
+    report("strategy", {"status": "running"})
     oceans = advisor.identify_blue_oceans()
+    report("strategy", {"status": "done", "blue_oceans": oceans})
     for ocean in oceans:
         print(f"🌊 Blue Ocean found in '{ocean['topic']}': Score {ocean['blue_ocean_score']:.2f}")
     
-    export_landscape_to_json()
+    # Only what changed since the last export (full export the first time)
+    if export:
+        report("export", {"status": "running"})
+        export_stats = export_landscape_delta()
+        report("export", {"status": "done", "nodes": export_stats["nodes"], "links": export_stats["links"]})
+    else:
+        report("export", {"status": "done", "skipped": True})
     
     print(f"\n✅ Research complete. Added {count} projects.")
     print("👉 Open 'standalone_demo.html' to visualize and search the landscape.")
+    
+    # The researched slice of the landscape, for callers that report on it
+    landscape = LandscapeGraph()
+    for project in analyzed:
+        landscape.add_project(project)
+    return landscape
 
 def link_components_to_project(project: Dict):
     """Helper to link extracted components to their project node."""
     query = """
+    // @op link_components
     MATCH (p:Project {url: $url})
     UNWIND $components as component
     MERGE (c:Component {name: component.name})
+    SET c.updated_at = CASE WHEN c.type IS NULL OR c.type <> component.type THEN timestamp() ELSE c.updated_at END
     SET c.type = component.type
-    MERGE (p)-[:USES]->(c)
-    """
+    MERGE (p)-[r:USES]->(c)
+    ON CREATE SET r.updated_at = timestamp(), r.pending = true
+    """ + REFRESH_PROJECT_TOPICS
     with db.get_session() as session:
         session.run(query, url=project['url'], components=project['components'])
 
@@ -70,6 +107,11 @@ if __name__ == "__main__":
     parser.add_argument("query", help="What software/product idea are you researching?")
     parser.add_argument("--limit", type=int, default=5, help="Limit number of projects analyzed")
     parser.add_argument("--mock", action="store_true", help="Run in mock mode without Neo4j")
+    parser.add_argument("--ai", action="store_true", help="Also extract components with Claude (needs ANTHROPIC_API_KEY)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Projects written per graph transaction")
+    parser.add_argument("--enrich", action="store_true", help="Enrich projects through batched GitHub GraphQL (needs GITHUB_TOKEN)")
+    parser.add_argument("--manifests", action="store_true", help="Add the packages each repo's dependency manifests declare as components")
+    parser.add_argument("--lod", action="store_true", help="Also write the level-of-detail export for large landscapes (src/ui/lod)")
     
     # Filter arguments
     parser.add_argument("--language", help="Filter by programming language")
@@ -98,7 +140,10 @@ if __name__ == "__main__":
         pass
     
     try:
-        run_research(args.query, args.limit, filters if filters else None)
+        run_research(args.query, args.limit, filters if filters else None, args.batch_size, args.ai,
+                     enrich=args.enrich, manifests=args.manifests)
+        if args.lod:
+            export_landscape_lod()
     except Exception as e:
         print(f"❌ Error during research: {e}")
         print("Tip: Ensure Neo4j is running and reachable.")
@@ -0,0 +1,173 @@
+// The Wheel - Level-of-detail viewer for large landscapes
+// Renders exports from export_landscape_lod: lod/overview.js defines `graphLOD` (positions are
+// precomputed, nothing is simulated here). Zoomed out it draws one circle per community; zoomed
+// in it loads the detail tiles covering the view (lod/tiles/<i>_<j>.js, via script tags so it
+// works from file://) and draws only the nodes and links inside the viewport.
+
+const LOD_DETAIL_ZOOM = 4;      // zoom (relative to fit-to-screen) where tiles replace communities
+const LOD_MAX_NODES = 5000;     // cap on drawn nodes; the rest appear as you zoom further
+const LOD_LABEL_LIMIT = 300;    // labels are only drawn when this few nodes are visible
+
+const lodTiles = new Map();     // tile key -> tile data, or null while its script is loading
+let lodTileLoaded = () => {};
+
+// Called by each tile script as it loads
+function wheelTile(tile) {
+    lodTiles.set(tile.key, tile);
+    lodTileLoaded();
+}
+
+function loadLodTile(base, key) {
+    if (lodTiles.has(key)) return;
+    lodTiles.set(key, null);
+    const script = document.createElement('script');
+    script.src = `${base}/tiles/${key}.js`;
+    script.onerror = () => lodTiles.delete(key);
+    document.head.appendChild(script);
+}
+
+// A later research run may have updated data.js / deltas.js without a new LOD export:
+// the LOD is only current if no delta carries changes stamped after it
+function lodIsCurrent(lod, deltas) {
+    return (deltas || []).every(delta => delta.until <= lod.watermark);
+}
+
+function renderLandscapeLOD(lod, base = 'lod') {
+    const width = window.innerWidth;
+    const height = window.innerHeight;
+    const [minX, minY, maxX, maxY] = lod.bounds;
+    const fit = 0.9 * Math.min(width / Math.max(maxX - minX, 1), height / Math.max(maxY - minY, 1));
+    const initial = d3.zoomIdentity
+        .translate(width / 2, height / 2)
+        .scale(fit)
+        .translate(-(minX + maxX) / 2, -(minY + maxY) / 2);
+
+    const svg = d3.select("#viz").append("svg").attr("width", width).attr("height", height);
+    const container = svg.append("g");
+    const linkLayer = container.append("g").attr("class", "links");
+    const nodeLayer = container.append("g").attr("class", "nodes");
+    const labelLayer = container.append("g");
+
+    let transform = initial;
+    let scheduled = false;
+    const schedule = () => {
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(() => { scheduled = false; draw(); });
+    };
+    lodTileLoaded = schedule;
+
+    const zoom = d3.zoom()
+        .scaleExtent([fit / 4, fit * 400])
+        .on("zoom", event => {
+            transform = event.transform;
+            container.attr("transform", transform);
+            schedule();
+        });
+    svg.call(zoom).call(zoom.transform, initial);
+
+    function draw() {
+        const [x0, y0] = transform.invert([0, 0]);
+        const [x1, y1] = transform.invert([width, height]);
+        const inView = (x, y, r = 0) => x + r >= x0 && x - r <= x1 && y + r >= y0 && y - r <= y1;
+        const detail = transform.k / fit >= LOD_DETAIL_ZOOM;
+        const view = detail ? detailView(inView, [x0, y0, x1, y1]) : overviewView(inView);
+        // Keep markers a constant size on screen whatever the zoom
+        const px = 1 / transform.k;
+
+        linkLayer.selectAll("line")
+            .data(view.links, d => d.key)
+            .join("line")
+            .attr("class", "link")
+            .attr("x1", d => d.x1).attr("y1", d => d.y1)
+            .attr("x2", d => d.x2).attr("y2", d => d.y2)
+            .attr("stroke-width", d => (d.width || 1) * px);
+
+        nodeLayer.selectAll("circle")
+            .data(view.nodes, d => d.key)
+            .join(enter => enter.append("circle")
+                .on("mouseover", (event, d) => {
+                    d3.select("#tooltip")
+                        .style("display", "block")
+                        .style("left", (event.pageX + 10) + "px")
+                        .style("top", (event.pageY - 10) + "px")
+                        .html(d.size ? `<strong>${d.name}</strong><br>${d.size} nodes`
+                                     : `<strong>${d.name || d.id}</strong><br>Type: ${d.type}`);
+                })
+                .on("mouseout", () => d3.select("#tooltip").style("display", "none"))
+                .on("click", (event, d) => {
+                    if (d.size) {
+                        // Zoom into the community until its tiles load
+                        const k = Math.max(fit * LOD_DETAIL_ZOOM, Math.min(width, height) / (4 * Math.max(d.r, 1)));
+                        svg.transition().duration(600).call(zoom.transform,
+                            d3.zoomIdentity.translate(width / 2, height / 2).scale(k).translate(-d.x, -d.y));
+                    } else if (d.url) {
+                        window.open(d.url, '_blank');
+                    }
+                }))
+            .attr("class", d => d.size ? "node node-community" : `node node-${(d.type || 'default').toLowerCase()}`)
+            .attr("cx", d => d.x)
+            .attr("cy", d => d.y)
+            .attr("r", d => d.size ? Math.max(d.r, 6 * px) : (d.type === "Project" ? 6 : 4) * px)
+            .attr("stroke-width", px);
+
+        const labelled = view.nodes.length <= LOD_LABEL_LIMIT ? view.nodes : view.nodes.filter(d => d.size);
+        labelLayer.selectAll("text")
+            .data(labelled.slice(0, LOD_LABEL_LIMIT), d => d.key)
+            .join("text")
+            .text(d => d.name || d.id)
+            .attr("x", d => d.x + 8 * px)
+            .attr("y", d => d.y + 4 * px)
+            .style("font-size", `${12 * px}px`);
+
+        const stats = document.getElementById('stats');
+        if (stats) {
+            stats.innerHTML = `Nodes: ${lod.total_nodes}<br>Links: ${lod.total_links}<br>` +
+                (detail ? `Showing ${view.nodes.length} nodes in view` : `${lod.communities.length} communities`);
+        }
+    }
+
+    function overviewView(inView) {
+        const communities = new Map();
+        lod.communities.forEach(([id, x, y, r, size, label]) => {
+            if (inView(x, y, r)) communities.set(id, { key: `c${id}`, id, x, y, r, size, name: label });
+        });
+        const nodes = [...communities.values()].sort((a, b) => b.size - a.size).slice(0, LOD_MAX_NODES);
+        const shown = new Set(nodes.map(d => d.id));
+        const links = lod.community_links
+            .filter(([a, b]) => shown.has(a) && shown.has(b))
+            .map(([a, b, weight]) => {
+                const s = communities.get(a), t = communities.get(b);
+                return { key: `c${a}-${b}`, x1: s.x, y1: s.y, x2: t.x, y2: t.y, width: Math.log1p(weight) };
+            });
+        return { nodes, links };
+    }
+
+    function detailView(inView, [x0, y0, x1, y1]) {
+        const size = lod.tile_size;
+        const keys = [];
+        for (let i = Math.floor((x0 - minX) / size); i <= Math.floor((x1 - minX) / size); i++) {
+            for (let j = Math.floor((y0 - minY) / size); j <= Math.floor((y1 - minY) / size); j++) {
+                if (lod.tiles[`${i}_${j}`]) keys.push(`${i}_${j}`);
+            }
+        }
+        keys.forEach(key => loadLodTile(base, key));
+
+        const nodes = [];
+        const links = new Map();
+        keys.map(key => lodTiles.get(key)).filter(Boolean).forEach(tile => {
+            tile.nodes.forEach(([id, type, name, url, x, y]) => {
+                if (nodes.length < LOD_MAX_NODES && inView(x, y)) {
+                    nodes.push({ key: id, id, type: lod.types[type], name, url, x, y });
+                }
+            });
+            tile.links.forEach(([source, target, type, sx, sy, tx, ty]) => {
+                const key = `${source}-${target}-${type}`;
+                if (!links.has(key) && (inView(sx, sy) || inView(tx, ty))) {
+                    links.set(key, { key, x1: sx, y1: sy, x2: tx, y2: ty });
+                }
+            });
+        });
+        return { nodes, links: [...links.values()].slice(0, LOD_MAX_NODES * 2) };
+    }
+}
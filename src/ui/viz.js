@@ -5,7 +5,10 @@ const height = window.innerHeight;
 
 // Check if graphData is loaded from data.js
 if (typeof graphData !== 'undefined' && graphData.nodes.length > 0) {
-    renderViz(graphData);
+    const data = decodeGraphData(graphData);
+    // deltas.js (optional) holds incremental exports made since data.js
+    (window.graphDeltas || []).forEach(delta => applyGraphDelta(data, delta));
+    renderViz(data);
 } else {
     console.log("No dynamic data found. Showing sample graph.");
     const sampleData = {
@@ -22,6 +25,39 @@ if (typeof graphData !== 'undefined' && graphData.nodes.length > 0) {
     renderViz(sampleData);
 }
 
+// Expand the exporter's compact format:
+// {format: "compact", types: [...], nodes: [[id, type, name, url]], links: [[source, target, type]]}
+function decodeGraphData(data) {
+    if (!data || data.format !== 'compact') return data;
+    return {
+        nodes: data.nodes.map(([id, type, name, url]) => ({ id, name, type: data.types[type], url })),
+        links: data.links.map(([source, target, type]) => ({ source, target, type: data.types[type] }))
+    };
+}
+
+// Merge an incremental export ({since, until, nodes, links}) into graph data in place
+function applyGraphDelta(data, delta) {
+    const nodesById = new Map(data.nodes.map(n => [n.id, n]));
+    delta.nodes.forEach(n => {
+        if (nodesById.has(n.id)) {
+            Object.assign(nodesById.get(n.id), n);
+        } else {
+            data.nodes.push(n);
+            nodesById.set(n.id, n);
+        }
+    });
+    const endpoint = e => (typeof e === 'object' ? e.id : e);
+    const linkKey = l => `${endpoint(l.source)}-${endpoint(l.target)}-${l.type}`;
+    const existing = new Set(data.links.map(linkKey));
+    delta.links.forEach(l => {
+        if (!existing.has(linkKey(l))) {
+            data.links.push(l);
+            existing.add(linkKey(l));
+        }
+    });
+    return data;
+}
+
 function renderViz(data) {
     const svg = d3.select("#viz")
         .append("svg")
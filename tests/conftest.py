@@ -0,0 +1,120 @@
+import gc
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmarks", action="store_true", help="also run wall-clock benchmarks (tests marked benchmark)")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: wall-clock performance check, skipped unless --benchmarks is given")
+
+def pytest_collection_modifyitems(config, items):
+    # Absolute time limits depend on the machine and its load; keep them out of the default run
+    if config.getoption("--benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="wall-clock benchmark, run with --benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+class StubServer:
+    """Local HTTP server whose responses come from a test-supplied handler."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                request = {
+                    "method": self.command,
+                    "path": url.path,
+                    "query": {k: v[0] for k, v in parse_qs(url.query).items()},
+                    "headers": dict(self.headers),
+                    "body": json.loads(self.rfile.read(length)) if length else None,
+                }
+                stub.requests.append(request)
+                status, headers, body = stub.handler(request)
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _respond
+            do_POST = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(handler):
+        server = StubServer(handler)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+def make_project(name, topics=(), components=(), stars=1, **fields):
+    """
+    A project as research runs produce it. Components may be given by name (typed "Lib")
+    or as dicts; any other field can be overridden.
+    """
+    return {"name": name, "url": f"https://github.com/{name}", "author": name.split("/")[0],
+            "stars": stars, "description": "", "language": "python", "topics": list(topics),
+            "components": [c if isinstance(c, dict) else {"name": c, "type": "Lib"} for c in components],
+            **fields}
+
+def measure_growth(prepare, small: int, large: int, repeat: int = 3) -> float:
+    """
+    How much longer `prepare(n)()` takes for `large` than for `small` (best of `repeat`
+    runs each). Close to large / small for linear work, its square for quadratic work;
+    a ratio holds up on a loaded machine where an absolute time limit does not. The
+    garbage collector is paused while timing, as its passes grow with the heap.
+    """
+    def best(n):
+        timings = []
+        for _ in range(repeat):
+            work = prepare(n)
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                work()
+                timings.append(time.perf_counter() - start)
+            finally:
+                gc.enable()
+        return min(timings)
+    return best(large) / best(small)
+
+@pytest.fixture
+def project():
+    """make_project, for tests that build research results."""
+    return make_project
+
+@pytest.fixture
+def growth_ratio():
+    """measure_growth, for scaling tests."""
+    return measure_growth
@@ -0,0 +1,95 @@
+import time
+import numpy as np
+import pytest
+from scipy import sparse
+from src.data.connection import db
+from src.data.memory_graph import MemoryGraph
+from src.data.writer import GraphWriter
+from src.engine.analytics import LandscapeAnalytics
+from src.engine.strategy import StrategyAdvisor
+
+RECORDS = [
+    {"name": "a/cms", "url": "u1", "topics": ["web", "cms"], "components": ["REST API", "Auth", "Database Layer"]},
+    {"name": "b/cms", "url": "u2", "topics": ["web", "cms"], "components": ["REST API", "Auth", "Search"]},
+    {"name": "c/blog", "url": "u3", "topics": ["web", "blog"], "components": ["REST API"]},
+    {"name": "d/ml", "url": "u4", "topics": ["ml"], "components": []},
+    {"name": "e/ml", "url": "u5", "topics": ["ml", "blog"], "components": ["Search"]},
+]
+
+@pytest.fixture
+def analytics():
+    return LandscapeAnalytics.from_records(RECORDS)
+
+def test_topic_cooccurrence_and_metrics(analytics):
+    cooccurrence = analytics.topic_cooccurrence().toarray()
+    web, cms = analytics.topics.index("web"), analytics.topics.index("cms")
+    assert cooccurrence[web, web] == 3 and cooccurrence[web, cms] == 2
+
+    metrics = analytics.topic_metrics()
+    assert metrics["projects"][web] == 3 and metrics["components"][web] == 4
+    # web: REST API x3, Auth x2, Database Layer x1, Search x1 over 3 projects x 4 components
+    assert metrics["adoption"][web] == pytest.approx(7 / 12)
+    assert metrics["saturation"][web] == pytest.approx(7 / 12)
+    assert [t["topic"] for t in analytics.related_topics("web")] == ["cms", "blog"]
+
+def test_market_gaps_respect_min_projects(analytics):
+    gaps = analytics.market_gaps(k=10, min_projects=2)
+    # web is the most crowded at 7/12 adoption; blog and ml tie (2 projects, 50% adoption)
+    assert [g["topic"] for g in gaps] == ["web", "blog", "ml", "cms"]
+    assert analytics.market_gaps(k=10, min_projects=3) == gaps[:1]
+
+def test_similar_projects_and_missing_components(analytics):
+    similar = analytics.similar_projects("a/cms")
+    assert [s["name"] for s in similar] == ["b/cms", "c/blog"]
+    assert similar[0]["similarity"] == pytest.approx(2 / 4) and similar[0]["shared"] == 2
+    assert [m["name"] for m in analytics.missing_components("u1")] == ["Search"]
+    assert analytics.similar_projects("unknown") == []
+
+def test_pivots_are_built_from_the_graph(monkeypatch, project):
+    graph = MemoryGraph()
+    monkeypatch.setattr(db, "mock_mode", True)
+    monkeypatch.setattr(db, "mock_graph", graph)
+    GraphWriter().write_projects([project(r["name"], r["topics"], r["components"], url=r["url"]) for r in RECORDS])
+
+    pivots = StrategyAdvisor().propose_pivots("a/cms")
+    assert pivots.splitlines()[0] == "Pivot Strategy for a/cms:"
+    assert "b/cms (50% component overlap)" in pivots
+    assert "Reach feature parity with: Search" in pivots
+    assert "Blue Ocean directions: blog" in pivots
+
+@pytest.mark.benchmark
+def test_million_projects_in_seconds():
+    rng = np.random.default_rng(7)
+    projects, topics, components = 1_000_000, 5_000, 2_000
+    rows = np.repeat(np.arange(projects), 4)
+    project_topics = sparse.csr_matrix((np.ones(len(rows)), (rows, rng.integers(0, topics, len(rows)))),
+                                       shape=(projects, topics))
+    project_components = sparse.csr_matrix((np.ones(len(rows)), (rows, rng.integers(0, components, len(rows)))),
+                                           shape=(projects, components))
+
+    start = time.perf_counter()
+    analytics = LandscapeAnalytics([f"p{i}" for i in range(projects)], [f"t{i}" for i in range(topics)],
+                                   [f"c{i}" for i in range(components)], project_topics, project_components)
+    analytics.topic_cooccurrence()
+    gaps = analytics.market_gaps(k=10)
+    similar = analytics.similar_projects("p42", k=10)
+    assert time.perf_counter() - start < 20
+    assert len(gaps) == 10 and len(similar) == 10
+
+def test_pivots_load_the_landscape_once_per_advisor(monkeypatch, project):
+    graph = MemoryGraph()
+    monkeypatch.setattr(db, "mock_mode", True)
+    monkeypatch.setattr(db, "mock_graph", graph)
+    GraphWriter().write_projects([project(r["name"], r["topics"], r["components"], url=r["url"]) for r in RECORDS])
+    loads = []
+    load = LandscapeAnalytics.load
+    monkeypatch.setattr(LandscapeAnalytics, "load", classmethod(lambda cls: loads.append(1) or load()))
+
+    advisor = StrategyAdvisor()
+    first = advisor.propose_pivots("a/cms")
+    assert advisor.propose_pivots("a/cms") == first and advisor.propose_pivots("b/cms")
+    assert len(loads) == 1
+
+    advisor.invalidate()
+    advisor.propose_pivots("a/cms")
+    assert len(loads) == 2
@@ -0,0 +1,79 @@
+import json
+import pytest
+from src.data.connection import db
+from src.engine.landscape import LandscapeCache
+from src.engine.rate_limit import TokenPool
+from src.engine.search_index import LocalSearchIndex
+from src.engine.single_flight import SingleFlight
+
+class StubGitHub:
+    def __init__(self, projects=(), error=None):
+        self.projects = list(projects)
+        self.error = error
+        self.calls = []
+
+    def search_pages(self, query, filters=None, max_results=1000):
+        self.calls.append((query, max_results))
+        for project in self.projects[:max_results]:
+            yield project
+        if self.error:
+            raise self.error
+
+def repo(name, description):
+    return {"name": name, "url": f"https://github.com/{name}", "description": description,
+            "stars": 1, "language": "python", "topics": []}
+
+@pytest.fixture
+def api(monkeypatch):
+    # Importing the server builds its adapter and enables mock mode; keep both from leaking
+    monkeypatch.setattr(db, "mock_mode", db.mock_mode)
+    monkeypatch.setattr("src.engine.github_adapter.get_search_index", lambda: LocalSearchIndex(":memory:", seed_demo=False))
+    import api_server
+    monkeypatch.setattr(api_server, "search_landscapes", LandscapeCache())
+    monkeypatch.setattr(api_server, "search_flights", SingleFlight(max_concurrency=1, acquire_timeout=0))
+    return api_server
+
+def stream(api, body):
+    response = api.app.test_client().post("/api/search/stream", json=body)
+    return response, [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+def test_stream_emits_projects_then_summary_and_replays_from_cache(api, monkeypatch):
+    github = StubGitHub([repo("a/web", "A react web app"), repo("b/api", "A django rest api")])
+    monkeypatch.setattr(api, "github_adapter", github)
+
+    response, events = stream(api, {"query": "web", "filters": {"limit": 5}})
+    assert response.status_code == 200 and response.mimetype == "application/x-ndjson"
+    assert [e["event"] for e in events] == ["project", "project", "summary"]
+    assert [n["name"] for n in events[0]["nodes"]][0] == "a/web"
+    streamed = [n for e in events[:-1] for n in e["nodes"]]
+    assert events[-1]["total_projects"] == 2 and events[-1]["total_nodes"] == len(streamed)
+
+    # The same (normalized) search is replayed from the landscape cache, not fetched again
+    _, replayed = stream(api, {"query": " WEB ", "filters": {"limit": "5"}})
+    assert replayed[:-1] == events[:-1]
+    assert github.calls == [("web", 5)]
+
+def test_stream_reports_failures_as_an_error_event(api, monkeypatch):
+    monkeypatch.setattr(api, "github_adapter", StubGitHub([repo("a/web", "web app")], error=RuntimeError("boom")))
+    _, events = stream(api, {"query": "web"})
+    assert [e["event"] for e in events] == ["project", "error"] and events[-1]["error"] == "boom"
+
+    _, events = stream(api, {"query": "web", "filters": {"limit": "many"}})
+    assert [e["event"] for e in events] == ["error"]
+    assert api.search_landscapes.stats()["entries"] == 0
+
+def test_stream_is_rejected_when_every_search_slot_is_busy(api, monkeypatch):
+    github = StubGitHub([repo("a/web", "web app")])
+    monkeypatch.setattr(api, "github_adapter", github)
+    with api.search_flights.slot():
+        response = api.app.test_client().post("/api/search/stream", json={"query": "web"})
+    assert response.status_code == 503 and response.headers["Retry-After"] == "5"
+    assert github.calls == []
+
+def test_rate_limit_endpoint_reports_only_aggregate_headroom(api, monkeypatch):
+    pool = TokenPool(["secret-token-1234"])
+    pool.record("secret-token-1234", "search", 200, {"X-RateLimit-Remaining": "7", "X-RateLimit-Reset": "4000000000"})
+    monkeypatch.setattr(api.github_adapter, "token_pool", pool)
+
+    response = api.app.test_client().get("/api/rate-limit")
+    assert response.get_json() == {"tokens": 1, "headroom": {"search": 7}}
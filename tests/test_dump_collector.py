@@ -0,0 +1,96 @@
+import gzip
+import json
+from src.data.connection import db
+from src.data.memory_graph import MemoryGraph
+from src.data.writer import GraphWriter
+from src.engine.dump_collector import DumpCollector, normalize_lines
+from src.engine.search_index import LocalSearchIndex
+
+def api_repo(i, **extra):
+    return dict({"full_name": f"org/repo-{i}", "html_url": f"https://github.com/org/repo-{i}",
+                 "description": "A REST API with auth", "stargazers_count": i, "owner": {"login": "org"},
+                 "language": "Go" if i % 2 else None, "topics": ["web"]}, **extra)
+
+def write_dump(path, records, compress=False):
+    opener = gzip.open if compress else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        for record in records:
+            f.write((record if isinstance(record, str) else json.dumps(record)) + "\n")
+    return str(path)
+
+class RecordingWriter:
+    def __init__(self):
+        self.calls = []
+    def write_projects(self, projects):
+        self.calls.append([p["name"] for p in projects])
+
+def test_records_are_normalized_like_the_live_adapter():
+    lines = [json.dumps(r).encode() for r in [
+        api_repo(1),
+        {"name": "a/b", "url": "https://github.com/a/b", "stars": 3, "topics": []},
+        {"type": "CreateEvent", "repo": {"name": "c/d"}, "payload": {"description": "a cli"}},
+        {"type": "PullRequestEvent", "repo": {"name": "e/f"}, "payload": {"pull_request": {"base": {"repo": api_repo(7)}}}},
+        {"type": "WatchEvent", "repo": {}, "payload": {}},
+    ]] + [b"{not json"]
+    projects, skipped = normalize_lines(lines)
+
+    assert [p["name"] for p in projects] == ["org/repo-1", "a/b", "c/d", "org/repo-7"]
+    assert projects[0]["language"] == "go" and projects[0]["stars"] == 1 and projects[0]["author"] == "org"
+    assert projects[2] == dict(projects[2], url="https://github.com/c/d", description="a cli", author="c")
+    assert skipped == 2
+
+def test_ingest_writes_in_order_and_resumes_from_checkpoint(tmp_path):
+    path = write_dump(tmp_path / "dump.jsonl.gz", [api_repo(i) for i in range(10)], compress=True)
+    collector = DumpCollector(path)
+
+    writer = RecordingWriter()
+    first = collector.ingest(writer, workers=1, chunk_size=3, max_chunks=2)
+    assert writer.calls == [["org/repo-0", "org/repo-1", "org/repo-2"], ["org/repo-3", "org/repo-4", "org/repo-5"]]
+    assert first["records"] == 6 and collector.load_checkpoint()["offset"] == first["offset"] > 0
+
+    writer = RecordingWriter()
+    rest = DumpCollector(path).ingest(writer, workers=2, chunk_size=3)
+    assert [name for call in writer.calls for name in call] == [f"org/repo-{i}" for i in range(6, 10)]
+    assert rest["records"] == 4
+
+    # Nothing left; --restart style runs start over
+    assert DumpCollector(path).ingest(RecordingWriter(), workers=1)["records"] == 0
+    assert DumpCollector(path).ingest(RecordingWriter(), workers=1, resume=False)["records"] == 10
+
+def test_ingest_feeds_graph_and_search_index(tmp_path, monkeypatch):
+    graph = MemoryGraph()
+    monkeypatch.setattr(db, "mock_mode", True)
+    monkeypatch.setattr(db, "mock_graph", graph)
+    events = [{"type": "WatchEvent", "repo": {"name": "org/repo-1"}, "payload": {}}] * 3
+    path = write_dump(tmp_path / "dump.jsonl", [api_repo(1), api_repo(2), ""] + events)
+    index = LocalSearchIndex(":memory:", seed_demo=False)
+
+    stats = DumpCollector(path).ingest(GraphWriter(batch_size=2), workers=2, chunk_size=2, search_index=index)
+
+    assert stats["projects"] == 2 and stats["duplicates"] == 3 and stats["skipped"] == 0
+    with db.get_session() as session:
+        assert {r["name"] for r in session.run("// @op incidence")} == {"org/repo-1", "org/repo-2"}
+    assert [r["name"] for r in index.search("rest api", {"language": "go"})] == ["org/repo-1"]
+    assert [p["name"] for p in DumpCollector(path).search("auth", {"limit": 1})] == ["org/repo-1"]
+
+def test_event_stubs_never_overwrite_known_repos(tmp_path, monkeypatch):
+    graph = MemoryGraph()
+    monkeypatch.setattr(db, "mock_mode", True)
+    monkeypatch.setattr(db, "mock_graph", graph)
+    index = LocalSearchIndex(":memory:", seed_demo=False)
+    GraphWriter().write_projects([normalize_lines([json.dumps(api_repo(5, stargazers_count=50)).encode()])[0][0]])
+    index.add_projects(normalize_lines([json.dumps(api_repo(5, stargazers_count=50)).encode()])[0])
+
+    watch = lambda i: {"type": "WatchEvent", "repo": {"name": f"org/repo-{i}"}, "payload": {}}
+    pull = {"type": "PullRequestEvent", "repo": {"name": "org/repo-1"},
+            "payload": {"pull_request": {"base": {"repo": api_repo(1, stargazers_count=40)}}}}
+    path = write_dump(tmp_path / "events.jsonl", [watch(1), pull, watch(1), watch(5)])
+
+    stats = DumpCollector(path).ingest(GraphWriter(), workers=1, chunk_size=2, search_index=index)
+
+    # The stub for repo-1 is replaced by its full object; later stubs are duplicates
+    assert stats["projects"] == 3 and stats["duplicates"] == 1
+    for i, stars in ((1, 40), (5, 50)):
+        props = graph.props(graph.find_node("Project", f"https://github.com/org/repo-{i}"))
+        assert props["stars"] == stars and props["description"] == "A REST API with auth" and props["primary_language"] == "go"
+    assert [r["stars"] for r in index.search("rest api")] == [50, 40]
@@ -0,0 +1,109 @@
+import re
+import threading
+from src.engine.cache import ResponseCache
+from src.engine.enrichment import GraphQLEnricher, build_query
+
+ALIAS = re.compile(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+
+def repo_node(owner, name, pushed_at="2024-05-01T00:00:00Z"):
+    return {
+        "nameWithOwner": f"{owner}/{name}", "url": f"https://github.com/{owner}/{name}", "pushedAt": pushed_at,
+        "repositoryTopics": {"nodes": [{"topic": {"name": "graphql"}}]},
+        "languages": {"edges": [{"size": 900, "node": {"name": "Python"}}, {"size": 100, "node": {"name": "Shell"}}]},
+        "latestRelease": {"tagName": "v1.2.0", "publishedAt": "2024-04-01T00:00:00Z"},
+        "manifest0": None,
+        "manifest1": {"oid": "abc123", "byteSize": 12, "isTruncated": False, "text": "requests>=2\n"},
+    }
+
+def graphql_handler(cost_per_repo=0.5, missing=(), fail_above=None):
+    """Answers aliased repository queries; batches larger than `fail_above` hit the node limit."""
+    def handler(request):
+        repos = ALIAS.findall(request["body"]["query"])
+        if fail_above and len(repos) > fail_above:
+            return 200, {}, {"errors": [{"type": "MAX_NODE_LIMIT_EXCEEDED", "message": "too many nodes"}]}
+        data = {"rateLimit": {"cost": max(1, round(cost_per_repo * len(repos))), "remaining": 4000,
+                              "resetAt": "2030-01-01T00:00:00Z"}}
+        errors = []
+        for alias, owner, name in repos:
+            if name in missing:
+                data[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias]})
+            else:
+                data[alias] = repo_node(owner, name)
+        return 200, {"X-RateLimit-Resource": "graphql"}, {"data": data, "errors": errors}
+    return handler
+
+def projects(count, pushed_at="2024-05-01T00:00:00Z"):
+    return [{"name": f"org/repo-{i}", "url": f"https://github.com/org/repo-{i}", "topics": ["web"],
+             "pushed_at": pushed_at} for i in range(count)]
+
+def test_batches_are_aliased_and_sized_by_reported_cost(stub_server):
+    server = stub_server(graphql_handler(cost_per_repo=0.5, missing={"repo-3"}))
+    enricher = GraphQLEnricher(url=server.url, use_cache=False, batch_size=4, target_cost=5)
+
+    enriched = enricher.enrich(projects(30))
+
+    # 4 repos cost 2 points, so the next batches grow to the 10 repos that cost 5
+    assert [len(ALIAS.findall(r["body"]["query"])) for r in server.requests] == [4, 10, 10, 6]
+    first = enriched[0]
+    assert first["topics"] == ["web", "graphql"]
+    assert [language["name"] for language in first["languages"]] == ["Python", "Shell"]
+    assert first["latest_release"]["tag"] == "v1.2.0"
+    assert first["manifests"] == [{"path": "requirements.txt", "oid": "abc123", "size": 12, "text": "requests>=2\n"}]
+    assert "languages" not in enriched[3]
+    assert enricher.stats["fetched"] == 29 and enricher.stats["missing"] == 1
+
+def test_unchanged_repos_are_served_from_the_pushed_at_cache(stub_server):
+    server = stub_server(graphql_handler())
+    cache = ResponseCache(":memory:")
+
+    GraphQLEnricher(url=server.url, cache=cache).enrich(projects(5))
+    again = GraphQLEnricher(url=server.url, cache=cache).enrich(projects(5))
+    assert len(server.requests) == 1
+    assert again[2]["latest_release"]["tag"] == "v1.2.0"
+    # Manifest text is left to the blob cache; the blob SHA is kept
+    assert again[2]["manifests"] == [{"path": "requirements.txt", "oid": "abc123", "size": 12, "text": None}]
+
+    # A new push is a new cache key
+    GraphQLEnricher(url=server.url, cache=cache).enrich(projects(5, pushed_at="2024-06-01T00:00:00Z"))
+    assert len(server.requests) == 2
+
+def test_threads_share_an_enricher(stub_server):
+    server = stub_server(graphql_handler(cost_per_repo=0.5))
+    enricher = GraphQLEnricher(url=server.url, use_cache=False, batch_size=4, target_cost=5)
+    batches = [projects(30), projects(30), projects(30)]
+
+    threads = [threading.Thread(target=enricher.enrich, args=(batch,)) for batch in batches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(project.get("languages") for batch in batches for project in batch)
+    assert enricher.stats["fetched"] == 90 and enricher.stats["requests"] == len(server.requests)
+    assert sum(len(ALIAS.findall(r["body"]["query"])) for r in server.requests) == 90
+
+def test_each_call_reports_its_own_counts(stub_server, capsys):
+    server = stub_server(graphql_handler(cost_per_repo=1))
+    enricher = GraphQLEnricher(url=server.url, use_cache=False)
+
+    enricher.enrich(projects(5))
+    enricher.enrich(projects(3))
+
+    summaries = [line for line in capsys.readouterr().out.splitlines() if line.startswith("🧬")]
+    assert summaries == ["🧬 Enriched 5 repos (0 cached) in 1 GraphQL requests costing 5 points",
+                         "🧬 Enriched 3 repos (0 cached) in 1 GraphQL requests costing 3 points"]
+    assert enricher.stats == {"requests": 2, "cost": 8, "cached": 0, "fetched": 8, "missing": 0}
+
+def test_queries_over_the_node_limit_are_retried_in_halves(stub_server):
+    server = stub_server(graphql_handler(fail_above=5))
+    enricher = GraphQLEnricher(url=server.url, use_cache=False, batch_size=20, min_batch=1, target_cost=1)
+
+    enriched = enricher.enrich(projects(12))
+
+    assert [len(ALIAS.findall(r["body"]["query"])) for r in server.requests][:3] == [12, 6, 3]
+    assert all(project.get("languages") for project in enriched)
+
+def test_query_escapes_repository_names():
+    query = build_query([("o", 'we"ird')])
+    assert 'name: "we\\"ird"' in query and "fragment Enrichment on Repository" in query
@@ -0,0 +1,130 @@
+import gzip
+import json
+from src.data import exporter
+from src.data.exporter import export_landscape_delta, export_landscape_lod, export_landscape_streaming
+
+NODES = [{"id": i, "name": f"n{i}", "type": "Project" if i % 2 else "Component", "url": None, "updated_at": i} for i in range(1, 8)]
+LINKS = [{"source": 1, "target": i + 1, "type": "USES", "updated_at": i} for i in range(1, 6)]
+
+class StreamSession:
+    """Serves the exporter's node and link queries from fixed lists, one lazy result each."""
+    def __init__(self, nodes=NODES, **config):
+        self.nodes = nodes
+        self.config = config
+        self.queries = []
+        self.pulled = 0
+    def __enter__(self): return self
+    def __exit__(self, exc_type, exc_val, exc_tb): pass
+    def run(self, query, **params):
+        assert not params
+        self.queries.append(query)
+        for record in self.nodes if query == exporter.NODES_QUERY else LINKS:
+            self.pulled += 1
+            yield record
+
+def stream_sessions(monkeypatch, nodes=NODES):
+    sessions = []
+    def get_session(**config):
+        sessions.append(StreamSession(nodes, **config))
+        return sessions[-1]
+    monkeypatch.setattr(exporter.db, "get_session", get_session)
+    return sessions
+
+def load_js(path):
+    text = path.read_text()
+    assert text.startswith("const graphData = ") and text.endswith(";")
+    return json.loads(text[len("const graphData = "):-1])
+
+def test_export_streams_one_node_and_one_link_query(tmp_path, monkeypatch):
+    sessions = stream_sessions(monkeypatch)
+
+    stats = export_landscape_streaming(str(tmp_path / "data.js"), fetch_size=3)
+    data = load_js(tmp_path / "data.js")
+
+    [session] = sessions
+    assert session.config == {"fetch_size": 3}
+    assert session.queries == [exporter.NODES_QUERY, exporter.LINKS_QUERY] and session.pulled == 12
+    assert "ORDER BY" not in exporter.NODES_QUERY + exporter.LINKS_QUERY
+    assert [n["id"] for n in data["nodes"]] == list(range(1, 8))
+    assert data["links"][0] == {"source": 1, "target": 2, "type": "USES"}
+    assert stats["nodes"] == 7 and stats["links"] == 5 and stats["peak_memory_mb"] >= 0
+
+def test_compact_gzip_export_interns_types(tmp_path, monkeypatch):
+    stream_sessions(monkeypatch)
+
+    export_landscape_streaming(str(tmp_path / "landscape.json.gz"), fetch_size=4, compact=True)
+    with gzip.open(tmp_path / "landscape.json.gz", "rt") as f:
+        data = json.load(f)
+
+    assert data["format"] == "compact"
+    assert data["types"] == ["Project", "Component", "USES"]
+    assert data["nodes"][1] == [2, 1, "n2", None]
+    assert data["links"][0] == [1, 2, 2]
+
+def test_delta_export_appends_only_changes_since_watermark(tmp_path, monkeypatch):
+    base = str(tmp_path / "data.js")
+    stream_sessions(monkeypatch)
+    export_landscape_streaming(base)
+    assert json.loads((tmp_path / "export_state.json").read_text()) == {"watermark": 7}
+
+    # Watermarks are real timestamps; the delta re-reads a safety window behind them
+    monkeypatch.setattr(exporter, "DELTA_SAFETY_LAG_MS", 5)
+    changed = {"id": 9, "name": "new", "type": "Project", "url": "u", "updated_at": 12}
+
+    class DeltaSession(StreamSession):
+        def run(self, query, since):
+            assert since == 2
+            if "MATCH (n:Project)" in query:
+                return [changed]
+            if "[r:USES]" in query:
+                return [{"source": 9, "target": 2, "type": "USES", "updated_at": 12}]
+            return []
+
+    monkeypatch.setattr(exporter.db, "get_session", lambda: DeltaSession())
+    stats = export_landscape_delta(base)
+
+    line = (tmp_path / "deltas.js").read_text()
+    delta = json.loads(line[line.index("(", 1) + 1:line.rindex(")")])
+    assert delta == {"since": 2, "until": 12, "nodes": [{"id": 9, "name": "new", "type": "Project", "url": "u"}],
+                     "links": [{"source": 9, "target": 2, "type": "USES"}]}
+    assert stats["nodes"] == 1
+    assert json.loads((tmp_path / "export_state.json").read_text()) == {"watermark": 12}
+
+def load_call(path, prefix):
+    text = path.read_text().strip()
+    assert text.startswith(prefix) and text.endswith(");")
+    return json.loads(text[len(prefix):-2])
+
+def test_lod_export_writes_overview_and_tiles(tmp_path, monkeypatch):
+    stream_sessions(monkeypatch, nodes=NODES[::-1])  # Results come in no particular order
+    (tmp_path / "tiles").mkdir()
+    (tmp_path / "tiles" / "9_9.js").write_text("stale")
+
+    stats = export_landscape_lod(str(tmp_path), fetch_size=3, tile_nodes=2)
+    text = (tmp_path / "overview.js").read_text().strip()
+    assert text.startswith("const graphLOD = ") and text.endswith(";")
+    overview = json.loads(text[len("const graphLOD = "):-1])
+
+    assert overview["format"] == "lod" and overview["total_nodes"] == 7 and overview["total_links"] == 5
+    assert overview["watermark"] == 7
+    assert sum(c[4] for c in overview["communities"]) == 7
+    assert sum(overview["tiles"].values()) == 7 and stats["tiles"] == len(overview["tiles"])
+    assert not (tmp_path / "tiles" / "9_9.js").exists()
+
+    tiles = [load_call(tmp_path / "tiles" / f"{key}.js", "wheelTile(") for key in overview["tiles"]]
+    nodes = {node[0]: node for tile in tiles for node in tile["nodes"]}
+    assert sorted(nodes) == list(range(1, 8))
+    x0, y0, x1, y1 = overview["bounds"]
+    assert all(x0 <= node[4] <= x1 and y0 <= node[5] <= y1 for node in nodes.values())
+    # Every link is in the tile of at least one endpoint, with both endpoints' positions
+    links = {(link[0], link[1]): link for tile in tiles for link in tile["links"]}
+    assert sorted(links) == [(1, i) for i in range(2, 7)]
+    assert links[(1, 2)][3:] == nodes[1][4:6] + nodes[2][4:6]
+
+def test_full_export_removes_the_stale_lod_overview(tmp_path, monkeypatch):
+    stream_sessions(monkeypatch)
+    export_landscape_lod(str(tmp_path / "lod"), fetch_size=3)
+    assert (tmp_path / "lod" / "overview.js").exists()
+
+    export_landscape_streaming(str(tmp_path / "data.js"))
+    assert not (tmp_path / "lod" / "overview.js").exists()
@@ -0,0 +1,114 @@
+import threading
+import time
+from src.data.connection import db
+from src.data.memory_graph import MemoryGraph
+from src.data.writer import GraphWriter
+from src.engine.jobs import JobStore, ResearchJobs
+from src.engine.landscape import LandscapeGraph
+
+def wait_for(jobs, job_id, states=("done", "failed", "cancelled"), timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get(job_id)
+        if job["status"] in states:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} stuck in {job['status']}")
+
+class FakeRunner:
+    """Two-stage pipeline that blocks in its first stage until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = []
+
+    def __call__(self, query, limit, filters, progress):
+        self.calls.append(query)
+        progress("search", {"status": "running"})
+        self.release.wait(5)
+        progress("search", {"status": "done", "found": 1})
+        progress("analyze", {"status": "done", "projects": [{"name": "a/x", "components": ["REST API"]}]})
+        graph = LandscapeGraph()
+        graph.add_project({"name": "a/x", "url": "u", "components": [{"name": "REST API", "type": "Backend"}]})
+        return graph
+
+def test_job_reports_stages_and_result(tmp_path):
+    runner = FakeRunner()
+    runner.release.set()
+    jobs = ResearchJobs(JobStore(str(tmp_path / "jobs.sqlite")), runner=runner)
+
+    job, created = jobs.submit("rockets", 3)
+    finished = wait_for(jobs, job["id"])
+
+    assert created and finished["status"] == "done"
+    assert finished["stages"]["analyze"]["projects"][0]["name"] == "a/x"
+    assert finished["result"]["projects"] == 1 and finished["limit"] == 3
+    jobs.shutdown()
+
+def test_duplicate_submissions_share_one_job(tmp_path):
+    runner = FakeRunner()
+    jobs = ResearchJobs(JobStore(str(tmp_path / "jobs.sqlite")), runner=runner)
+
+    first, _ = jobs.submit("Rockets", 5, {"language": "Python"})
+    second, created = jobs.submit("  rockets ", 5, {"language": "python"})
+    other, other_created = jobs.submit("rockets", 10)
+
+    assert second["id"] == first["id"] and not created
+    assert other["id"] != first["id"] and other_created
+    runner.release.set()
+    wait_for(jobs, first["id"])
+    wait_for(jobs, other["id"])
+    assert len(runner.calls) == 2
+    jobs.shutdown()
+
+def test_cancel_stops_running_job_after_current_stage(tmp_path):
+    runner = FakeRunner()
+    jobs = ResearchJobs(JobStore(str(tmp_path / "jobs.sqlite")), max_workers=1, runner=runner)
+
+    running, _ = jobs.submit("rockets")
+    queued, _ = jobs.submit("boats")
+    wait_for(jobs, running["id"], states=("running",))
+
+    assert jobs.cancel(queued["id"])["status"] == "cancelled"
+    assert jobs.cancel(running["id"])["cancel_requested"]
+    runner.release.set()
+
+    job = wait_for(jobs, running["id"])
+    assert job["status"] == "cancelled" and "analyze" not in job["stages"]
+    jobs.shutdown()
+    assert runner.calls == ["rockets"]
+
+def test_unfinished_jobs_are_resumed_after_restart(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    store.create("abc", "key", {"query": "rockets", "limit": 5, "filters": {}})
+    store.update("abc", status="running", stages={"search": {"status": "running"}})
+
+    runner = FakeRunner()
+    runner.release.set()
+    jobs = ResearchJobs(JobStore(str(tmp_path / "jobs.sqlite")), runner=runner)
+
+    assert wait_for(jobs, "abc")["status"] == "done"
+    assert runner.calls == ["rockets"]
+    jobs.shutdown()
+
+def test_mock_jobs_write_to_their_own_graph(tmp_path, monkeypatch):
+    shared = MemoryGraph()
+    monkeypatch.setattr(db, "mock_mode", True)
+    monkeypatch.setattr(db, "mock_graph", shared)
+    seen = []
+
+    def runner(query, limit, filters, progress, export=True):
+        GraphWriter().write_projects([{"name": "a/x", "url": "u", "topics": ["web"],
+                                       "components": [{"name": "REST API", "type": "Backend"}]}])
+        with db.get_session() as session:
+            seen.append((export, len(session.storage["nodes"])))
+        return LandscapeGraph()
+
+    jobs = ResearchJobs(JobStore(str(tmp_path / "jobs.sqlite")), runner=runner)
+    job, _ = jobs.submit("rockets", 3)
+    assert wait_for(jobs, job["id"])["status"] == "done"
+    jobs.shutdown()
+
+    assert seen == [(False, 3)]
+    assert shared.stats() == {"nodes": 0, "links": 0}
+
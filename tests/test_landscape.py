@@ -0,0 +1,74 @@
+from src.engine.landscape import LandscapeCache, LandscapeGraph
+
+def test_components_are_shared_and_links_deduplicated(project):
+    graph = LandscapeGraph()
+    graph.add_project(project("a/x", components=["REST API", "Database Layer"]))
+    added = graph.add_project(project("a/y", components=["REST API", "REST API"]))
+
+    assert [n["name"] for n in graph.nodes] == ["a/x", "REST API", "Database Layer", "a/y"]
+    assert [n["id"] for n in graph.nodes] == [1, 2, 3, 4]
+    assert graph.links == [
+        {"source": 1, "target": 2, "type": "USES"},
+        {"source": 1, "target": 3, "type": "USES"},
+        {"source": 4, "target": 2, "type": "USES"},
+    ]
+    # Only what the second project introduced
+    assert [n["name"] for n in added["nodes"]] == ["a/y"]
+    assert added["links"] == [{"source": 4, "target": 2, "type": "USES"}]
+
+def test_projects_are_keyed_by_url_and_payloads_share_ids(project):
+    graph = LandscapeGraph()
+    graph.add_project(project("a/x", components=["REST API"], stars=5))
+    graph.add_project(project("a/x", components=["REST API"], stars=5))
+    graph.add_project(project("b/z", components=[], stars=50))
+
+    d3 = graph.to_d3("query")
+    assert d3["total_projects"] == 2 and d3["query"] == "query"
+
+    summary = graph.summary()
+    assert [p["name"] for p in summary["top_projects"]] == ["b/z", "a/x"]
+    assert summary["top_components"] == [{"name": "REST API", "category": "Lib", "projects": 1}]
+
+def test_from_records_renumbers_and_drops_dangling_links():
+    graph = LandscapeGraph.from_records(
+        [{"id": 10, "name": "a/x", "type": "Project", "url": "u"}, {"id": 20, "name": "D3", "type": "Component", "url": None}],
+        [{"source": 10, "target": 20, "type": "USES"}, {"source": 10, "target": 99, "type": "USES"}],
+    )
+    assert graph.node("Project", "u")["id"] == 1
+    assert graph.links == [{"source": 1, "target": 2, "type": "USES"}]
+
+def test_assembly_is_linear(growth_ratio, project):
+    components = [f"Component {i}" for i in range(200)]
+
+    def prepare(n):
+        graph = LandscapeGraph()
+        projects = [project(f"o/{i}", components=components[i % 150:i % 150 + 40]) for i in range(n)]
+        def assemble():
+            for p in projects:
+                graph.add_project(p)
+            return graph
+        return assemble
+    # 4x the projects: about 4x the time when linear, 16x when quadratic
+    assert growth_ratio(prepare, 250, 1000) < 8
+
+    graph = prepare(1000)()
+    assert len(graph.by_type("Component")) == 189
+    assert len(graph.links) == 40000
+
+def test_cache_evicts_least_recently_used_within_budget(project):
+    small = LandscapeGraph()
+    small.add_project(project("a/x", components=["REST API"]))
+    cache = LandscapeCache(max_entries=10, max_bytes=small.approx_bytes() * 2)
+
+    cache.put("a", small)
+    cache.put("b", small)
+    assert cache.get("a") is small
+    cache.put("c", small)
+
+    assert cache.get("b") is None and cache.get("a") is small and cache.get("c") is small
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] == 1
+
+def test_cache_entries_expire():
+    cache = LandscapeCache(ttl=0)
+    cache.put("a", LandscapeGraph())
+    assert cache.get("a") is None and cache.stats()["bytes"] == 0
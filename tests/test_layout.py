@@ -0,0 +1,52 @@
+import time
+import numpy as np
+import pytest
+from src.data.layout import detect_communities, force_layout
+
+def planted(n, groups, edges, noise, seed=0):
+    """Random graph with `groups` equal clusters and `noise` cross-cluster edges."""
+    rng = np.random.default_rng(seed)
+    size = n // groups
+    sources = rng.integers(0, n, edges)
+    targets = (sources // size) * size + rng.integers(0, size, edges)
+    return (np.r_[sources, rng.integers(0, n, noise)], np.r_[targets, rng.integers(0, n, noise)],
+            np.arange(n) // size)
+
+def purity(found, truth):
+    return sum(np.bincount(truth[found == c]).max() for c in np.unique(found)) / len(truth)
+
+def test_communities_recover_planted_clusters():
+    sources, targets, truth = planted(2000, 4, 8000, 40)
+    communities = detect_communities(2000, sources, targets)
+    assert purity(communities, truth) > 0.95
+    assert len(np.unique(communities)) <= 8
+    # Numbered by size, largest first
+    sizes = np.bincount(communities)
+    assert list(sizes) == sorted(sizes, reverse=True)
+
+def test_bipartite_fragments_are_merged():
+    # 20 groups of 50 projects, each tagged with 3 of its group's 10 topics
+    rng = np.random.default_rng(1)
+    projects, groups = 1000, 20
+    sources = np.repeat(np.arange(projects), 3)
+    targets = projects + (sources // 50) * 10 + rng.integers(0, 10, len(sources))
+    communities = detect_communities(projects + 200, sources, targets, min_size=30)
+    assert len(np.unique(communities)) <= groups
+    assert purity(communities[:projects], np.arange(projects) // 50) > 0.95
+
+def test_layout_keeps_clusters_together():
+    sources, targets, truth = planted(2000, 4, 8000, 40)
+    positions = force_layout(2000, sources, targets, detect_communities(2000, sources, targets))
+    assert positions.shape == (2000, 2) and np.isfinite(positions).all() and positions.min() == 0
+    centres = np.array([positions[truth == g].mean(axis=0) for g in range(4)])
+    within = np.linalg.norm(positions - centres[truth], axis=1).mean()
+    overall = np.linalg.norm(positions - positions.mean(axis=0), axis=1).mean()
+    assert within < overall / 2
+
+@pytest.mark.benchmark
+def test_fifty_thousand_nodes_in_seconds():
+    sources, targets, _ = planted(50_000, 50, 150_000, 3000)
+    start = time.perf_counter()
+    positions = force_layout(50_000, sources, targets, detect_communities(50_000, sources, targets))
+    assert time.perf_counter() - start < 20
+    assert positions.shape == (50_000, 2)
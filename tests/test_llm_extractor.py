@@ -0,0 +1,67 @@
+import json
+import re
+import threading
+import time
+from src.engine.cache import ResponseCache
+from src.engine.llm_extractor import LLMClient, LLMExtractor, parse_json_response
+
+class FakeModel(LLMClient):
+    """Local stand-in for the LLM: one 'Core <name>' component per project in the prompt."""
+
+    def __init__(self, delay=0.0):
+        self.prompts = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        names = re.findall(r"\[(\d+)\] Project: (\S+)", prompt)
+        body = {i: [{"name": f"Core {name}", "type": "Library"}] for i, name in names}
+        return "Sure! Here you go:\n```json\n" + json.dumps(body) + "\n```"
+
+def projects(n):
+    return [{"name": f"org/p{i}", "description": f"project {i}", "topics": ["x"]} for i in range(n)]
+
+def test_projects_are_batched_and_cached(tmp_path):
+    model = FakeModel()
+    cache = ResponseCache(str(tmp_path / "llm.sqlite"))
+    extractor = LLMExtractor(model, cache=cache, batch_size=4)
+
+    first = extractor.extract(projects(10))
+    second = extractor.extract(projects(10))
+
+    assert len(model.prompts) == 3
+    assert first == second
+    assert first[7] == [{"name": "Core org/p7", "type": "Library"}]
+
+def test_default_cache_never_evicts_paid_results(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.engine.llm_extractor.DEFAULT_CACHE_DIR", str(tmp_path))
+    cache = LLMExtractor(FakeModel()).cache
+    assert cache.ttl == cache.max_entries == cache.max_bytes == float("inf")
+
+def test_changed_description_is_reanalyzed(tmp_path):
+    model = FakeModel()
+    extractor = LLMExtractor(model, cache=ResponseCache(str(tmp_path / "llm.sqlite")))
+    batch = projects(2)
+    extractor.extract(batch)
+    batch[1]["description"] = "now with a new feature"
+    extractor.extract(batch)
+    assert len(model.prompts) == 2 and "[1]" not in model.prompts[1]
+
+def test_concurrency_is_bounded(tmp_path):
+    model = FakeModel(delay=0.05)
+    extractor = LLMExtractor(model, cache=ResponseCache(str(tmp_path / "llm.sqlite")), batch_size=1, max_concurrency=3)
+    extractor.extract(projects(9))
+    assert model.max_in_flight == 3
+
+def test_parse_json_response_is_forgiving():
+    assert parse_json_response('[0] done: {"0": [{"name": "A",},],}') == {"0": [{"name": "A"}]}
+    assert parse_json_response("no json here") is None
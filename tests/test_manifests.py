@@ -0,0 +1,135 @@
+import base64
+import threading
+import time
+from src.data.connection import db
+from src.data.memory_graph import MemoryGraph
+from src.data.writer import GraphWriter
+from src.engine.github_adapter import GitHubAdapter
+from src.engine.manifests import (BlobCache, GitHubTreeSource, LocalTreeSource, ManifestExtractor,
+                                  git_blob_sha, parse_manifest)
+
+PACKAGE_JSON = '{"dependencies": {"React": "^18", "@scope/ui": "1.0"}, "devDependencies": {"jest": "29"}}'
+REQUIREMENTS = "requests[socks]>=2.31  # http\nFlask_Cors==4\n-r dev.txt\n\ngit+https://github.com/a/b.git\n"
+
+def test_each_manifest_kind_yields_normalized_package_ids():
+    assert parse_manifest("package.json", PACKAGE_JSON) == ["pkg:npm/react", "pkg:npm/@scope/ui"]
+    assert parse_manifest("requirements.txt", REQUIREMENTS) == ["pkg:pypi/requests", "pkg:pypi/flask-cors"]
+    assert parse_manifest("pyproject.toml", """
+[project]
+dependencies = ["numpy>=1.24", "Typing.Extensions; python_version < '3.11'"]
+[tool.poetry.dependencies]
+python = "^3.11"
+scipy = "^1.10"
+""") == ["pkg:pypi/numpy", "pkg:pypi/typing-extensions", "pkg:pypi/scipy"]
+    assert parse_manifest("go.mod", """module example.com/app
+go 1.22
+require github.com/gin-gonic/gin v1.9.1
+require (
+    golang.org/x/net v0.20.0
+    golang.org/x/sys v0.16.0 // indirect
+)
+""") == ["pkg:go/github.com/gin-gonic/gin", "pkg:go/golang.org/x/net"]
+    assert parse_manifest("Cargo.toml", """
+[dependencies]
+serde = "1"
+tokio_util = { version = "0.7" }
+http02 = { package = "http", version = "0.2" }
+""") == ["pkg:cargo/serde", "pkg:cargo/tokio-util", "pkg:cargo/http"]
+    assert parse_manifest("package.json", "{broken") == []
+
+def test_identical_manifests_across_forks_are_parsed_once(tmp_path, monkeypatch):
+    for repo in ("org/app", "fork/app", "other/tool"):
+        (tmp_path / repo).mkdir(parents=True)
+        (tmp_path / repo / "requirements.txt").write_text(REQUIREMENTS)
+    (tmp_path / "other/tool/package.json").write_text(PACKAGE_JSON)
+    projects = [{"name": repo, "url": f"https://github.com/{repo}"} for repo in ("org/app", "fork/app", "other/tool")]
+    cache = BlobCache(":memory:")
+
+    extractor = ManifestExtractor(LocalTreeSource(str(tmp_path)), cache, workers=3)
+    components = extractor.extract(projects)
+
+    assert [c["name"] for c in components[0]] == ["pkg:pypi/requests", "pkg:pypi/flask-cors"]
+    assert components[0] == components[1]
+    assert len(components[2]) == 4 and all(c["type"] == "Package" for c in components[2])
+    assert extractor.stats["parsed"] == 2 and cache.count() == 2
+
+    graph = MemoryGraph()
+    monkeypatch.setattr(db, "mock_mode", True)
+    monkeypatch.setattr(db, "mock_graph", graph)
+    for project, found in zip(projects, components):
+        project["components"] = found
+    GraphWriter().write_projects(projects)
+
+    requests_package = graph.find_node("Component", "pkg:pypi/requests")
+    assert graph.props(requests_package)["type"] == "Package"
+    assert len(graph.neighbors("USES", requests_package, incoming=True)) == 3
+
+def test_github_blobs_are_fetched_once_per_sha(stub_server):
+    shared, unique = b"flask>=2\n", b"django\n"
+    trees = {
+        "org/a": [("requirements.txt", shared), ("README.md", b"x")],
+        "org/b": [("requirements.txt", shared)],
+        "org/c": [("requirements.txt", unique)],
+    }
+    blobs = {git_blob_sha(content): content for files in trees.values() for _, content in files}
+
+    def handler(request):
+        parts = request["path"].strip("/").split("/")
+        repo = f"{parts[1]}/{parts[2]}"
+        if parts[4] == "trees":
+            return 200, {}, {"tree": [{"path": path, "type": "blob", "sha": git_blob_sha(content)}
+                                      for path, content in trees[repo]]}
+        return 200, {}, {"encoding": "base64", "content": base64.b64encode(blobs[parts[5]]).decode()}
+
+    server = stub_server(handler)
+    source = GitHubTreeSource(GitHubAdapter(use_cache=False), api_url=server.url)
+    cache = BlobCache(":memory:")
+    projects = [{"name": repo} for repo in trees]
+
+    components = ManifestExtractor(source, cache).extract(projects)
+    assert [[c["name"] for c in found] for found in components] == [
+        ["pkg:pypi/flask"], ["pkg:pypi/flask"], ["pkg:pypi/django"]]
+    assert sum("/git/blobs/" in r["path"] for r in server.requests) == 2
+
+    # A later run only lists trees; manifests fetched by GraphQL enrichment need no requests
+    ManifestExtractor(source, cache).extract(projects)
+    enriched = {"name": "org/d", "manifests": [{"path": "go.mod", "oid": "f00", "text": "require a.io/b v1\n"}]}
+    assert ManifestExtractor(source, cache).extract([enriched]) == [[{"name": "pkg:go/a.io/b", "type": "Package"}]]
+    assert sum("/git/blobs/" in r["path"] for r in server.requests) == 2
+    assert len(server.requests) == 8  # 3 + 3 tree listings, 2 blobs
+
+class SlowSource:
+    """One distinct requirements.txt per repo, read slowly, counting reads in flight."""
+    def __init__(self):
+        self.in_flight = self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def list_manifests(self, project):
+        return [{"path": "requirements.txt", "oid": git_blob_sha(project["name"].encode())}]
+
+    def read_blob(self, project, path, oid):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        return project["name"].split("/")[1].encode()
+
+def test_concurrent_extract_calls_share_one_bounded_pool():
+    source = SlowSource()
+    extractor = ManifestExtractor(source, BlobCache(":memory:"), workers=3)
+    chunks = [[{"name": f"org{chunk}/pkg{chunk}-{i}"} for i in range(10)] for chunk in range(4)]
+    results = [None] * len(chunks)
+
+    def run(i):
+        results[i] = extractor.extract(chunks[i])
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(chunks))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results[2][5] == [{"name": "pkg:pypi/pkg2-5", "type": "Package"}]
+    assert extractor.stats["parsed"] == 40 and source.max_in_flight <= 3
+
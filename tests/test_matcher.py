@@ -0,0 +1,33 @@
+import json
+from src.engine import analyzer as analyzer_module
+from src.engine.analyzer import ProjectAnalyzer
+from src.engine.matcher import ComponentMatcher
+
+def names(components):
+    return [c["name"] for c in components]
+
+def test_keywords_match_on_word_boundaries_only():
+    analyzer = ProjectAnalyzer()
+    assert analyzer.extract_components({"description": "A rapid build tool"}) == []
+    assert names(analyzer.extract_components({"description": "Expose a REST api and a web UI"})) == [
+        "REST API", "User Interface"]
+
+def test_topics_and_name_are_matched():
+    analyzer = ProjectAnalyzer()
+    project = {"name": "acme/deploy-cli", "description": "", "topics": ["docker", "rest-api"]}
+    assert names(analyzer.extract_components(project)) == ["REST API", "Command Line Tool", "Containerization"]
+
+def test_keyword_table_loads_from_file(tmp_path):
+    path = tmp_path / "keywords.json"
+    path.write_text(json.dumps({"c++": {"name": "Native Core", "type": "Runtime"}}))
+    matcher = ComponentMatcher.from_file(str(path))
+    assert names(matcher.match({"description": "Written in C++."})) == ["Native Core"]
+
+def test_batch_extraction_matches_sequential_in_process_pool(monkeypatch):
+    monkeypatch.setattr(analyzer_module, "PARALLEL_THRESHOLD", 0)
+    analyzer = ProjectAnalyzer()
+    projects = [{"description": d} for d in ["neo4j api", "docker", "", "oauth dashboard"] * 5]
+
+    batched = analyzer.extract_components_batch(projects, workers=2, chunksize=3)
+
+    assert batched == [analyzer.extract_components(p) for p in projects]
@@ -0,0 +1,115 @@
+import io
+import json
+import threading
+import time
+import pytest
+import wheel_mcp_server
+from src.engine.landscape import LandscapeGraph
+from wheel_mcp_server import MCPDispatcher, RequestCancelled, WheelMCPServer
+
+class SlowServer(WheelMCPServer):
+    """call_tool blocks until its query's gate opens, reporting progress first."""
+
+    def __init__(self):
+        super().__init__()
+        self.gates = {"slow": threading.Event(), "fast": threading.Event()}
+        self.gates["fast"].set()
+
+    def call_tool(self, name, arguments, progress=None, cancelled=None):
+        if progress:
+            progress(1, 2, "search done")
+        self.gates[arguments["query"]].wait(5)
+        if cancelled is not None and cancelled.is_set():
+            raise RequestCancelled(arguments["query"])
+        return {"content": [{"type": "text", "text": arguments["query"]}]}
+
+def call(request_id, query, token=None):
+    params = {"name": "research_landscape", "arguments": {"query": query}}
+    if token:
+        params["_meta"] = {"progressToken": token}
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": params})
+
+def messages(out):
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+def wait_for(out, predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate(messages(out)):
+            return messages(out)
+        time.sleep(0.01)
+    raise AssertionError(out.getvalue())
+
+def test_slow_calls_do_not_block_other_requests():
+    server, out = SlowServer(), io.StringIO()
+    dispatcher = MCPDispatcher(server, out)
+
+    dispatcher.handle_line(call(1, "slow"))
+    dispatcher.handle_line(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/list"}))
+    dispatcher.handle_line(call(3, "fast"))
+    wait_for(out, lambda ms: {m.get("id") for m in ms} == {2, 3})
+
+    server.gates["slow"].set()
+    dispatcher.close()
+    assert [m["id"] for m in messages(out)] == [2, 3, 1]
+
+def test_cancelled_request_gets_no_reply_and_progress_is_reported():
+    server, out = SlowServer(), io.StringIO()
+    dispatcher = MCPDispatcher(server, out)
+
+    dispatcher.handle_line(call("a", "slow", token="tok"))
+    wait_for(out, lambda ms: any(m.get("method") == "notifications/progress" for m in ms))
+    dispatcher.handle_line(json.dumps({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": "a"}}))
+    server.gates["slow"].set()
+    dispatcher.close()
+
+    (notification,) = messages(out)
+    assert notification["params"] == {"progressToken": "tok", "progress": 1, "total": 2, "message": "search done"}
+
+def test_research_checks_for_cancellation_between_stages(monkeypatch):
+    cancelled = threading.Event()
+
+    def fake_research(query, limit, progress, **kwargs):
+        progress("search", {"status": "done"})
+        cancelled.set()
+        progress("analyze", {"status": "done"})
+        return LandscapeGraph()
+
+    monkeypatch.setattr(wheel_mcp_server, "run_research", fake_research)
+    steps = []
+    with pytest.raises(RequestCancelled):
+        WheelMCPServer().call_tool("research_landscape", {"query": "q"}, progress=lambda *a: steps.append(a), cancelled=cancelled)
+    assert steps == [(1, 5, "search done")]
+
+def test_repeated_query_is_served_from_the_session_cache(monkeypatch):
+    runs = []
+
+    def fake_research(query, limit, progress, export=True):
+        runs.append((query, limit, export))
+        graph = LandscapeGraph()
+        graph.add_project({"name": "a/x", "url": "u", "components": []})
+        return graph
+
+    monkeypatch.setattr(wheel_mcp_server, "run_research", fake_research)
+    server = WheelMCPServer()
+    first = server.call_tool("research_landscape", {"query": "Rockets", "limit": 3})
+    second = server.call_tool("research_landscape", {"query": " rockets", "limit": 3})
+    server.call_tool("research_landscape", {"query": "rockets", "limit": 4})
+
+    assert "a/x" in first["content"][0]["text"] and "a/x" in second["content"][0]["text"]
+    assert runs == [("Rockets", 3, False), ("rockets", 4, False)]
+
+def test_malformed_requests_get_errors_instead_of_stopping_the_server():
+    out = io.StringIO()
+    dispatcher = MCPDispatcher(WheelMCPServer(), out)
+
+    dispatcher.handle_line("[1, 2]")
+    dispatcher.handle_line('"x"')
+    dispatcher.handle_line(json.dumps({"jsonrpc": "2.0", "id": 7, "method": "initialize", "params": ["bad"]}))
+    dispatcher.handle_line(json.dumps({"jsonrpc": "2.0", "id": 8, "method": "tools/list"}))
+    dispatcher.close()
+
+    replies = messages(out)
+    assert [m["error"]["code"] for m in replies[:2]] == [-32600, -32600]
+    assert replies[2]["id"] == 7 and replies[2]["error"]["code"] == -32603
+    assert replies[3]["id"] == 8 and "tools" in replies[3]["result"]
@@ -0,0 +1,139 @@
+import random
+import pytest
+from src.data.connection import db
+from src.data.exporter import export_landscape_streaming
+from src.data.memory_graph import MemoryGraph, MemorySession
+from src.data.writer import REFRESH_PROJECT_TOPICS, UPSERT_PROJECTS_QUERY, GraphWriter
+from src.engine.strategy import StrategyAdvisor
+from src.main import link_components_to_project
+
+@pytest.fixture
+def graph(monkeypatch):
+    graph = MemoryGraph()
+    monkeypatch.setattr(db, "mock_mode", True)
+    monkeypatch.setattr(db, "mock_graph", graph)
+    return graph
+
+def test_merge_semantics_deduplicate_nodes_and_links(graph, project):
+    writer = GraphWriter()
+    writer.write_projects([project("a/x", ["web"], ["REST API"]), project("a/y", ["web"], ["REST API"])])
+    writer.write_projects([project("a/x", ["web"], ["REST API"])])
+
+    labels = sorted(n["label"] for n in graph.nodes.values())
+    assert labels == ["Author", "Component", "Project", "Project", "Topic"]
+    assert len(graph.rels) == 6  # 2x CREATED, 2x TAGGED_WITH, 2x USES
+    component = graph.find_node("Component", "REST API")
+    assert len(graph.neighbors("USES", component, incoming=True)) == 2
+
+def test_blue_oceans_are_computed_from_the_graph(graph, project):
+    GraphWriter().write_projects([
+        project("a/1", ["web", "ml"], ["REST API"]),
+        project("b/2", ["web"], ["REST API", "Database Layer"]),
+        project("c/3", ["ml"], []),
+        project("d/4", ["ml"], []),
+    ])
+    oceans = StrategyAdvisor().identify_blue_oceans()
+    assert [(o["topic"], o["project_count"], o["component_count"]) for o in oceans] == [("ml", 3, 1), ("web", 2, 2)]
+    assert oceans[0]["blue_ocean_score"] == 1.5
+
+def test_topic_stats_follow_later_writes_and_match_a_rebuild(graph, project):
+    writer = GraphWriter()
+    writer.write_projects([project("a/1", ["web"], []), project("b/2", ["web", "ml"], [])])
+    advisor = StrategyAdvisor()
+    assert advisor.identify_blue_oceans() == [
+        {"topic": "web", "project_count": 2, "component_count": 0, "blue_ocean_score": 2.0}
+    ]
+
+    # New components on an existing project re-rank the topics it carries
+    link_components_to_project({"url": "https://github.com/b/2", "components": [{"name": "Auth", "type": "Lib"}]})
+    assert advisor.identify_blue_oceans(k=1, min_projects=1)[0] == {
+        "topic": "web", "project_count": 2, "component_count": 1, "blue_ocean_score": 1.0,
+    }
+    incremental = advisor.identify_blue_oceans(k=10, min_projects=1)
+    assert [o["topic"] for o in incremental] == ["web", "ml"]
+
+    assert advisor.refresh_topic_stats() == 2
+    assert advisor.identify_blue_oceans(k=10, min_projects=1) == incremental
+
+def test_incremental_topic_stats_never_scan_a_topic(graph, monkeypatch, project):
+    rng = random.Random(3)
+    writer = GraphWriter(batch_size=7)
+    for batch in range(5):
+        writer.write_projects([
+            project(f"o/{rng.randrange(40)}", rng.sample(["web", "ml", "cli", "db"], rng.randrange(3)),
+                    rng.sample(["REST API", "Auth", "ORM", "Queue", "Cache"], rng.randrange(4)))
+            for _ in range(15)
+        ])
+        link_components_to_project({"url": f"https://github.com/o/{batch}", "components": [{"name": "Auth", "type": "Lib"}]})
+
+    # Writes never list a topic's projects: cost follows the written projects only
+    neighbors = graph.neighbors
+    def guarded(rel_type, node_id, incoming=False):
+        assert not (rel_type == "TAGGED_WITH" and incoming), "topic scanned"
+        return neighbors(rel_type, node_id, incoming)
+    monkeypatch.setattr(graph, "neighbors", guarded)
+    writer.write_projects([project("o/1", ["web", "new"], ["Queue", "Search"])])
+    monkeypatch.setattr(graph, "neighbors", neighbors)
+
+    advisor = StrategyAdvisor()
+    incremental = advisor.identify_blue_oceans(k=10, min_projects=1)
+    advisor.refresh_topic_stats()
+    assert advisor.identify_blue_oceans(k=10, min_projects=1) == incremental
+
+def test_writer_queries_only_expand_written_projects():
+    assert "(t)<-[:TAGGED_WITH]" not in UPSERT_PROJECTS_QUERY + REFRESH_PROJECT_TOPICS
+
+def test_export_streams_the_memory_graph(graph, tmp_path, project):
+    GraphWriter().write_projects([project(f"o/{i}", [], ["REST API"]) for i in range(10)])
+    stats = export_landscape_streaming(str(tmp_path / "data.json"), fetch_size=4)
+    assert stats == dict(stats, nodes=12, links=20)
+
+class CountingDict(dict):
+    def __init__(self, items):
+        super().__init__(items)
+        self.reads = 0
+
+    def __getitem__(self, key):
+        self.reads += 1
+        return super().__getitem__(key)
+
+def test_changes_since_read_only_the_changed_tail():
+    graph = MemoryGraph()
+    graph.op_upsert_projects(rows(2000))
+    since = graph.stamp() + 1
+    graph.op_upsert_projects([dict(rows(1)[0], stars=5), {"url": "new", "name": "new", "topics": ["t1"]}])
+
+    graph.nodes, graph.rels = CountingDict(graph.nodes), CountingDict(graph.rels)
+    assert [n["url"] for n in graph.op_nodes_since("Project", since)] == ["u0", "new"]
+    assert len(graph.op_links_since("TAGGED_WITH", since)) == 1
+    assert graph.op_nodes_since("Topic", since) == []
+    assert graph.nodes.reads == 2 and graph.rels.reads == 1
+
+def test_unknown_queries_are_rejected():
+    with pytest.raises(ValueError, match="// @op <name>"):
+        MemorySession(MemoryGraph()).run("MATCH (n) RETURN n")
+    with pytest.raises(ValueError, match="// @op frobnicate"):
+        MemorySession(MemoryGraph()).run("// @op frobnicate\nMATCH (n) RETURN n")
+
+def rows(n):
+    return [{"url": f"u{i}", "name": f"p{i}", "author": f"a{i % 100}", "topics": [f"t{i % 50}"],
+             "components": [{"name": f"c{i % 200}", "type": "Lib"}]} for i in range(n)]
+
+def test_upserts_scale_linearly(growth_ratio):
+    def prepare(n):
+        graph, batch = MemoryGraph(), rows(n)
+        return lambda: graph.op_upsert_projects(batch)
+    # 4x the rows: about 4x the time when linear, 16x when quadratic
+    assert growth_ratio(prepare, 2500, 10000) < 8
+
+    graph = MemoryGraph()
+    graph.op_upsert_projects(rows(20000))
+    assert len(graph.label_ids("Project")) == 20000
+    assert len(graph.neighbors("TAGGED_WITH", graph.find_node("Topic", "t7"), incoming=True)) == 400
+
+def test_scoped_writes_stay_out_of_the_shared_graph(graph, project):
+    with db.scope():
+        GraphWriter().write_projects([project("a/x", ["web"], ["REST API"])])
+        with db.get_session() as session:
+            assert len(session.storage["nodes"]) == 4
+    assert graph.stats() == {"nodes": 0, "links": 0}
@@ -0,0 +1,78 @@
+import time
+from datetime import date
+from src.engine.github_adapter import GitHubAdapter, star_slices, date_slices
+
+def repo(i):
+    return {"full_name": f"org/repo-{i}", "html_url": f"https://github.com/org/repo-{i}",
+            "description": "demo", "stargazers_count": i, "owner": {"login": "org"},
+            "language": "Go", "topics": []}
+
+def paged_handler(total):
+    def handler(request):
+        page, per_page = int(request["query"]["page"]), int(request["query"]["per_page"])
+        start = (page - 1) * per_page
+        items = [repo(i) for i in range(start, min(start + per_page, total))]
+        return 200, {}, {"total_count": total, "items": items}
+    return handler
+
+def test_search_pages_streams_every_page(stub_server):
+    server = stub_server(paged_handler(250))
+    adapter = GitHubAdapter(use_cache=False, base_url=server.url, max_workers=3)
+
+    projects = list(adapter.search_pages("demo"))
+
+    assert len({p["url"] for p in projects}) == 250
+    assert sorted(int(r["query"]["page"]) for r in server.requests) == [1, 2, 3]
+
+def test_search_pages_keep_page_order_and_report_missing_pages(stub_server, capsys):
+    pages = paged_handler(450)
+
+    def handler(request):
+        page = int(request["query"]["page"])
+        if page == 2:
+            time.sleep(0.2)  # page 3 lands first
+        if page == 4:
+            return 422, {}, {"message": "unprocessable"}
+        return pages(request)
+
+    server = stub_server(handler)
+    adapter = GitHubAdapter(use_cache=False, base_url=server.url, max_workers=4)
+
+    projects = list(adapter.search_pages("demo"))
+
+    assert [p["url"] for p in projects] == [f"https://github.com/org/repo-{i}" for i in [*range(300), *range(400, 450)]]
+    assert "page 4 of 5" in capsys.readouterr().out
+
+def test_search_pages_respects_result_ceiling(stub_server):
+    server = stub_server(paged_handler(5000))
+    adapter = GitHubAdapter(use_cache=False, base_url=server.url)
+
+    projects = list(adapter.search_pages("demo", max_results=5000))
+
+    assert len(projects) == 1000
+    assert max(int(r["query"]["page"]) for r in server.requests) == 10
+
+def test_search_pages_with_no_results_wanted_sends_nothing(stub_server):
+    server = stub_server(paged_handler(300))
+    adapter = GitHubAdapter(use_cache=False, base_url=server.url)
+    assert list(adapter.search_pages("demo", max_results=0)) == []
+    assert server.requests == []
+
+def test_search_with_large_limit_paginates(stub_server):
+    server = stub_server(paged_handler(300))
+    adapter = GitHubAdapter(use_cache=False, base_url=server.url)
+    assert len(adapter.search("demo", {"limit": 150})) == 150
+
+def test_search_slices_adds_range_qualifiers(stub_server):
+    server = stub_server(paged_handler(3))
+    adapter = GitHubAdapter(use_cache=False, base_url=server.url)
+
+    projects = list(adapter.search_slices("demo", {"language": "go"}, "stars", star_slices([0, 100])))
+
+    assert [r["query"]["q"] for r in server.requests] == [
+        "demo language:go stars:0..99", "demo language:go stars:>=100"]
+    assert len(projects) == 3  # duplicates across slices are dropped
+
+def test_date_slices_cover_range_without_overlap():
+    assert date_slices(date(2024, 1, 1), date(2024, 1, 10), 4) == [
+        "2024-01-01..2024-01-04", "2024-01-05..2024-01-08", "2024-01-09..2024-01-10"]
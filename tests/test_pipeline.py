@@ -0,0 +1,78 @@
+import time
+import pytest
+from src.engine.pipeline import ResearchPipeline
+
+class SlowGitHub:
+    def __init__(self, count, delay, events=None):
+        self.count, self.delay = count, delay
+        self.events = events if events is not None else []
+        self.fetched = 0
+
+    def search_pages(self, query, filters=None, max_results=1000):
+        for i in range(min(self.count, max_results)):
+            time.sleep(self.delay)
+            self.fetched += 1
+            self.events.append("fetch")
+            yield {"name": f"o/{i}", "url": f"https://github.com/o/{i}"}
+
+class SlowAnalyzer:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def extract_components_batch(self, projects, workers=None):
+        time.sleep(self.delay * len(projects))
+        return [[{"name": "REST API", "type": "Interface"}] for _ in projects]
+
+class SlowWriter:
+    def __init__(self, batch_size, delay, events=None):
+        self.batch_size, self.delay = batch_size, delay
+        self.events = events if events is not None else []
+        self.batches = []
+
+    def write_projects(self, projects):
+        time.sleep(self.delay * len(projects))
+        self.events.append("write")
+        self.batches.append([p["name"] for p in projects])
+
+def test_stages_overlap_and_results_keep_search_order():
+    events = []
+    writer = SlowWriter(batch_size=10, delay=0.001, events=events)
+    pipeline = ResearchPipeline(SlowGitHub(200, 0.001, events), SlowAnalyzer(0.002), writer,
+                                extract_workers=2, chunk_size=5, queue_size=2)
+
+    projects, stats = pipeline.run("q", limit=200)
+
+    assert [p["name"] for p in projects] == [f"o/{i}" for i in range(200)]
+    assert all(p["components"][0]["name"] == "REST API" for p in projects)
+    assert sorted(name for batch in writer.batches for name in batch) == sorted(p["name"] for p in projects)
+    assert all(len(batch) <= 10 for batch in writer.batches)
+    # The bounded queues hold far fewer than 200 projects, so writing starts long before
+    # the search ends: stages overlap instead of running one after another
+    last_fetch = len(events) - 1 - events[::-1].index("fetch")
+    assert events.index("write") < last_fetch
+    assert stats["stages"]["extract"]["items"] == 200
+
+def test_progress_reports_each_stage():
+    events = []
+    pipeline = ResearchPipeline(SlowGitHub(3, 0), SlowAnalyzer(0), SlowWriter(500, 0))
+    pipeline.run("q", limit=3, progress=lambda stage, info: events.append((stage, info["status"])))
+
+    assert ("search", "done") in events and ("analyze", "done") in events
+    assert events[-1] == ("persist", "done")
+
+def test_error_in_any_stage_stops_the_pipeline():
+    class Cancelled(Exception):
+        pass
+
+    def progress(stage, info):
+        if stage == "persist":
+            raise Cancelled()
+
+    github = SlowGitHub(1000, 0.001)
+    writer = SlowWriter(batch_size=5, delay=0)
+    pipeline = ResearchPipeline(github, SlowAnalyzer(0), writer, chunk_size=5, queue_size=1)
+    with pytest.raises(Cancelled):
+        pipeline.run("q", limit=1000, progress=progress)
+    # Upstream stages stop too instead of searching on
+    assert github.fetched < 100
+    assert len(writer.batches) == 1
@@ -0,0 +1,62 @@
+from src.engine.github_adapter import GitHubAdapter
+from src.engine.rate_limit import TokenPool
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+    def time(self):
+        return self.now
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+def headers(remaining, reset, resource="search"):
+    return {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Limit": "30", "X-RateLimit-Resource": resource}
+
+def test_pool_prefers_token_with_most_remaining_budget():
+    clock = FakeClock()
+    pool = TokenPool(["aaaa", "bbbb"], clock=clock.time, sleep=clock.sleep)
+    pool.record("aaaa", "search", 200, headers(2, 1060))
+    pool.record("bbbb", "search", 200, headers(20, 1060))
+    assert pool.acquire("search") == "bbbb"
+
+def test_search_and_core_budgets_are_separate():
+    clock = FakeClock()
+    pool = TokenPool(["aaaa"], clock=clock.time, sleep=clock.sleep)
+    pool.record("aaaa", "search", 200, headers(0, 1060))
+    assert pool.acquire("core") == "aaaa"
+    assert clock.slept == []
+    assert pool.budget()["headroom"] == {"search": 0}
+
+def test_exhausted_pool_sleeps_until_earliest_reset():
+    clock = FakeClock()
+    pool = TokenPool(["aaaa", "bbbb"], clock=clock.time, sleep=clock.sleep)
+    pool.record("aaaa", "search", 403, headers(0, 1050))
+    pool.record("bbbb", "search", 403, headers(0, 1020))
+    assert pool.acquire("search") == "bbbb"
+    assert clock.slept == [20.0]
+
+def test_secondary_limit_backs_off_with_jitter():
+    clock = FakeClock()
+    pool = TokenPool(["aaaa"], base_backoff=4, clock=clock.time, sleep=clock.sleep)
+    assert pool.record("aaaa", "core", 403, {}) is True
+    pool.acquire("core")
+    assert 2 <= clock.slept[0] <= 6
+
+def test_adapter_retries_rate_limited_request_on_next_token(stub_server):
+    def handler(request):
+        if request["headers"].get("Authorization") == "token aaaa":
+            return 403, headers(0, 4000000000), {"message": "rate limited"}
+        return 200, headers(29, 4000000000), {"total_count": 1, "items": [
+            {"full_name": "a/b", "html_url": "https://github.com/a/b", "owner": {"login": "a"}}]}
+
+    server = stub_server(handler)
+    adapter = GitHubAdapter(api_tokens=["aaaa", "bbbb"], use_cache=False, base_url=server.url)
+
+    assert [p["name"] for p in adapter.search("demo")] == ["a/b"]
+    budget = adapter.token_pool.budget()
+    assert budget["headroom"] == {"search": 29}
+    assert [t["token"] for t in budget["tokens"]] == [0, 1]
+    assert "aaaa" not in repr(budget) and "bbbb" not in repr(budget)
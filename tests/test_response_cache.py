@@ -0,0 +1,61 @@
+import time
+from src.engine.cache import ResponseCache
+from src.engine.github_adapter import GitHubAdapter
+from src.engine.search_index import LocalSearchIndex
+
+REPO = {"full_name": "acme/rocket", "html_url": "https://github.com/acme/rocket", "description": "Rockets",
+        "stargazers_count": 42, "owner": {"login": "acme"}, "language": "Python", "topics": ["space"]}
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite"), max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    time.sleep(0.01)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a")["value"] == 1 and cache.get("c")["value"] == 3
+
+def test_stale_entry_is_revalidated_with_etag(tmp_path, stub_server):
+    def handler(request):
+        if request["headers"].get("If-None-Match") == '"v1"':
+            return 304, {}, b""
+        return 200, {"ETag": '"v1"'}, {"items": [REPO]}
+
+    server = stub_server(handler)
+    cache = ResponseCache(str(tmp_path / "c.sqlite"), ttl=0)
+    adapter = GitHubAdapter(cache=cache, base_url=server.url + "/search/repositories",
+                            search_index=LocalSearchIndex(":memory:", seed_demo=False))
+
+    first = adapter.search("Rockets", {"language": "python"})
+    second = adapter.search("  rockets ", {"language": "Python"})
+
+    assert first == second and first[0]["name"] == "acme/rocket"
+    assert [r["headers"].get("If-None-Match") for r in server.requests] == [None, '"v1"']
+
+def test_fresh_entry_skips_network(tmp_path, stub_server):
+    server = stub_server(lambda request: (200, {}, {"items": [REPO]}))
+    adapter = GitHubAdapter(cache=ResponseCache(str(tmp_path / "c.sqlite")), base_url=server.url,
+                            search_index=LocalSearchIndex(":memory:", seed_demo=False))
+    adapter.search("rockets")
+    adapter.search("rockets")
+    assert len(server.requests) == 1
+
+def test_rate_limited_search_serves_last_good_response(tmp_path, stub_server):
+    responses = iter([(200, {}, {"items": [REPO]}), (403, {}, {"message": "rate limited"})])
+    server = stub_server(lambda request: next(responses))
+    adapter = GitHubAdapter(cache=ResponseCache(str(tmp_path / "c.sqlite"), ttl=0), base_url=server.url,
+                            search_index=LocalSearchIndex(":memory:", seed_demo=False))
+
+    adapter.search("rockets")
+    fallback = adapter.search("rockets")
+
+    assert [p["name"] for p in fallback] == ["acme/rocket"]
+
+def test_injected_cache_keeps_its_index_beside_it(tmp_path, stub_server):
+    server = stub_server(lambda request: (200, {}, {"items": [REPO]}))
+    adapter = GitHubAdapter(cache=ResponseCache(str(tmp_path / "c.sqlite")), base_url=server.url)
+    adapter.search("rockets")
+
+    assert adapter.search_index.path == str(tmp_path / "search_index.sqlite")
+    assert "acme/rocket" in [p["name"] for p in adapter.search_index.search("rockets")]
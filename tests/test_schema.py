@@ -0,0 +1,35 @@
+import pytest
+from src.data.schema import SchemaError, load_statements, required_names, verify_schema
+
+def test_schema_file_covers_every_merge_key():
+    statements = load_statements()
+    assert all(not s.startswith("//") for s in statements)
+    assert all("IF NOT EXISTS" in s or "IF EXISTS" in s for s in statements)
+    text = "\n".join(statements)
+    for key in ["(p:Project) REQUIRE p.url", "(a:Author) REQUIRE a.username",
+                "(t:Topic) REQUIRE t.name", "(c:Component) REQUIRE c.name"]:
+        assert key in text
+
+def status(state="ONLINE"):
+    return {
+        "constraints": {"project_url_unique": {}},
+        "indexes": {
+            "project_url_unique": {"state": state, "owning_constraint": "project_url_unique"},
+            "project_name_index": {"state": "ONLINE", "owning_constraint": None},
+        },
+    }
+
+def test_verify_schema_accepts_online_schema():
+    verify_schema(status(), {"constraints": ["project_url_unique"], "indexes": ["project_name_index"]})
+
+def test_verify_schema_fails_fast_on_missing_or_offline_indexes():
+    required = {"constraints": ["project_url_unique"], "indexes": ["project_name_index", "topic_updated_at_index"]}
+    with pytest.raises(SchemaError, match="missing index topic_updated_at_index"):
+        verify_schema(status(), required)
+    with pytest.raises(SchemaError, match="project_url_unique is POPULATING"):
+        verify_schema(status("POPULATING"), {"constraints": ["project_url_unique"], "indexes": []})
+
+def test_required_names_come_from_create_statements():
+    names = required_names(["DROP CONSTRAINT old IF EXISTS", "CREATE CONSTRAINT a IF NOT EXISTS FOR (n:X) REQUIRE n.k IS UNIQUE",
+                            "CREATE INDEX b IF NOT EXISTS FOR (n:X) ON (n.p)"])
+    assert names == {"constraints": ["a"], "indexes": ["b"]}
@@ -0,0 +1,104 @@
+import time
+import pytest
+from datetime import date
+from src.engine.cache import ResponseCache
+from src.engine.github_adapter import GitHubAdapter
+from src.engine.search_index import LocalSearchIndex, date_conditions, parse_query, parse_range
+
+def repo(name, stars, description="", language="python", topics=(), pushed_at=None):
+    return {"name": name, "url": f"https://github.com/{name}", "description": description, "stars": stars,
+            "author": name.split("/")[0], "language": language, "topics": list(topics), "pushed_at": pushed_at}
+
+REPOS = [
+    repo("a/django", 76000, "The web framework for perfectionists", topics=["web", "django"], pushed_at="2024-05-02T10:00:00Z"),
+    repo("b/flask", 65000, "Lightweight WSGI web application framework", topics=["web", "flask"], pushed_at="2024-01-31T23:59:00Z"),
+    repo("c/gin", 75000, "HTTP web framework written in Go", language="go", topics=["web"], pushed_at="2023-06-01T00:00:00Z"),
+    repo("d/torch", 78000, "Tensors and neural networks", topics=["machine-learning"], pushed_at="2024-06-01T00:00:00Z"),
+    repo("e/tiny", 12, "A tiny web framework", topics=["web"]),
+]
+
+def index_with(repos):
+    index = LocalSearchIndex(":memory:", seed_demo=False)
+    index.add_projects(repos)
+    return index
+
+def names(results):
+    return [r["name"] for r in results]
+
+def test_qualifier_parsing():
+    assert parse_range(">=10") == [(">=", "10")]
+    assert parse_range("10..100") == [(">=", "10"), ("<=", "100")]
+    assert parse_range("*..100") == [("<=", "100")]
+    assert parse_range("100+") == [(">=", "100")] and parse_range("42") == [("=", "42")]
+    assert date_conditions("<=2024-01-31") == [("<", "2024-02-01")]
+    assert date_conditions(">=week", today=date(2024, 3, 8)) == [(">=", "2024-03-01")]
+    assert parse_query("web frameworks language:go stars:>10", {"stars": "10..100"}) == (
+        ["web", "framework"], {"language": "go", "stars": "10..100"})
+
+def test_terms_must_all_match_and_results_rank_by_stars():
+    index = index_with(REPOS)
+    assert names(index.search("web frameworks")) == ["a/django", "c/gin", "b/flask", "e/tiny"]
+    assert names(index.search("WSGI web")) == ["b/flask"]
+    assert names(index.search("flask")) == ["b/flask"]
+    assert index.search("web", limit=2) == index.search("web")[:2]
+    assert index.search("cobol") == []
+
+def test_qualifiers_filter_on_indexed_columns():
+    index = index_with(REPOS)
+    assert names(index.search("web language:go")) == ["c/gin"]
+    assert names(index.search("web", {"stars": "10..70000"})) == ["b/flask", "e/tiny"]
+    assert names(index.search("web", {"stars": ">=70000"})) == ["a/django", "c/gin"]
+    assert names(index.search("", {"topic": "machine-learning"})) == ["d/torch"]
+    # A day bound covers the whole day
+    assert names(index.search("web pushed:2024-01-01..2024-01-31")) == ["b/flask"]
+    assert names(index.search("web", {"pushed": ">2024-01-31"})) == ["a/django"]
+
+def test_malformed_qualifiers_are_ignored():
+    index = index_with(REPOS)
+    everything = names(index.search("web framework"))
+    assert names(index.search("web framework stars:>1k")) == everything
+    assert names(index.search("web framework pushed:>2024")) == everything
+    assert names(index.search("web framework", {"created": ">=2024-01"})) == everything
+    # Well-formed qualifiers still apply alongside a malformed one
+    assert names(index.search("web framework language:go stars:lots")) == ["c/gin"]
+
+def test_reindexing_replaces_tokens():
+    index = index_with(REPOS)
+    index.add_projects([repo("b/flask", 66000, "Async microframework", topics=["async"])])
+    assert names(index.search("wsgi")) == []
+    assert index.search("microframework")[0]["stars"] == 66000
+    assert index.count() == 5
+
+def test_adapter_indexes_live_results_and_falls_back_to_them(stub_server, tmp_path):
+    items = [{"full_name": "org/orm", "html_url": "https://github.com/org/orm", "description": "A database ORM",
+              "stargazers_count": 10, "owner": {"login": "org"}, "language": "Go", "topics": ["database"],
+              "pushed_at": "2024-02-02T00:00:00Z"}]
+    server = stub_server(lambda request: (200, {}, {"total_count": 1, "items": items}))
+    index = LocalSearchIndex(":memory:", seed_demo=False)
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    GitHubAdapter(cache=cache, base_url=server.url, search_index=index).search("orm")
+    assert names(index.search("database orm")) == ["org/orm"]
+
+    # Responses cached before the index existed are backfilled once
+    fresh = LocalSearchIndex(":memory:", seed_demo=False)
+    GitHubAdapter(cache=cache, base_url=server.url, search_index=fresh)
+    assert names(fresh.search("orm")) == ["org/orm"]
+
+    offline = GitHubAdapter(use_cache=False, base_url="http://127.0.0.1:9", search_index=index, max_attempts=1)
+    results = offline.search("orm", {"language": "go", "pushed": ">=2024-01-01", "limit": 5})
+    assert names(results) == ["org/orm"] and results[0]["pushed_at"] == "2024-02-02T00:00:00Z"
+
+@pytest.mark.benchmark
+def test_queries_answer_in_milliseconds():
+    words = ["web", "api", "orm", "cli", "graph", "queue", "cache", "auth"]
+    index = index_with(
+        repo(f"o/r{i}", i, f"{words[i % 8]} {words[(i // 8) % 8]} tool", language=["go", "python"][i % 2],
+             topics=[words[(i // 64) % 8]], pushed_at=f"2024-{i % 12 + 1:02d}-01T00:00:00Z")
+        for i in range(20000)
+    )
+    start = time.perf_counter()
+    for _ in range(10):
+        results = index.search("web orm language:go stars:>100", {"limit": 10})
+    assert (time.perf_counter() - start) / 10 < 0.05
+    assert results and all(r["language"] == "go" and r["stars"] > 100 for r in results)
+    assert [r["stars"] for r in results] == sorted((r["stars"] for r in results), reverse=True)
@@ -0,0 +1,82 @@
+import time
+import numpy as np
+import pytest
+from src.engine.similarity import SimilarityIndex, project_tokens
+
+def project(name, description, topics=(), components=(), language="Python"):
+    return {"name": name, "url": f"https://github.com/{name}", "description": description, "language": language,
+            "topics": list(topics), "components": [{"name": c, "type": "Lib"} for c in components]}
+
+PROJECTS = [
+    project("a/flask", "lightweight wsgi web application micro framework",
+            ["web", "wsgi", "http"], ["REST API", "Routing", "Templates"]),
+    project("b/bottle", "lightweight wsgi micro web application framework single file",
+            ["web", "wsgi", "http"], ["REST API", "Routing", "Templates"]),
+    project("c/torch", "tensors and dynamic neural networks with gpu acceleration",
+            ["deep-learning", "gpu"], ["CUDA", "Autograd"], "C++"),
+]
+
+def test_tokens_are_namespaced():
+    tokens = project_tokens(PROJECTS[0])
+    assert {"wsgi", "topic:web", "component:rest api", "language:python"} <= tokens
+    assert "the" not in tokens and "framework" not in tokens
+
+def test_similar_projects_rank_by_estimated_jaccard(tmp_path):
+    index = SimilarityIndex(str(tmp_path / "similarity.sqlite"))
+    assert index.add_projects(PROJECTS) == 3
+
+    similar = index.similar("a/flask", k=5)
+    assert [s["name"] for s in similar] == ["b/bottle"]
+    assert similar[0]["similarity"] > 0.5
+    assert index.similar("https://github.com/a/flask")[0]["url"] == "https://github.com/b/bottle"
+    assert index.similar("unknown/repo") == []
+
+    ad_hoc = index.similar_to(project("x/new", "tiny wsgi web framework", ["web", "wsgi"], ["Routing"]))
+    assert {s["name"] for s in ad_hoc} <= {"a/flask", "b/bottle"} and ad_hoc
+
+def test_index_persists_and_updates_in_place(tmp_path):
+    path = str(tmp_path / "similarity.sqlite")
+    SimilarityIndex(path).add_projects(PROJECTS)
+
+    # Re-adding a project replaces its signature and buckets
+    index = SimilarityIndex(path)
+    index.add_projects([project("b/bottle", "tensors and dynamic neural networks with gpu acceleration",
+                                ["deep-learning", "gpu"], ["CUDA", "Autograd"], "C++")])
+    assert index.stats()["projects"] == 3
+    assert index.similar("c/torch")[0]["name"] == "b/bottle"
+    assert index.similar("a/flask") == []
+
+def test_candidates_sharing_most_bands_are_kept():
+    index = SimilarityIndex(":memory:", max_candidates=5)
+    shared = " ".join(f"word{i}" for i in range(20))
+    # Many half-similar projects fill the target's buckets before its near-duplicate arrives
+    index.add_projects(project(f"o/filler{i}", shared + " " + " ".join(f"f{i}x{j}" for j in range(14)), language="")
+                       for i in range(200))
+    index.add_projects([project("o/target", shared + " alpha bravo", language=""),
+                        project("o/twin", shared + " alpha charlie", language="")])
+
+    assert index.similar("o/target", k=1)[0]["name"] == "o/twin"
+
+def test_signature_estimates_jaccard():
+    index = SimilarityIndex(":memory:", bands=64, rows=4)
+    left = {f"t{i}" for i in range(100)}
+    right = {f"t{i}" for i in range(50, 150)}  # Jaccard 1/3
+    estimate = (index.signature(left) == index.signature(right)).mean()
+    assert abs(estimate - 1 / 3) < 0.08
+
+@pytest.mark.benchmark
+def test_queries_only_read_candidate_buckets():
+    rng = np.random.default_rng(3)
+    index = SimilarityIndex(":memory:")
+    index.add_projects(
+        {"name": f"o/{i}", "url": f"u{i}", "description": " ".join(f"word{w}" for w in words)}
+        for i, words in enumerate(rng.integers(0, 5000, (5000, 12)))
+    )
+    index.add_projects([project("o/target", "alpha bravo charlie delta echo foxtrot golf hotel"),
+                        project("o/twin", "alpha bravo charlie delta echo foxtrot golf india")])
+
+    start = time.perf_counter()
+    for _ in range(20):
+        similar = index.similar("o/target", k=3)
+    assert time.perf_counter() - start < 1.0
+    assert similar[0]["name"] == "o/twin"
@@ -0,0 +1,78 @@
+import threading
+import time
+import pytest
+from src.engine.single_flight import Overloaded, SingleFlight
+
+def test_concurrent_identical_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return {"nodes": [1]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("web", fetch))) for _ in range(20)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"nodes": [1]}] * 20
+    assert flights.stats["shared"] == 19
+
+def test_results_expire_after_ttl():
+    flights = SingleFlight(ttl=0.05)
+    counter = iter(range(10))
+    assert flights.do("q", lambda: next(counter)) == 0
+    assert flights.do("q", lambda: next(counter)) == 0
+    time.sleep(0.06)
+    assert flights.do("q", lambda: next(counter)) == 1
+
+def test_errors_are_not_cached():
+    flights = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flights.do("q", lambda: (_ for _ in ()).throw(RuntimeError("upstream down")))
+    assert flights.do("q", lambda: "ok") == "ok"
+
+def test_concurrency_is_bounded():
+    flights = SingleFlight(max_concurrency=1, acquire_timeout=0.05)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(2)
+        return "slow"
+
+    worker = threading.Thread(target=lambda: flights.do("a", slow))
+    worker.start()
+    started.wait(1)
+    with pytest.raises(Overloaded):
+        flights.do("b", lambda: "fast")
+    release.set()
+    worker.join()
+
+def test_followers_stop_waiting_on_a_hung_leader():
+    flights = SingleFlight(wait_timeout=0.05)
+    started = threading.Event()
+    release = threading.Event()
+
+    def hung():
+        started.set()
+        release.wait(2)
+        return "late"
+
+    leader = threading.Thread(target=lambda: flights.do("q", hung))
+    leader.start()
+    started.wait(1)
+    with pytest.raises(Overloaded):
+        flights.do("q", lambda: "never runs")
+    release.set()
+    leader.join()
+    assert flights.stats == {"hits": 0, "shared": 1, "executions": 1, "rejected": 1}
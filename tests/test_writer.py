@@ -0,0 +1,37 @@
+from src.data import writer
+from src.data.writer import GraphWriter, UPSERT_PROJECTS_QUERY
+
+class RecordingSession:
+    def __init__(self):
+        self.calls = []
+    def __enter__(self): return self
+    def __exit__(self, exc_type, exc_val, exc_tb): pass
+    def run(self, query, **kwargs):
+        self.calls.append((query, kwargs))
+
+def test_projects_are_written_in_unwind_batches(monkeypatch, project):
+    """100 projects at batch size 40 cost three round trips, not 200."""
+    session = RecordingSession()
+    monkeypatch.setattr(writer.db, "get_session", lambda: session)
+
+    rest_api = {"name": "REST API", "type": "Interface"}
+    projects = [project(f"owner/repo-{i}", ["web"], [rest_api], stars=i, description="demo") for i in range(100)]
+    stats = GraphWriter(batch_size=40).write_projects(projects)
+
+    assert [len(kw["rows"]) for _, kw in session.calls] == [40, 40, 20]
+    assert all(q == UPSERT_PROJECTS_QUERY for q, _ in session.calls)
+    assert stats["rows"] == 100 and stats["batches"] == 3
+    assert stats["rows_per_second"] > 0
+
+def test_rows_carry_defaults_for_missing_fields(monkeypatch):
+    session = RecordingSession()
+    monkeypatch.setattr(writer.db, "get_session", lambda: session)
+
+    GraphWriter().write_projects([{"name": "a/b", "url": "https://github.com/a/b"}, {"name": "no-url"}])
+
+    [(_, kwargs)] = session.calls
+    assert kwargs["rows"] == [{
+        "url": "https://github.com/a/b", "name": "a/b", "stars": 0, "description": None,
+        "language": None, "author": None, "partial": False, "topics": [], "languages": None, "latest_release": None,
+        "components": [],
+    }]
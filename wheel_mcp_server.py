@@ -5,15 +5,30 @@ Provides competitive landscape research as an MCP tool for AI agents.
 """
 
 import json
+import os
 import sys
-from typing import Any, Dict, List
-from src.main import run_research
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from src.main import STAGES, run_research
 from src.data.connection import db
+from src.engine.cache import ResponseCache
+from src.engine.github_adapter import normalize_search
+from src.engine.landscape import LandscapeCache
+from src.engine.similarity import get_similarity_index
+
+class RequestCancelled(Exception):
+    """Raised inside a tool call once the client has sent notifications/cancelled for it."""
 
 class WheelMCPServer:
     def __init__(self):
         self.name = "the-wheel"
         self.version = "1.0.0"
+        # Finished landscapes for this session, bounded so long-lived agents keep flat memory
+        self.landscapes = LandscapeCache(
+            max_entries=int(os.environ.get("WHEEL_LANDSCAPE_CACHE_ENTRIES", 32)),
+            max_bytes=int(os.environ.get("WHEEL_LANDSCAPE_CACHE_BYTES", 32 * 1024 * 1024)),
+        )
         
     def get_tools(self) -> List[Dict[str, Any]]:
         return [
@@ -35,41 +50,73 @@ class WheelMCPServer:
                     },
                     "required": ["query"]
                 }
+            },
+            {
+                "name": "similar_projects",
+                "description": "Find previously researched projects most similar to one (description, topics and components)",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "project": {
+                            "type": "string",
+                            "description": "Project name (e.g., 'pallets/flask') or GitHub URL"
+                        },
+                        "k": {
+                            "type": "integer",
+                            "description": "Number of similar projects to return (default: 10)",
+                            "default": 10
+                        }
+                    },
+                    "required": ["project"]
+                }
             }
         ]
     
-    def call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    def call_tool(self, name: str, arguments: Dict[str, Any],
+                  progress: Callable[[int, int, str], None] = None, cancelled: threading.Event = None) -> Dict[str, Any]:
         if name == "research_landscape":
             query = arguments.get("query", "")
             limit = arguments.get("limit", 5)
             
+            def on_stage(stage: str, info: Dict):
+                if cancelled is not None and cancelled.is_set():
+                    raise RequestCancelled(query)
+                if progress and info.get("status") == "done":
+                    progress(STAGES.index(stage) + 1, len(STAGES), f"{stage} done")
+            
             try:
                 # Enable mock mode for MCP usage
                 db.connect("mock", "", "")
                 
-                # Run the research pipeline
-                run_research(query, limit)
-                
-                # Get the results from mock storage
-                with db.get_session() as session:
-                    # Access mock storage directly
-                    nodes = session.storage["nodes"]
-                    links = session.storage["links"]
+                # A repeated query is answered from the session's landscape cache
+                key = ResponseCache.make_key(normalize_search(query, None), limit)
+                landscape = self.landscapes.get(key)
+                if landscape is None:
+                    # Each run writes to its own scoped graph, dropped once the landscape is built
+                    with db.scope():
+                        landscape = run_research(query, limit, progress=on_stage, export=False)
+                    self.landscapes.put(key, landscape)
+                elif progress:
+                    progress(len(STAGES), len(STAGES), "cached")
+                summary = landscape.summary()
                 
                 # Format response
-                projects = [n for n in nodes if n.get("type") == "Project"]
-                
                 response = f"""# Competitive Landscape: {query}
 
 ## 📊 Research Results
-- **Projects Found**: {len(projects)}
-- **Total Nodes**: {len(nodes)}
-- **Relationships**: {len(links)}
+- **Projects Found**: {summary['projects']}
+- **Total Nodes**: {summary['nodes']}
+- **Relationships**: {summary['links']}
 
 ## 🏢 Key Projects
 """
-                for project in projects[:5]:
-                    response += f"- **{project['name']}**: {project.get('url', 'No URL')}\n"
+                for project in summary['top_projects']:
+                    response += f"- **{project['name']}**: {project.get('url') or 'No URL'}\n"
+                
+                if summary['top_components']:
+                    response += "\n## 🧩 Common Components\n"
+                    for component in summary['top_components']:
+                        response += f"- **{component['name']}** ({component['category']}): used by {component['projects']} projects\n"
                 
                 response += f"""
 ## 🎯 Strategic Insights
@@ -94,6 +141,8 @@ Then open `standalone_demo.html` in your browser.
                     ]
                 }
                 
+            except RequestCancelled:
+                raise
             except Exception as e:
                 return {
                     "content": [
@@ -105,48 +154,128 @@ Then open `standalone_demo.html` in your browser.
                     "isError": True
                 }
         
+        if name == "similar_projects":
+            project = arguments.get("project", "")
+            matches = get_similarity_index().similar(project, int(arguments.get("k", 10)))
+            if not matches:
+                text = f"No similar projects found for '{project}'. Research its landscape first to index it."
+            else:
+                text = f"# Projects similar to {project}\n\n" + "".join(
+                    f"- **{m['name']}** ({m['similarity']:.0%}): {m['url']}\n" for m in matches
+                )
+            return {"content": [{"type": "text", "text": text}]}
+        
         return {"content": [{"type": "text", "text": "Unknown tool"}], "isError": True}
 
-def main():
-    server = WheelMCPServer()
-    
-    # Simple MCP protocol handler
-    for line in sys.stdin:
+class MCPDispatcher:
+    """
+    JSON-RPC over stdio with concurrent tool calls.
+    tools/call requests run on a worker pool and are answered by id as they finish,
+    so one slow research run never blocks tools/list or other calls. Clients can
+    send notifications/cancelled (the cancelled request gets no reply) and receive
+    notifications/progress when they pass a progressToken in params._meta.
+    """
+
+    def __init__(self, server: WheelMCPServer, out=None, max_workers: int = 4):
+        self.server = server
+        self.out = out or sys.stdout
+        self._write_lock = threading.Lock()
+        self._inflight: Dict[Any, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp")
+
+    def send(self, message: Dict):
+        with self._write_lock:
+            self.out.write(json.dumps(message) + "\n")
+            self.out.flush()
+
+    def handle_line(self, line: str):
+        if not line.strip():
+            return
         try:
-            request = json.loads(line.strip())
-            
-            if request.get("method") == "tools/list":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "result": {"tools": server.get_tools()}
-                }
-            elif request.get("method") == "tools/call":
-                params = request.get("params", {})
-                result = server.call_tool(params.get("name"), params.get("arguments", {}))
-                response = {
-                    "jsonrpc": "2.0", 
-                    "id": request.get("id"),
-                    "result": result
-                }
-            else:
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "error": {"code": -32601, "message": "Method not found"}
-                }
-            
-            print(json.dumps(response))
-            sys.stdout.flush()
-            
+            request = json.loads(line)
+        except ValueError as e:
+            self.send({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": f"Parse error: {e}"}})
+            return
+        if not isinstance(request, dict):
+            self.send({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request: not an object"}})
+            return
+
+        # One bad request must never take the server loop down with it
+        try:
+            self._dispatch(request)
         except Exception as e:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": request.get("id") if 'request' in locals() else None,
-                "error": {"code": -32603, "message": str(e)}
-            }
-            print(json.dumps(error_response))
-            sys.stdout.flush()
+            self.send({"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32603, "message": f"Internal error: {e}"}})
+
+    def _dispatch(self, request: Dict):
+        method = request.get("method")
+        request_id = request.get("id")
+        params = request.get("params") or {}
+
+        if method == "notifications/cancelled":
+            with self._inflight_lock:
+                cancelled = self._inflight.get(params.get("requestId"))
+            if cancelled:
+                cancelled.set()
+            return
+        if "id" not in request:
+            return  # Other notifications need no reply
+
+        if method == "tools/call":
+            cancelled = threading.Event()
+            with self._inflight_lock:
+                self._inflight[request_id] = cancelled
+            self._pool.submit(self._call_tool, request_id, params, cancelled)
+        elif method == "tools/list":
+            self.send({"jsonrpc": "2.0", "id": request_id, "result": {"tools": self.server.get_tools()}})
+        elif method == "initialize":
+            self.send({"jsonrpc": "2.0", "id": request_id, "result": {
+                "protocolVersion": params.get("protocolVersion", "2024-11-05"),
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": self.server.name, "version": self.server.version},
+            }})
+        else:
+            self.send({"jsonrpc": "2.0", "id": request_id, "error": {"code": -32601, "message": "Method not found"}})
+
+    def close(self):
+        """Wait for in-flight tool calls to reply."""
+        self._pool.shutdown(wait=True)
+
+    def _call_tool(self, request_id: Any, params: Dict, cancelled: threading.Event):
+        token = (params.get("_meta") or {}).get("progressToken")
+
+        def progress(done: int, total: int, message: str):
+            if token is not None and not cancelled.is_set():
+                self.send({"jsonrpc": "2.0", "method": "notifications/progress", "params": {
+                    "progressToken": token, "progress": done, "total": total, "message": message,
+                }})
+
+        try:
+            result = self.server.call_tool(params.get("name"), params.get("arguments", {}),
+                                           progress=progress if token is not None else None, cancelled=cancelled)
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RequestCancelled:
+            response = None
+        except Exception as e:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32603, "message": str(e)}}
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(request_id, None)
+
+        if response is not None and not cancelled.is_set():
+            self.send(response)
+
+def main():
+    # stdout carries the protocol; the pipeline's progress prints go to stderr instead
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+
+    dispatcher = MCPDispatcher(WheelMCPServer(), protocol_out, int(os.environ.get("WHEEL_MCP_WORKERS", 4)))
+    try:
+        for line in sys.stdin:
+            dispatcher.handle_line(line)
+    finally:
+        dispatcher.close()
 
 if __name__ == "__main__":
     main()